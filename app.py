@@ -1,61 +1,155 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
-from flask_sqlalchemy import SQLAlchemy
-from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from flask_migrate import Migrate
+"""
+Application factory for the AWS Job Search app
+
+Extensions are created unbound at import and attached to each app built by
+create_app(), so importing this module (or models, which need `db`) stays cheap.
+Logging, the database schema and Flask-Migrate are set up in the factory, and
+only where they're needed.
+"""
+
 import os
 import logging
+
+import click
 from dotenv import load_dotenv
-from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('app.log')
-    ]
-)
-logger = logging.getLogger(__name__)
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from flask_login import LoginManager
 
-# Load environment variables
-load_dotenv()
+from cache import ResponseCache
 
-# Initialize Flask app
-app = Flask(__name__)
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev_key_for_development')
-app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///aws_jobs.db')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+logger = logging.getLogger(__name__)
 
-# Initialize extensions
-db = SQLAlchemy(app)
-migrate = Migrate(app, db)
-login_manager = LoginManager(app)
+# Initialize extensions; create_app() binds them to the application
+db = SQLAlchemy()
+login_manager = LoginManager()
 login_manager.login_view = 'login'
+response_cache = ResponseCache()
+
+def configure_logging(log_file=None):
+    """
+    Configures root logging to stderr and, optionally, a log file
+    
+    Does nothing if logging is already configured. The log file is only opened
+    when the first record is written to it.
+    
+    Args:
+        log_file: Optional path of a file to log to as well
+    """
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, delay=True))
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=handlers
+    )
 
-def create_app():
-    """Create and configure the Flask application"""
+def load_config(app):
+    """Loads the application config from the environment and .env"""
+    
+    # Load environment variables
+    load_dotenv()
+    
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev_key_for_development')
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///aws_jobs.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Award badges on a background thread instead of inside the write transaction
+    app.config['BADGE_ENGINE_ASYNC'] = os.environ.get('BADGE_ENGINE_ASYNC', 'false').lower() == 'true'
+    # Coalesce upvotes in memory and flush them every N seconds (0 = increment immediately)
+    app.config['UPVOTE_BUFFER_SECONDS'] = float(os.environ.get('UPVOTE_BUFFER_SECONDS', 0))
+    # Response cache for read-heavy APIs: 'memory' (per worker) or 'redis' (shared, needs CACHE_REDIS_URL)
+    app.config['CACHE_BACKEND'] = os.environ.get('CACHE_BACKEND', 'memory')
+    app.config['CACHE_REDIS_URL'] = os.environ.get('CACHE_REDIS_URL')
+    app.config['CACHE_DEFAULT_TTL'] = int(os.environ.get('CACHE_DEFAULT_TTL', 60))
+    # Longest a 'memory' backend keeps a response, as other workers can't invalidate it
+    app.config['CACHE_LOCAL_TTL'] = float(os.environ.get('CACHE_LOCAL_TTL', 5))
+    # Seconds between checks of the TF-IDF index against the Job table, and between full rebuilds
+    app.config['TFIDF_REFRESH_SECONDS'] = float(os.environ.get('TFIDF_REFRESH_SECONDS', 30))
+    app.config['TFIDF_REBUILD_SECONDS'] = float(os.environ.get('TFIDF_REBUILD_SECONDS', 3600))
+    # Concurrent scraping: worker threads, per-host connection/concurrency cap, per-host requests per second
+    app.config['SCRAPE_MAX_WORKERS'] = int(os.environ.get('SCRAPE_MAX_WORKERS', 8))
+    app.config['SCRAPE_HOST_CONCURRENCY'] = int(os.environ.get('SCRAPE_HOST_CONCURRENCY', 2))
+    app.config['SCRAPE_HOST_RATE'] = float(os.environ.get('SCRAPE_HOST_RATE', 1.0))
+    app.config['SCRAPE_BATCH_SIZE'] = int(os.environ.get('SCRAPE_BATCH_SIZE', 200))
+    app.config['SCRAPE_TIMEOUT'] = float(os.environ.get('SCRAPE_TIMEOUT', 15))
+    # Listing pages followed per source when a sync doesn't reach the source's watermark
+    app.config['SCRAPE_MAX_PAGES'] = int(os.environ.get('SCRAPE_MAX_PAGES', 5))
+    # Listing page parser: 'streaming' (incremental, flat memory) or 'soup' (BeautifulSoup DOM)
+    app.config['SCRAPE_PARSER'] = os.environ.get('SCRAPE_PARSER', 'streaming')
+    # Auto-apply queue: submission threads per process, per-platform caps ('linkedin=1,indeed=3') and the cap for others
+    app.config['APPLY_WORKERS'] = int(os.environ.get('APPLY_WORKERS', 4))
+    app.config['APPLY_PLATFORM_CONCURRENCY'] = os.environ.get('APPLY_PLATFORM_CONCURRENCY', '')
+    app.config['APPLY_PLATFORM_DEFAULT_CONCURRENCY'] = int(os.environ.get('APPLY_PLATFORM_DEFAULT_CONCURRENCY', 2))
+    # Attempts before a submission fails, and the first retry delay (doubled on each retry)
+    app.config['APPLY_MAX_ATTEMPTS'] = int(os.environ.get('APPLY_MAX_ATTEMPTS', 5))
+    app.config['APPLY_RETRY_BASE_SECONDS'] = float(os.environ.get('APPLY_RETRY_BASE_SECONDS', 30))
+    # Seconds between queue polls, and before a submission claimed by a dead worker is retried
+    app.config['APPLY_POLL_SECONDS'] = float(os.environ.get('APPLY_POLL_SECONDS', 5))
+    app.config['APPLY_LEASE_SECONDS'] = float(os.environ.get('APPLY_LEASE_SECONDS', 300))
+    # Run queue workers inside web processes; set to false when `flask apply-worker` runs them
+    # instead (`run.py serve` defaults it to false)
+    app.config['APPLY_QUEUE_IN_PROCESS'] = os.environ.get('APPLY_QUEUE_IN_PROCESS', 'true').lower() == 'true'
+    # Log to this file as well as stderr ('' for stderr only)
+    app.config['LOG_FILE'] = os.environ.get('LOG_FILE', 'app.log')
+    # Create missing tables on startup; in production the schema is managed by `flask upgrade-db`
+    production = os.environ.get('FLASK_ENV') == 'production'
+    app.config['AUTO_CREATE_TABLES'] = os.environ.get('AUTO_CREATE_TABLES', str(not production)).lower() == 'true'
+
+def init_migrations(app):
+    """Registers Flask-Migrate, which provides the `flask db` commands"""
+    from flask_migrate import Migrate
+    
+    Migrate(app, db)
+
+def create_app(config=None):
+    """
+    Create and configure the Flask application
+    
+    Args:
+        config: Optional dict of config values overriding the environment
+        
+    Returns:
+        The Flask application
+    """
+    app = Flask(__name__)
+    load_config(app)
+    if config:
+        app.config.update(config)
+    
+    configure_logging(app.config['LOG_FILE'])
+    
+    db.init_app(app)
+    login_manager.init_app(app)
+    response_cache.init_app(app)
+    
+    # Flask-Migrate imports Alembic, which only CLI commands need
+    if click.get_current_context(silent=True) is not None:
+        init_migrations(app)
     
-    # Import routes after app initialization to avoid circular imports
-    from routes import register_routes
+    # Import routes after the extensions exist to avoid circular imports
+    from routes import register_routes, load_user
+    from commands import register_commands
+    login_manager.user_loader(load_user)
     register_routes(app)
+    register_commands(app)
     
-    # Create database tables if they don't exist
-    with app.app_context():
-        db.create_all()
-        logger.info("Database tables created")
+    if app.config['AUTO_CREATE_TABLES']:
+        # Create database tables if they don't exist
+        with app.app_context():
+            db.create_all()
+            logger.info("Database tables created")
     
     logger.info("Flask application initialized successfully")
     return app
 
 def run_app(port=8080):
     """Run the Flask application with the specified port"""
-    create_app()
+    app = create_app()
     logger.info(f"Starting Flask server on port {port}")
     app.run(host='0.0.0.0', port=port, debug=True)
 
 if __name__ == '__main__':
     # Default port is 8080, but can be changed through environment variables
     port = int(os.environ.get('PORT', 8080))
-    run_app(port=port)
\ No newline at end of file
+    run_app(port=port)
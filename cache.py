@@ -0,0 +1,221 @@
+"""
+Response cache for read-heavy JSON endpoints
+
+Responses are stored in a pluggable backend: an in-process LRU with TTL by default,
+or Redis (when the redis package is installed and CACHE_REDIS_URL is set) so every
+gunicorn worker shares entries and invalidations. Keys are versioned per namespace
+and, for per-user endpoints, per user; write routes call invalidate() to bump a
+version instead of hunting down individual keys. Cached responses carry an ETag so
+clients can revalidate with If-None-Match and get a 304.
+
+The memory backend only sees invalidations made by its own process, so under
+several workers its entries are kept for at most CACHE_LOCAL_TTL seconds: a
+write shows up on every worker that quickly.
+"""
+
+import base64
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, make_response, request
+from flask_login import current_user
+
+logger = logging.getLogger(__name__)
+
+class MemoryCache:
+    """In-process LRU cache with per-entry TTL"""
+
+    # Entries and invalidations are private to this process
+    shared = False
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Namespace versions are kept apart so LRU eviction never drops them
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_version(self, key):
+        with self._lock:
+            return self._versions.get(key, 0)
+
+    def incr_version(self, key):
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+            return self._versions[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+class RedisCache:
+    """Shared cache backed by Redis, so all workers see the same entries"""
+
+    shared = True
+
+    def __init__(self, url, prefix='aws-jobs:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("The redis package is required for CACHE_BACKEND=redis")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        value = json.loads(raw)
+        value['body'] = base64.b64decode(value['body'])
+        return value
+
+    def set(self, key, value, ttl):
+        value = dict(value, body=base64.b64encode(value['body']).decode('ascii'))
+        self.client.set(self.prefix + key, json.dumps(value), px=int(ttl * 1000))
+
+    def get_version(self, key):
+        return int(self.client.get(self.prefix + 'version:' + key) or 0)
+
+    def incr_version(self, key):
+        return self.client.incr(self.prefix + 'version:' + key)
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + '*'):
+            self.client.delete(key)
+
+class ResponseCache:
+    """Caches GET responses of view functions with explicit invalidation"""
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.default_ttl = 60
+        self.local_ttl = 5
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Configures the backend from the application config
+
+        Args:
+            app: The Flask application
+        """
+        backend = app.config.get('CACHE_BACKEND', 'memory')
+        self.default_ttl = app.config.get('CACHE_DEFAULT_TTL', 60)
+        self.local_ttl = app.config.get('CACHE_LOCAL_TTL', 5)
+
+        if backend == 'redis':
+            self.backend = RedisCache(app.config['CACHE_REDIS_URL'])
+        elif backend == 'memory':
+            self.backend = MemoryCache(app.config.get('CACHE_MAX_ENTRIES', 1024))
+        else:
+            raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
+
+        app.extensions['response_cache'] = self
+
+    def make_key(self, namespace, per_user):
+        """
+        Builds the cache key for the current request
+
+        Args:
+            namespace: The endpoint's cache namespace
+            per_user: Whether the response depends on the current user
+
+        Returns:
+            The cache key string
+        """
+        parts = [namespace, str(self.backend.get_version(namespace))]
+        if per_user:
+            user_id = current_user.get_id()
+            parts += [f'user={user_id}', str(self.backend.get_version(f'{namespace}:user={user_id}'))]
+
+        args = '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)))
+        parts.append(f'{request.path}?{args}')
+        return ':'.join(parts)
+
+    def invalidate(self, *namespaces, user_id=None):
+        """
+        Drops cached responses by bumping namespace versions
+
+        Args:
+            *namespaces: The namespaces to invalidate
+            user_id: Only invalidate this user's entries of per-user namespaces
+        """
+        if self.backend is None:
+            return
+        for namespace in namespaces:
+            key = namespace if user_id is None else f'{namespace}:user={user_id}'
+            self.backend.incr_version(key)
+
+    def cached(self, namespace, ttl=None, per_user=False):
+        """
+        Decorator caching a view's successful GET responses
+
+        Args:
+            namespace: The cache namespace used for invalidation
+            ttl: Seconds to keep a response, defaults to CACHE_DEFAULT_TTL and is
+                capped at CACHE_LOCAL_TTL on an unshared backend
+            per_user: Whether to cache separately for each logged-in user
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                if request.method != 'GET' or self.backend is None:
+                    return view(*args, **kwargs)
+
+                key = self.make_key(namespace, per_user)
+                entry = self.backend.get(key)
+                status = 'HIT'
+
+                if entry is None:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+
+                    body = response.get_data()
+                    entry = {
+                        'body': body,
+                        'mimetype': response.mimetype,
+                        'etag': hashlib.sha1(body).hexdigest(),
+                    }
+                    entry_ttl = ttl or self.default_ttl
+                    if not self.backend.shared:
+                        # Other workers keep serving their copies until they expire
+                        entry_ttl = min(entry_ttl, self.local_ttl)
+                    self.backend.set(key, entry, entry_ttl)
+                    status = 'MISS'
+
+                response = current_app.response_class(entry['body'], mimetype=entry['mimetype'])
+                response.set_etag(entry['etag'])
+                # Let clients keep a copy but always revalidate it with the ETag
+                response.headers['Cache-Control'] = 'private, no-cache' if per_user else 'public, no-cache'
+                response.headers['X-Cache'] = status
+                return response.make_conditional(request)
+
+            return wrapper
+        return decorator
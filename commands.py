@@ -0,0 +1,191 @@
+"""
+Flask CLI commands for maintaining the AWS Job Search database
+"""
+
+import csv
+import json
+import os
+
+import click
+
+def _json_lines(f):
+    """Yields the objects of a JSON Lines file; unparsable lines are yielded as text and rejected on validation"""
+    for line in f:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield line
+
+def register_commands(app):
+    """Register all CLI commands for the application"""
+    
+    @app.cli.command('upgrade-db')
+    def upgrade_db():
+        """Upgrade the database schema, adopting a database created before migrations"""
+        from flask_migrate import stamp, upgrade
+        from sqlalchemy import inspect
+        from models import db
+        
+        tables = inspect(db.engine).get_table_names()
+        if 'user' in tables and 'alembic_version' not in tables:
+            # Made by db.create_all() before migrations existed: the baseline schema
+            click.echo('Stamping the existing schema as revision 0001_initial_schema.')
+            stamp(revision='0001_initial_schema')
+        upgrade()
+        click.echo('Database schema is up to date.')
+    
+    @app.cli.command('search-index')
+    @click.option('--rebuild', is_flag=True, help='Rebuild the index from the job table.')
+    def search_index(rebuild):
+        """Create (or rebuild) the full-text search index for jobs"""
+        from services.job_search import JobSearchService
+        
+        search = JobSearchService()
+        if rebuild:
+            search.rebuild_index()
+        elif not search.create_index():
+            click.echo('Full-text search is not supported on this database; using ILIKE search.')
+            return
+        click.echo('Job search index is ready.')
+    
+    @app.cli.command('index-audit')
+    @click.option('--verbose', is_flag=True, help='Print the full plan for every query.')
+    def index_audit(verbose):
+        """EXPLAIN the route queries and report sequential scans"""
+        from services.index_audit import IndexAuditService
+        
+        results = IndexAuditService().audit()
+        for result in results:
+            status = 'SEQ SCAN' if result['seq_scans'] else 'ok'
+            click.echo(f"[{status}] {result['name']}")
+            if verbose or result['seq_scans']:
+                for line in result['plan']:
+                    click.echo(f'    {line}')
+        
+        seq_scan_count = sum(1 for result in results if result['seq_scans'])
+        click.echo(f'{seq_scan_count} of {len(results)} queries use a sequential scan.')
+        if seq_scan_count:
+            raise SystemExit(1)
+    
+    @app.cli.command('rebuild-user-stats')
+    @click.option('--user-id', type=int, default=None, help='Only rebuild counters for this user.')
+    def rebuild_user_stats(user_id):
+        """Recompute the UserStats activity counters from the source tables"""
+        from services.user_stats import UserStatsService
+        
+        rebuilt = UserStatsService().rebuild(user_id)
+        click.echo(f'Rebuilt activity counters for {len(rebuilt)} user(s).')
+    
+    @app.cli.command('rebuild-leaderboard')
+    def rebuild_leaderboard():
+        """Recompute the weekly contributor leaderboard from answers and upvotes"""
+        from services.leaderboard import LeaderboardService
+        
+        rows = LeaderboardService().rebuild()
+        click.echo(f'Rebuilt {rows} weekly leaderboard rows.')
+    
+    @app.cli.command('flush-upvotes')
+    def flush_upvotes():
+        """Count buffered upvotes that no running worker has flushed yet"""
+        from services.upvote_counter import UpvoteCounter
+        
+        flushed = UpvoteCounter(app).flush()
+        click.echo(f'Flushed {flushed} buffered upvotes.')
+    
+    @app.cli.command('score-matches')
+    @click.option('--user-id', 'user_ids', type=int, multiple=True, help='Only score this user (repeatable).')
+    @click.option('--job-id', 'job_ids', type=int, multiple=True, help='Only score this job (repeatable).')
+    @click.option('--missing-only', is_flag=True, help='Only score pairs without a score, e.g. after a scrape.')
+    @click.option('--batch-size', type=int, default=500, show_default=True)
+    def score_matches(user_ids, job_ids, missing_only, batch_size):
+        """Bulk score resumes against jobs into ResumeMatchScore"""
+        from services.resume_matcher import ResumeMatcherService
+        
+        written = ResumeMatcherService().bulk_score(
+            user_ids=user_ids or None,
+            job_ids=job_ids or None,
+            missing_only=missing_only,
+            batch_size=batch_size
+        )
+        click.echo(f'Wrote {written} match scores.')
+    
+    @app.cli.command('scrape-jobs')
+    @click.option('--source-id', 'source_ids', type=int, multiple=True, help='Only scrape this source (repeatable).')
+    @click.option('--workers', type=int, default=None, help='Worker threads (default SCRAPE_MAX_WORKERS).')
+    @click.option('--full', is_flag=True, help='Ignore watermarks and validators and re-scrape every page.')
+    def scrape_jobs(source_ids, workers, full):
+        """Incrementally scrape all active job sources concurrently"""
+        from models import JobSource, db
+        from services.scrape_pipeline import ScrapePipeline
+        
+        if full:
+            query = JobSource.query
+            if source_ids:
+                query = query.filter(JobSource.id.in_(source_ids))
+            query.update({'last_synced': None, 'etag': None, 'last_modified': None}, synchronize_session=False)
+            db.session.commit()
+        
+        stats = ScrapePipeline(app, max_workers=workers).run(source_ids or None)
+        for source_id, source_stats in sorted(stats.items()):
+            if source_stats['status'] == 'error':
+                click.echo(f"Source {source_id}: failed ({source_stats['error']})")
+            else:
+                click.echo(
+                    f"Source {source_id}: {source_stats['status']}, {source_stats['fetched']} fetched, "
+                    f"{source_stats['new']} new, {source_stats['merged']} merged, "
+                    f"{source_stats['unchanged']} unchanged, {source_stats['bytes']} bytes "
+                    f"in {source_stats['duration']:.2f}s"
+                )
+    
+    @app.cli.command('ingest-jobs')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False, allow_dash=True))
+    @click.option('--format', 'file_format', type=click.Choice(['jsonl', 'json', 'csv']), default=None,
+                  help='Input format (default: from the file extension, else jsonl).')
+    @click.option('--source-id', type=int, default=None, help='JobSource for records that don\'t name one.')
+    @click.option('--chunk-size', type=int, default=500, show_default=True)
+    def ingest_jobs(path, file_format, source_id, chunk_size):
+        """Bulk upsert job postings from a JSON Lines, JSON or CSV file, keyed on URL"""
+        from services.job_ingest import JobIngestService
+        
+        if file_format is None:
+            extension = os.path.splitext(path)[1].lower().lstrip('.')
+            file_format = extension if extension in ('json', 'csv') else 'jsonl'
+        
+        with click.open_file(path, encoding='utf-8') as f:
+            if file_format == 'json':
+                records = json.load(f)
+            elif file_format == 'csv':
+                records = csv.DictReader(f)
+            else:
+                records = _json_lines(f)
+            
+            report = JobIngestService().ingest(records, chunk_size=chunk_size, source_id=source_id)
+        
+        for number, reason in report['errors']:
+            click.echo(f'Record {number}: {reason}')
+        click.echo(f"{report['inserted']} inserted, {report['updated']} updated, {report['skipped']} skipped.")
+    
+    @app.cli.command('dedupe-jobs')
+    @click.option('--merge', is_flag=True, help='Merge duplicates into the oldest posting instead of only reporting them.')
+    def dedupe_jobs(merge):
+        """Fingerprint every job, rebuild the near-duplicate index and find duplicate postings"""
+        from services.job_dedup import JobDeduplicator
+        
+        duplicates = JobDeduplicator().rebuild(merge=merge)
+        for survivor_id, duplicate_id in duplicates:
+            click.echo(f'Job {duplicate_id} duplicates job {survivor_id}')
+        action = 'Merged' if merge else 'Found'
+        click.echo(f'{action} {len(duplicates)} duplicate job(s).')
+    
+    @app.cli.command('apply-worker')
+    @click.option('--workers', type=int, default=None, help='Submission threads (default APPLY_WORKERS).')
+    @click.option('--drain', is_flag=True, help='Exit once nothing is due instead of polling forever.')
+    def apply_worker(workers, drain):
+        """Submit queued auto-applications"""
+        from services.apply_queue import ApplyQueue
+        
+        claimed = ApplyQueue(app, workers=workers).run(drain=drain)
+        click.echo(f'Processed {claimed} submission(s).')
+    
+    return app
@@ -617,16 +617,17 @@ def initialize_interview_questions():
     
     aws_questions.extend(iam_questions + vpc_questions + ec2_questions + s3_questions + eks_questions + route53_questions + cloudwatch_questions + terraform_questions)
     
-    # Add questions to the database
-    for q_data in aws_questions:
-        question = InterviewQuestion(
-            question=q_data["question"],
-            field=q_data["field"],
-            difficulty=q_data["difficulty"],
-            aws_service=q_data["aws_service"],
-            is_pinned=q_data["is_pinned"]
-        )
-        db.session.add(question)
+    # Add questions to the database with one bulk INSERT
+    db.session.execute(db.insert(InterviewQuestion), [
+        {
+            "question": q_data["question"],
+            "field": q_data["field"],
+            "difficulty": q_data["difficulty"],
+            "aws_service": q_data["aws_service"],
+            "is_pinned": q_data["is_pinned"]
+        }
+        for q_data in aws_questions
+    ])
     
     # Create badges for AWS expertise
     aws_badges = [
@@ -634,19 +635,22 @@ def initialize_interview_questions():
             "name": "AWS Solver",
             "description": "Answered 5+ AWS interview questions",
             "category": "interview",
-            "image_url": "/static/images/badges/aws-solver.png"
+            "image_url": "/static/images/badges/aws-solver.png",
+            "requirements": {"answers": 5}
         },
         {
             "name": "AWS Expert",
             "description": "Received 10+ upvotes on AWS answers",
             "category": "interview",
-            "image_url": "/static/images/badges/aws-expert.png"
+            "image_url": "/static/images/badges/aws-expert.png",
+            "requirements": {"total_upvotes": 10}
         },
         {
             "name": "AWS Guru",
             "description": "Answered questions in 5+ different AWS service categories",
             "category": "interview",
-            "image_url": "/static/images/badges/aws-guru.png"
+            "image_url": "/static/images/badges/aws-guru.png",
+            "requirements": {"answered_field_count": 5}
         },
         {
             "name": "Community Helper",
@@ -662,7 +666,8 @@ def initialize_interview_questions():
             name=b_data["name"],
             description=b_data["description"],
             category=b_data["category"],
-            image_url=b_data["image_url"]
+            image_url=b_data["image_url"],
+            requirements=b_data.get("requirements")
         )
         db.session.add(badge)
     
@@ -673,4 +678,8 @@ def initialize_interview_questions():
 if __name__ == "__main__":
     app = create_app()
     with app.app_context():
-        initialize_interview_questions()
\ No newline at end of file
+        initialize_interview_questions()
+        
+        # Create the full-text search index for job search
+        from services.job_search import JobSearchService
+        JobSearchService().create_index()
\ No newline at end of file
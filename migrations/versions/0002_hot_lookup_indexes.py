@@ -0,0 +1,57 @@
+"""hot lookup indexes
+
+Adds composite indexes for the per-user lookups made by the routes, and unique
+indexes for (user, job), (user, question) and (user, badge) pairs that were
+previously only checked in Python. Duplicate pairs are removed (keeping the
+oldest row) before the unique indexes are created.
+
+Revision ID: 0002_hot_lookup_indexes
+Revises: 0001_initial_schema
+Create Date: 2026-10-17 06:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_hot_lookup_indexes'
+down_revision = '0001_initial_schema'
+branch_labels = None
+depends_on = None
+
+
+UNIQUE_INDEXES = [
+    ('uq_application_user_job', 'application', ['user_id', 'job_id']),
+    ('uq_saved_job_user_job', 'saved_job', ['user_id', 'job_id']),
+    ('uq_bookmarked_question_user_question', 'bookmarked_question', ['user_id', 'question_id']),
+    ('uq_user_badge_user_badge', 'user_badge', ['user_id', 'badge_id']),
+    ('uq_resume_match_score_user_job', 'resume_match_score', ['user_id', 'job_id']),
+]
+
+INDEXES = [
+    ('ix_job_posted_date_id', 'job', ['posted_date', 'id']),
+    ('ix_application_user_applied_date', 'application', ['user_id', 'applied_date', 'id']),
+    ('ix_interview_question_field_pinned', 'interview_question', ['field', 'is_pinned', 'id']),
+    ('ix_question_answer_question_upvotes', 'question_answer', ['question_id', 'upvotes']),
+    ('ix_question_answer_user', 'question_answer', ['user_id']),
+    ('ix_resume_match_score_user_score', 'resume_match_score', ['user_id', 'score']),
+]
+
+
+def upgrade():
+    for name, table, columns in UNIQUE_INDEXES:
+        key = ', '.join(columns)
+        op.execute(sa.text(
+            f'DELETE FROM {table} WHERE id NOT IN '
+            f'(SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM {table} GROUP BY {key}) AS keep)'
+        ))
+        op.create_index(name, table, columns, unique=True, if_not_exists=True)
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES + UNIQUE_INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,70 @@
+"""user stats counters
+
+Adds the denormalized user_stats table and fills it for existing users, the way
+`flask rebuild-user-stats` would.
+
+Revision ID: 0003_user_stats
+Revises: 0002_hot_lookup_indexes
+Create Date: 2026-10-17 06:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_user_stats'
+down_revision = '0002_hot_lookup_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('applications', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('answers', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('saved_jobs', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('bookmarked_questions', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('total_upvotes', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('answered_fields', sa.JSON(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    op.execute(
+        'INSERT INTO user_stats (user_id, applications, answers, saved_jobs, bookmarked_questions, '
+        'total_upvotes, updated_at) '
+        'SELECT u.id, '
+        '(SELECT COUNT(*) FROM application a WHERE a.user_id = u.id), '
+        '(SELECT COUNT(*) FROM question_answer qa WHERE qa.user_id = u.id), '
+        '(SELECT COUNT(*) FROM saved_job s WHERE s.user_id = u.id), '
+        '(SELECT COUNT(*) FROM bookmarked_question b WHERE b.user_id = u.id), '
+        '(SELECT COALESCE(SUM(qa.upvotes), 0) FROM question_answer qa WHERE qa.user_id = u.id), '
+        'CURRENT_TIMESTAMP '
+        'FROM "user" u'
+    )
+
+    bind = op.get_bind()
+    answered_fields = {}
+    for user_id, field in bind.execute(sa.text(
+        'SELECT DISTINCT qa.user_id, q.field FROM question_answer qa '
+        'JOIN interview_question q ON q.id = qa.question_id'
+    )):
+        answered_fields.setdefault(user_id, []).append(field)
+    if answered_fields:
+        user_stats = sa.table('user_stats', sa.column('user_id', sa.Integer), sa.column('answered_fields', sa.JSON))
+        bind.execute(
+            user_stats.update().where(user_stats.c.user_id == sa.bindparam('stats_user_id')).values(
+                answered_fields=sa.bindparam('fields', type_=sa.JSON)
+            ),
+            [
+                {'stats_user_id': user_id, 'fields': sorted(fields)}
+                for user_id, fields in answered_fields.items()
+            ]
+        )
+
+
+def downgrade():
+    op.drop_table('user_stats')
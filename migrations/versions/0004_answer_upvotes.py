@@ -0,0 +1,37 @@
+"""answer upvotes
+
+Adds the answer_upvote table recording who upvoted which answer. Upvotes cast
+before this revision have no voter rows, so they are not deduplicated.
+
+Revision ID: 0004_answer_upvotes
+Revises: 0003_user_stats
+Create Date: 2026-10-17 07:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_answer_upvotes'
+down_revision = '0003_user_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('answer_upvote',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('answer_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['answer_id'], ['question_answer.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('uq_answer_upvote_answer_user', 'answer_upvote', ['answer_id', 'user_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_answer_upvote_answer_user', table_name='answer_upvote')
+    op.drop_table('answer_upvote')
@@ -0,0 +1,68 @@
+"""leaderboard
+
+Adds the contributor_week table for the weekly leaderboard and an index on
+user_stats for the all-time leaderboard. Weekly rows are backfilled from existing
+answers and recorded upvotes, the way `flask rebuild-leaderboard` would.
+
+Revision ID: 0005_leaderboard
+Revises: 0004_answer_upvotes
+Create Date: 2026-10-17 07:30:00.000000
+
+"""
+from datetime import timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_leaderboard'
+down_revision = '0004_answer_upvotes'
+branch_labels = None
+depends_on = None
+
+
+def week_start(moment):
+    day = moment.date()
+    return day - timedelta(days=day.weekday())
+
+
+def upgrade():
+    op.create_table('contributor_week',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('week_start', sa.Date(), nullable=False),
+    sa.Column('upvotes', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('answers', sa.Integer(), nullable=False, server_default='0'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'week_start')
+    )
+    op.create_index('ix_contributor_week_week_upvotes', 'contributor_week', ['week_start', 'upvotes', 'answers'])
+    op.create_index('ix_user_stats_total_upvotes', 'user_stats', ['total_upvotes', 'answers'])
+
+    bind = op.get_bind()
+    answers = sa.table('question_answer', sa.column('id', sa.Integer), sa.column('user_id', sa.Integer),
+                       sa.column('created_at', sa.DateTime))
+    upvotes = sa.table('answer_upvote', sa.column('answer_id', sa.Integer), sa.column('created_at', sa.DateTime))
+    weeks = {}
+    for user_id, created_at in bind.execute(sa.select(answers.c.user_id, answers.c.created_at)):
+        if created_at is not None:
+            weeks.setdefault((user_id, week_start(created_at)), {'answers': 0, 'upvotes': 0})['answers'] += 1
+    for user_id, created_at in bind.execute(
+        sa.select(answers.c.user_id, upvotes.c.created_at).join(upvotes, upvotes.c.answer_id == answers.c.id)
+    ):
+        if created_at is not None:
+            weeks.setdefault((user_id, week_start(created_at)), {'answers': 0, 'upvotes': 0})['upvotes'] += 1
+
+    contributor_week = sa.table('contributor_week', sa.column('user_id', sa.Integer), sa.column('week_start', sa.Date),
+                                sa.column('upvotes', sa.Integer), sa.column('answers', sa.Integer))
+    if weeks:
+        op.bulk_insert(contributor_week, [
+            {'user_id': user_id, 'week_start': start, **counts}
+            for (user_id, start), counts in weeks.items()
+        ])
+
+
+def downgrade():
+    op.drop_index('ix_user_stats_total_upvotes', table_name='user_stats')
+    op.drop_index('ix_contributor_week_week_upvotes', table_name='contributor_week')
+    op.drop_table('contributor_week')
@@ -0,0 +1,48 @@
+"""job dedup
+
+Adds fingerprint, MinHash signature and merged source URL columns to job, and the
+job_dedup_bucket table for near-duplicate lookups. Run `flask dedupe-jobs --merge`
+after upgrading to index existing jobs and merge their duplicates.
+
+Revision ID: 0006_job_dedup
+Revises: 0005_leaderboard
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_job_dedup'
+down_revision = '0005_leaderboard'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('fingerprint', sa.String(length=40), nullable=True))
+        batch_op.add_column(sa.Column('description_minhash', sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column('source_urls', sa.JSON(), nullable=True))
+        batch_op.create_index('ix_job_fingerprint', ['fingerprint'])
+
+    op.create_table('job_dedup_bucket',
+    sa.Column('band', sa.Integer(), nullable=False),
+    sa.Column('bucket', sa.String(length=16), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['job.id'], ),
+    sa.PrimaryKeyConstraint('band', 'bucket', 'job_id')
+    )
+    op.create_index('ix_job_dedup_bucket_job_id', 'job_dedup_bucket', ['job_id'])
+
+
+def downgrade():
+    op.drop_index('ix_job_dedup_bucket_job_id', table_name='job_dedup_bucket')
+    op.drop_table('job_dedup_bucket')
+
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_fingerprint')
+        batch_op.drop_column('source_urls')
+        batch_op.drop_column('description_minhash')
+        batch_op.drop_column('fingerprint')
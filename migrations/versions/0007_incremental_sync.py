@@ -0,0 +1,53 @@
+"""incremental sync
+
+Adds conditional request validators to job_source and the job_source_sync table
+for per-sync stats. last_synced becomes the sync watermark: no sync has ever run,
+so the creation timestamps it held are cleared.
+
+Revision ID: 0007_incremental_sync
+Revises: 0006_job_dedup
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_incremental_sync'
+down_revision = '0006_job_dedup'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('job_source', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('etag', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('last_modified', sa.String(length=64), nullable=True))
+    op.execute('UPDATE job_source SET last_synced = NULL')
+
+    op.create_table('job_source_sync',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source_id', sa.Integer(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('fetched', sa.Integer(), nullable=False),
+    sa.Column('new', sa.Integer(), nullable=False),
+    sa.Column('merged', sa.Integer(), nullable=False),
+    sa.Column('unchanged', sa.Integer(), nullable=False),
+    sa.Column('bytes', sa.Integer(), nullable=False),
+    sa.Column('duration', sa.Float(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['source_id'], ['job_source.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_source_sync_source_started', 'job_source_sync', ['source_id', 'started_at'])
+
+
+def downgrade():
+    op.drop_index('ix_job_source_sync_source_started', table_name='job_source_sync')
+    op.drop_table('job_source_sync')
+
+    with op.batch_alter_table('job_source', schema=None) as batch_op:
+        batch_op.drop_column('last_modified')
+        batch_op.drop_column('etag')
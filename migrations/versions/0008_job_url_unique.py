@@ -0,0 +1,55 @@
+"""job url unique
+
+Adds a unique index on job.url, the natural key used by bulk ingestion upserts.
+Jobs sharing a URL are merged into the oldest one first: applications, saved jobs
+and match scores move to it (a user's own row on the oldest job wins) and the
+duplicates are deleted.
+
+Revision ID: 0008_job_url_unique
+Revises: 0007_incremental_sync
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_job_url_unique'
+down_revision = '0007_incremental_sync'
+branch_labels = None
+depends_on = None
+
+
+USER_JOB_TABLES = ['application', 'saved_job', 'resume_match_score']
+
+
+def upgrade():
+    bind = op.get_bind()
+    groups = bind.execute(sa.text(
+        'SELECT url, MIN(id) FROM job GROUP BY url HAVING COUNT(*) > 1'
+    )).fetchall()
+
+    for url, keep_id in groups:
+        duplicate_ids = [row[0] for row in bind.execute(
+            sa.text('SELECT id FROM job WHERE url = :url AND id != :keep_id'),
+            {'url': url, 'keep_id': keep_id}
+        )]
+        for duplicate_id in duplicate_ids:
+            params = {'keep_id': keep_id, 'duplicate_id': duplicate_id}
+            for table in USER_JOB_TABLES:
+                bind.execute(sa.text(
+                    f'DELETE FROM {table} WHERE job_id = :duplicate_id AND user_id IN '
+                    f'(SELECT user_id FROM (SELECT user_id FROM {table} WHERE job_id = :keep_id) AS kept)'
+                ), params)
+                bind.execute(sa.text(
+                    f'UPDATE {table} SET job_id = :keep_id WHERE job_id = :duplicate_id'
+                ), params)
+            bind.execute(sa.text('DELETE FROM job_dedup_bucket WHERE job_id = :duplicate_id'), params)
+            bind.execute(sa.text('DELETE FROM job WHERE id = :duplicate_id'), params)
+
+    op.create_index('uq_job_url', 'job', ['url'], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_job_url', table_name='job')
@@ -0,0 +1,41 @@
+"""apply queue
+
+Adds the auto-apply queue state to application: submission status, attempt
+count, retry time, worker claim time and last error, plus the index workers
+poll for due submissions.
+
+Revision ID: 0009_apply_queue
+Revises: 0008_job_url_unique
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_apply_queue'
+down_revision = '0008_job_url_unique'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('application', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('submission_status', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('next_attempt_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('claimed_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('last_error', sa.Text(), nullable=True))
+    op.create_index('ix_application_submission_due', 'application', ['submission_status', 'next_attempt_at'])
+
+
+def downgrade():
+    op.drop_index('ix_application_submission_due', table_name='application')
+
+    with op.batch_alter_table('application', schema=None) as batch_op:
+        batch_op.drop_column('last_error')
+        batch_op.drop_column('claimed_at')
+        batch_op.drop_column('next_attempt_at')
+        batch_op.drop_column('attempts')
+        batch_op.drop_column('submission_status')
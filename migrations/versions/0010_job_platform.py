@@ -0,0 +1,86 @@
+"""job platform
+
+Stores each job's platform (job board), derived from its URL, so apply dispatch
+and filtering read a column instead of classifying the URL on every request.
+Existing jobs are backfilled from the job board domains known at this revision,
+copied here so later changes to the platform registry don't change the upgrade.
+
+Revision ID: 0010_job_platform
+Revises: 0009_apply_queue
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from urllib.parse import urlsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010_job_platform'
+down_revision = '0009_apply_queue'
+branch_labels = None
+depends_on = None
+
+
+BATCH_SIZE = 1000
+
+# Job board domains as of this revision, matched on the host and its parent domains
+PLATFORM_DOMAINS = {
+    'linkedin.com': 'linkedin',
+    'indeed.com': 'indeed',
+    'indeed.co.in': 'indeed',
+    'indeed.co.uk': 'indeed',
+    'indeed.ca': 'indeed',
+    'indeed.com.au': 'indeed',
+    'glassdoor.com': 'glassdoor',
+    'glassdoor.co.in': 'glassdoor',
+    'glassdoor.co.uk': 'glassdoor',
+    'glassdoor.ca': 'glassdoor',
+    'glassdoor.com.au': 'glassdoor',
+    'shine.com': 'shine',
+    'internshala.com': 'internshala',
+}
+OTHER = 'other'
+
+
+def platform_for_url(url):
+    try:
+        host = urlsplit(url or '').hostname
+    except ValueError:
+        return OTHER
+    labels = host.split('.') if host else []
+    for start in range(len(labels)):
+        platform = PLATFORM_DOMAINS.get('.'.join(labels[start:]))
+        if platform is not None:
+            return platform
+    return OTHER
+
+
+def upgrade():
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('platform', sa.String(length=20), nullable=True))
+
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text('SELECT id, url FROM job WHERE id > :last_id ORDER BY id LIMIT :limit'),
+            {'last_id': last_id, 'limit': BATCH_SIZE}
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        bind.execute(
+            sa.text('UPDATE job SET platform = :platform WHERE id = :id'),
+            [{'id': job_id, 'platform': platform_for_url(url)} for job_id, url in rows]
+        )
+
+    op.create_index('ix_job_platform', 'job', ['platform'])
+
+
+def downgrade():
+    op.drop_index('ix_job_platform', table_name='job')
+
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.drop_column('platform')
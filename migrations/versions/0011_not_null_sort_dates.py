@@ -0,0 +1,44 @@
+"""not null sort dates
+
+Makes job.posted_date and application.applied_date NOT NULL, so keyset pages
+ordered by (date DESC, id DESC) need neither NULLS LAST nor an IS NULL branch in
+the seek predicate and are read straight off the (date, id) indexes at any depth.
+Rows without a date are given the upgrade time, as new undated postings are.
+
+Revision ID: 0011_not_null_sort_dates
+Revises: 0010_job_platform
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_not_null_sort_dates'
+down_revision = '0010_job_platform'
+branch_labels = None
+depends_on = None
+
+
+DATE_COLUMNS = [
+    ('job', 'posted_date'),
+    ('application', 'applied_date'),
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    now = datetime.utcnow()
+    for table, column in DATE_COLUMNS:
+        bind.execute(sa.text(f'UPDATE {table} SET {column} = :now WHERE {column} IS NULL'), {'now': now})
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    for table, column in reversed(DATE_COLUMNS):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,36 @@
+"""upvote counted
+
+Marks each answer_upvote row as counted or not. Buffered votes are stored
+uncounted in the same transaction as their dedup row and counted by the next
+flush, so votes buffered by a worker that dies are not lost. Existing votes
+are already in their answers' counts.
+
+Revision ID: 0012_upvote_counted
+Revises: 0011_not_null_sort_dates
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012_upvote_counted'
+down_revision = '0011_not_null_sort_dates'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('answer_upvote', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('counted', sa.Boolean(), nullable=False, server_default=sa.true()))
+
+    op.create_index('ix_answer_upvote_uncounted', 'answer_upvote', ['answer_id'],
+                    sqlite_where=sa.text('counted = 0'), postgresql_where=sa.text('NOT counted'))
+
+
+def downgrade():
+    op.drop_index('ix_answer_upvote_uncounted', table_name='answer_upvote')
+
+    with op.batch_alter_table('answer_upvote', schema=None) as batch_op:
+        batch_op.drop_column('counted')
@@ -23,6 +23,7 @@ class User(UserMixin, db.Model):
     question_answers = db.relationship('QuestionAnswer', backref='user', lazy=True)
     badges = db.relationship('UserBadge', backref='user', lazy=True)
     saved_jobs = db.relationship('SavedJob', backref='user', lazy=True)
+    stats = db.relationship('UserStats', backref='user', uselist=False, lazy=True)
     
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
@@ -39,15 +40,41 @@ class JobSource(db.Model):
     name = db.Column(db.String(50), nullable=False)
     url = db.Column(db.String(255), nullable=False)
     credentials = db.Column(db.JSON)
-    last_synced = db.Column(db.DateTime, default=datetime.utcnow)
+    last_synced = db.Column(db.DateTime)  # Watermark: start of the last successful sync, None if never synced
     active = db.Column(db.Boolean, default=True)
     
+    # Validators from the last listing response, for conditional requests
+    etag = db.Column(db.String(255))
+    last_modified = db.Column(db.String(64))
+    
     # Relationships
     jobs = db.relationship('Job', backref='source', lazy=True)
+    syncs = db.relationship('JobSourceSync', backref='source', lazy='dynamic')
     
     def __repr__(self):
         return f'<JobSource {self.name}>'
 
+class JobSourceSync(db.Model):
+    # One row per sync attempt of a source
+    id = db.Column(db.Integer, primary_key=True)
+    source_id = db.Column(db.Integer, db.ForeignKey('job_source.id'), nullable=False)
+    started_at = db.Column(db.DateTime, nullable=False)
+    status = db.Column(db.String(20), nullable=False)  # ok, not_modified, error
+    fetched = db.Column(db.Integer, nullable=False, default=0)  # Postings newer than the watermark
+    new = db.Column(db.Integer, nullable=False, default=0)
+    merged = db.Column(db.Integer, nullable=False, default=0)  # Postings merged into an existing job
+    unchanged = db.Column(db.Integer, nullable=False, default=0)  # Postings at or before the watermark
+    bytes = db.Column(db.Integer, nullable=False, default=0)
+    duration = db.Column(db.Float, nullable=False, default=0)  # Seconds
+    error = db.Column(db.Text)
+    
+    __table_args__ = (
+        db.Index('ix_job_source_sync_source_started', 'source_id', 'started_at'),
+    )
+    
+    def __repr__(self):
+        return f'<JobSourceSync {self.source_id} {self.status} at {self.started_at}>'
+
 class Job(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
@@ -55,18 +82,33 @@ class Job(db.Model):
     location = db.Column(db.String(100))
     description = db.Column(db.Text)
     url = db.Column(db.String(255), nullable=False)
-    posted_date = db.Column(db.DateTime)
+    platform = db.Column(db.String(20))  # Job board of the URL, see services.platforms
+    posted_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     source_id = db.Column(db.Integer, db.ForeignKey('job_source.id'))
     job_type = db.Column(db.String(50))
     salary_range = db.Column(db.String(100))
     is_easy_apply = db.Column(db.Boolean, default=False)
     is_fresher = db.Column(db.Boolean, default=False)
     is_internship = db.Column(db.Boolean, default=False)
-    aws_services = db.Column(db.JSON)  # List of AWS services relevant to this job
+    aws_services = db.Column(db.JSON(none_as_null=True))  # List of AWS services relevant to this job
     
     # AWS-specific fields
     requires_certification = db.Column(db.Boolean, default=False)
-    certification_types = db.Column(db.JSON)  # AWS certification types required
+    certification_types = db.Column(db.JSON(none_as_null=True))  # AWS certification types required
+    
+    # Deduplication of postings scraped from several sources
+    fingerprint = db.Column(db.String(40))  # SHA-1 of normalized title, company, location and description shingles
+    description_minhash = db.Column(db.JSON(none_as_null=True))  # MinHash signature of the description shingles
+    source_urls = db.Column(db.JSON)  # URLs of merged duplicate postings on other sources
+    
+    __table_args__ = (
+        # Job board ordering and keyset pagination on (posted_date, id)
+        db.Index('ix_job_posted_date_id', 'posted_date', 'id'),
+        db.Index('ix_job_fingerprint', 'fingerprint'),
+        # Natural key for bulk upserts; a posting's URL identifies it on its board
+        db.Index('uq_job_url', 'url', unique=True),
+        db.Index('ix_job_platform', 'platform'),
+    )
     
     # Relationships
     applications = db.relationship('Application', backref='job', lazy=True)
@@ -76,14 +118,40 @@ class Job(db.Model):
     def __repr__(self):
         return f'<Job {self.title} at {self.company}>'
 
+class JobDedupBucket(db.Model):
+    # Locality-sensitive hashing buckets of Job.description_minhash, one row per band
+    band = db.Column(db.Integer, primary_key=True)
+    bucket = db.Column(db.String(16), primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), primary_key=True)
+    
+    __table_args__ = (
+        # Re-indexing or deleting a job drops its buckets
+        db.Index('ix_job_dedup_bucket_job_id', 'job_id'),
+    )
+    
+    def __repr__(self):
+        return f'<JobDedupBucket {self.band}:{self.bucket} for Job {self.job_id}>'
+
 class Application(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False)
     status = db.Column(db.String(20), default='applied')  # applied, in_review, interview, rejected, offered
-    applied_date = db.Column(db.DateTime, default=datetime.utcnow)
+    applied_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     notes = db.Column(db.Text)
     follow_up_date = db.Column(db.DateTime)
+    # Auto-apply queue state (see ApplyQueue); None for applications recorded by hand
+    submission_status = db.Column(db.String(20))  # queued, in_progress, submitted, failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime)
+    claimed_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    
+    __table_args__ = (
+        db.Index('uq_application_user_job', 'user_id', 'job_id', unique=True),
+        db.Index('ix_application_user_applied_date', 'user_id', 'applied_date', 'id'),
+        db.Index('ix_application_submission_due', 'submission_status', 'next_attempt_at'),
+    )
     
     def __repr__(self):
         return f'<Application {self.id} - {self.status}>'
@@ -94,6 +162,10 @@ class SavedJob(db.Model):
     job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False)
     saved_date = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('uq_saved_job_user_job', 'user_id', 'job_id', unique=True),
+    )
+    
     def __repr__(self):
         return f'<SavedJob {self.id}>'
 
@@ -105,6 +177,11 @@ class InterviewQuestion(db.Model):
     is_pinned = db.Column(db.Boolean, default=False)
     aws_service = db.Column(db.String(100))  # Specific AWS services this question relates to
     
+    __table_args__ = (
+        # Question lists filter by field and order pinned questions first
+        db.Index('ix_interview_question_field_pinned', 'field', 'is_pinned', 'id'),
+    )
+    
     # Relationships
     answers = db.relationship('QuestionAnswer', backref='question', lazy=True)
     bookmarked_by = db.relationship('BookmarkedQuestion', backref='question', lazy=True)
@@ -120,15 +197,43 @@ class QuestionAnswer(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     upvotes = db.Column(db.Integer, default=0)
     
+    __table_args__ = (
+        db.Index('ix_question_answer_question_upvotes', 'question_id', 'upvotes'),
+        db.Index('ix_question_answer_user', 'user_id'),
+    )
+    
     def __repr__(self):
         return f'<Answer {self.id} by User {self.user_id}>'
 
+class AnswerUpvote(db.Model):
+    # One row per (answer, voter) so the same user can't inflate an answer's count
+    id = db.Column(db.Integer, primary_key=True)
+    answer_id = db.Column(db.Integer, db.ForeignKey('question_answer.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # False while a buffered vote waits to be added to the answer's count
+    counted = db.Column(db.Boolean, nullable=False, default=True, server_default=db.true())
+    
+    __table_args__ = (
+        db.Index('uq_answer_upvote_answer_user', 'answer_id', 'user_id', unique=True),
+        # Buffered votes still to be flushed
+        db.Index('ix_answer_upvote_uncounted', 'answer_id',
+                 sqlite_where=db.text('counted = 0'), postgresql_where=db.text('NOT counted')),
+    )
+    
+    def __repr__(self):
+        return f'<AnswerUpvote {self.id} on Answer {self.answer_id}>'
+
 class BookmarkedQuestion(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     question_id = db.Column(db.Integer, db.ForeignKey('interview_question.id'), nullable=False)
     bookmarked_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('uq_bookmarked_question_user_question', 'user_id', 'question_id', unique=True),
+    )
+    
     def __repr__(self):
         return f'<BookmarkedQuestion {self.id}>'
 
@@ -152,6 +257,10 @@ class UserBadge(db.Model):
     badge_id = db.Column(db.Integer, db.ForeignKey('badge.id'), nullable=False)
     awarded_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('uq_user_badge_user_badge', 'user_id', 'badge_id', unique=True),
+    )
+    
     def __repr__(self):
         return f'<UserBadge {self.id}>'
 
@@ -166,5 +275,49 @@ class ResumeMatchScore(db.Model):
     keyword_match = db.Column(db.Float)  # 0-100
     calculated_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('uq_resume_match_score_user_job', 'user_id', 'job_id', unique=True),
+        # Recommended jobs read the top scores for a user
+        db.Index('ix_resume_match_score_user_score', 'user_id', 'score'),
+    )
+    
+    def __repr__(self):
+        return f'<ResumeMatchScore {self.score}% for User {self.user_id} and Job {self.job_id}>'
+
+class UserStats(db.Model):
+    # Denormalized activity counters, updated incrementally on the write paths.
+    # `flask rebuild-user-stats` recomputes them from the source tables.
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    applications = db.Column(db.Integer, nullable=False, default=0)
+    answers = db.Column(db.Integer, nullable=False, default=0)
+    saved_jobs = db.Column(db.Integer, nullable=False, default=0)
+    bookmarked_questions = db.Column(db.Integer, nullable=False, default=0)
+    total_upvotes = db.Column(db.Integer, nullable=False, default=0)
+    answered_fields = db.Column(db.JSON)  # Distinct InterviewQuestion fields the user has answered in
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        # All-time top contributors leaderboard
+        db.Index('ix_user_stats_total_upvotes', 'total_upvotes', 'answers'),
+    )
+    
+    @property
+    def answered_field_count(self):
+        return len(self.answered_fields or [])
+    
+    def __repr__(self):
+        return f'<UserStats for User {self.user_id}>'
+
+class ContributorWeek(db.Model):
+    # Per-user weekly activity for the weekly leaderboard, updated incrementally
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    week_start = db.Column(db.Date, primary_key=True)  # Monday of the week (UTC)
+    upvotes = db.Column(db.Integer, nullable=False, default=0)
+    answers = db.Column(db.Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        db.Index('ix_contributor_week_week_upvotes', 'week_start', 'upvotes', 'answers'),
+    )
+    
     def __repr__(self):
-        return f'<ResumeMatchScore {self.score}% for User {self.user_id} and Job {self.job_id}>'
\ No newline at end of file
+        return f'<ContributorWeek {self.week_start} for User {self.user_id}>'
@@ -0,0 +1,170 @@
+"""
+Keyset (cursor) pagination helpers for the JSON APIs
+
+Offset pagination runs a COUNT(*) and makes the database skip every row before the
+requested page. Keyset pagination instead seeks past the last row of the previous
+page using the ordering columns, so every page costs the same and no count is run.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, false, literal, or_
+
+# Upper bound on the rows fetched for one page
+MAX_PER_PAGE = 100
+
+def encode_cursor(values):
+    """
+    Encodes the ordering values of a row into an opaque cursor string
+
+    Args:
+        values: The values of the ordering columns for the last row of a page
+
+    Returns:
+        A URL-safe cursor string
+    """
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, columns):
+    """
+    Decodes a cursor string back into ordering values
+
+    Args:
+        cursor: The cursor string produced by encode_cursor
+        columns: The ordering columns, used to restore value types
+
+    Returns:
+        A list of values, one per ordering column
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+    if not isinstance(payload, list) or len(payload) != len(columns):
+        raise ValueError("Invalid cursor: wrong number of values")
+
+    return [_decode_value(value, column) for value, column in zip(payload, columns)]
+
+def _decode_value(value, column):
+    """Restores a cursor value's type, raising ValueError if it can't belong to the column"""
+    if value is None:
+        if not _is_nullable(column):
+            raise ValueError(f"Invalid cursor: {column.key} can't be null")
+        return None
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+
+    if python_type is datetime:
+        if not isinstance(value, str):
+            raise ValueError(f"Invalid cursor: {column.key} must be a date")
+        return datetime.fromisoformat(value)
+    if python_type is float:
+        valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+    elif python_type is int:
+        valid = isinstance(value, int) and not isinstance(value, bool)
+    else:
+        valid = isinstance(value, python_type)
+    if not valid:
+        raise ValueError(f"Invalid cursor: {column.key} must be {python_type.__name__}")
+    return value
+
+def _is_nullable(column):
+    return getattr(column.expression, 'nullable', True)
+
+def _after(column, value, descending):
+    """Rows whose column value sorts strictly after value (NULLs sort last)"""
+    if value is None:
+        return false()
+    # Bind as a typed literal so booleans compare like any other value
+    value = literal(value, column.type)
+    condition = column < value if descending else column > value
+    if _is_nullable(column):
+        condition = or_(condition, column.is_(None))
+    return condition
+
+def _order(column, descending):
+    order = column.desc() if descending else column.asc()
+    return order.nulls_last() if _is_nullable(column) else order
+
+def _equal(column, value):
+    return column.is_(None) if value is None else column == literal(value, column.type)
+
+def keyset_query(query, ordering, cursor, per_page):
+    """
+    Builds the query keyset_paginate runs for one page
+
+    Args:
+        query: The query to paginate; any existing ORDER BY is replaced
+        ordering: A list of (column, descending) tuples; the last column must be unique
+        cursor: The cursor returned with the previous page, or '' for the first page
+        per_page: The number of rows per page, clamped to 1..MAX_PER_PAGE
+
+    Returns:
+        The query seeking past the cursor, limited to one row more than a page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    columns = [column for column, _ in ordering]
+    per_page = min(max(per_page, 1), MAX_PER_PAGE)
+
+    # NULLS LAST only where NULLs can occur: on a NOT NULL column it would stop
+    # PostgreSQL from reading a DESC ordering off a backward scan of the index
+    query = query.order_by(None).order_by(*[
+        _order(column, descending)
+        for column, descending in ordering
+    ])
+
+    if cursor:
+        values = decode_cursor(cursor, columns)
+
+        # (a, b) after (x, y)  <=>  a after x OR (a = x AND b after y)
+        seek = []
+        for i, (column, descending) in enumerate(ordering):
+            ties = [_equal(columns[j], values[j]) for j in range(i)]
+            seek.append(and_(*ties, _after(column, values[i], descending)))
+        query = query.filter(or_(*seek))
+
+    # Fetch one extra row to learn whether another page exists
+    return query.limit(per_page + 1)
+
+def keyset_paginate(query, ordering, cursor, per_page):
+    """
+    Fetches one page of a query using keyset pagination
+
+    Args:
+        query: The query to paginate; any existing ORDER BY is replaced
+        ordering: A list of (column, descending) tuples; the last column must be unique
+        cursor: The cursor returned with the previous page, or '' for the first page
+        per_page: The number of rows per page, clamped to 1..MAX_PER_PAGE
+
+    Returns:
+        A tuple of (items, next_cursor), where next_cursor is None on the last page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    columns = [column for column, _ in ordering]
+    per_page = min(max(per_page, 1), MAX_PER_PAGE)
+
+    rows = keyset_query(query, ordering, cursor, per_page).all()
+    items = rows[:per_page]
+
+    next_cursor = None
+    if len(rows) > per_page:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in columns])
+
+    return items, next_cursor
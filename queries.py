@@ -0,0 +1,158 @@
+"""
+Query builders shared by the routes and the index audit
+
+Each function returns the query a route runs, before it is paginated or executed.
+`flask index-audit` explains the statements built here, so a change to a route's
+query is audited without keeping a second copy of it in sync.
+"""
+
+from sqlalchemy.orm import joinedload
+
+from models import Job, Application, InterviewQuestion, QuestionAnswer, BookmarkedQuestion, UserBadge
+
+# Keyset orderings of the paginated listings; the last column is unique
+JOB_ORDERING = [(Job.posted_date, True), (Job.id, True)]
+APPLICATION_ORDERING = [(Application.applied_date, True), (Application.id, True)]
+QUESTION_ORDERING = [(InterviewQuestion.is_pinned, True), (InterviewQuestion.id, False)]
+
+def jobs_query(query='', location='', job_type='', easy_apply=False, fresher=False, internship=False,
+               aws_service='', platform='', rank=False):
+    """
+    Builds the job board search, newest first (after relevance when ranking)
+
+    Args:
+        query: Free-text search terms
+        location: A substring of the job location
+        job_type: An exact job type
+        easy_apply: Only Easy Apply jobs
+        fresher: Only jobs open to freshers
+        internship: Only internships
+        aws_service: An AWS service the job mentions
+        platform: An exact job platform
+        rank: Whether to order by search relevance first
+
+    Returns:
+        A Job query
+    """
+    from services.job_search import JobSearchService
+
+    jobs = Job.query
+
+    if query:
+        # Uses the full-text index when available, ILIKE otherwise
+        jobs = JobSearchService().apply(jobs, query, rank=rank)
+
+    if location:
+        jobs = jobs.filter(Job.location.ilike(f'%{location}%'))
+
+    if job_type:
+        jobs = jobs.filter(Job.job_type == job_type)
+
+    if easy_apply:
+        jobs = jobs.filter(Job.is_easy_apply == True)
+
+    if fresher:
+        jobs = jobs.filter(Job.is_fresher == True)
+
+    if internship:
+        jobs = jobs.filter(Job.is_internship == True)
+
+    if aws_service:
+        jobs = jobs.filter(Job.aws_services.contains([aws_service]))
+
+    if platform:
+        jobs = jobs.filter(Job.platform == platform)
+
+    return jobs.order_by(Job.posted_date.desc())
+
+def user_applications_query(user_id, status=''):
+    """
+    Builds a user's applications, newest first
+
+    Args:
+        user_id: The ID of the user
+        status: Only applications with this status, if given
+
+    Returns:
+        An Application query
+    """
+    applications = Application.query.filter_by(user_id=user_id)
+    if status:
+        applications = applications.filter_by(status=status)
+    return applications.order_by(Application.applied_date.desc())
+
+def field_questions_query(field, aws_service='', difficulty=''):
+    """
+    Builds the interview questions for a field, pinned questions first
+
+    Args:
+        field: The question field
+        aws_service: A substring of the question's AWS service, if given
+        difficulty: Only questions of this difficulty, if given
+
+    Returns:
+        An InterviewQuestion query
+    """
+    questions = InterviewQuestion.query.filter_by(field=field)
+    if aws_service:
+        questions = questions.filter(InterviewQuestion.aws_service.contains(aws_service))
+    if difficulty:
+        questions = questions.filter_by(difficulty=difficulty)
+    return questions.order_by(InterviewQuestion.is_pinned.desc(), InterviewQuestion.id.asc())
+
+def bookmark_query(user_id, question_id):
+    """
+    Builds the lookup of a user's bookmark on a question
+
+    Args:
+        user_id: The ID of the user
+        question_id: The ID of the question
+
+    Returns:
+        A BookmarkedQuestion query
+    """
+    return BookmarkedQuestion.query.filter_by(user_id=user_id, question_id=question_id)
+
+def answers_page_query(question_id, page, per_page):
+    """
+    Builds one page of a question's top answers with their authors
+
+    Args:
+        question_id: The ID of the question
+        page: The 1-based page number
+        per_page: The number of answers per page; one extra row is fetched
+
+    Returns:
+        A QuestionAnswer query
+    """
+    return QuestionAnswer.query.options(
+        joinedload(QuestionAnswer.user)
+    ).filter_by(
+        question_id=question_id
+    ).order_by(
+        QuestionAnswer.upvotes.desc(), QuestionAnswer.id.asc()
+    ).offset((page - 1) * per_page).limit(per_page + 1)
+
+def user_answers_query(user_id):
+    """
+    Builds a user's answers, newest first
+
+    Args:
+        user_id: The ID of the user
+
+    Returns:
+        A QuestionAnswer query
+    """
+    return QuestionAnswer.query.filter_by(user_id=user_id).order_by(QuestionAnswer.created_at.desc())
+
+def user_badges_query(user_id):
+    """
+    Builds the badges awarded to a user
+
+    Args:
+        user_id: The ID of the user
+
+    Returns:
+        A UserBadge query
+    """
+    return UserBadge.query.filter_by(user_id=user_id)
@@ -1,11 +1,23 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, session
 from flask_login import login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta
 import json
-import random
+import hashlib
 
+from app import response_cache
 from models import db, User, Job, JobSource, Application, SavedJob, InterviewQuestion, QuestionAnswer, BookmarkedQuestion, Badge, UserBadge, ResumeMatchScore
+from services.upvote_counter import UpvoteCounter
+from services.apply_queue import ApplyQueue, QUEUED, FAILED
+from services.auto_apply import AutoApplyService
+from services.job_annotator import JobAnnotator
+from services.user_stats import UserStatsService
+from services.badge_engine import BadgeEngine
+from services.leaderboard import LeaderboardService, WINDOWS as LEADERBOARD_WINDOWS
+from pagination import keyset_paginate
+from queries import (JOB_ORDERING, APPLICATION_ORDERING, QUESTION_ORDERING, jobs_query, user_applications_query,
+                     field_questions_query, bookmark_query, answers_page_query, user_answers_query, user_badges_query)
 
 def load_user(user_id):
     return User.query.get(int(user_id))
@@ -77,34 +89,23 @@ def register_routes(app):
     @login_required
     def dashboard():
         # Get recent applications
-        recent_applications = Application.query.filter_by(user_id=current_user.id).order_by(Application.applied_date.desc()).limit(5).all()
+        recent_applications = user_applications_query(current_user.id).limit(5).all()
         
-        # Get application stats
-        application_stats = {
-            'total': Application.query.filter_by(user_id=current_user.id).count(),
-            'active': Application.query.filter_by(user_id=current_user.id, status='applied').count(),
-            'interviews': Application.query.filter_by(user_id=current_user.id, status='interview').count(),
-            'offers': Application.query.filter_by(user_id=current_user.id, status='offered').count(),
-            'rejected': Application.query.filter_by(user_id=current_user.id, status='rejected').count()
-        }
+        stats_service = UserStatsService()
+        
+        # Get application stats (one GROUP BY status query)
+        application_stats = stats_service.application_stats(current_user.id)
         
         # Get recent interview questions attempted
-        recent_questions = QuestionAnswer.query.filter_by(user_id=current_user.id).order_by(QuestionAnswer.created_at.desc()).limit(3).all()
+        recent_questions = user_answers_query(current_user.id).limit(3).all()
         
         # Get user badges
-        user_badges = UserBadge.query.filter_by(user_id=current_user.id).all()
+        user_badges = user_badges_query(current_user.id).all()
         
         # Get recommended jobs based on resume match
         recommended_jobs = []
         if current_user.resume_text:
-            job_matches = ResumeMatchScore.query.filter_by(user_id=current_user.id).order_by(ResumeMatchScore.score.desc()).limit(3).all()
-            for match in job_matches:
-                job = Job.query.get(match.job_id)
-                if job:
-                    recommended_jobs.append({
-                        'job': job,
-                        'match_score': match.score
-                    })
+            recommended_jobs = stats_service.recommended_jobs(current_user.id, limit=3)
         
         return render_template(
             'dashboard.html',
@@ -131,59 +132,49 @@ def register_routes(app):
         fresher = request.args.get('fresher') == 'true'
         internship = request.args.get('internship') == 'true'
         aws_service = request.args.get('aws_service', '')
+        platform = request.args.get('platform', '')
+        sort = request.args.get('sort', 'date')  # date, relevance
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        cursor = request.args.get('cursor')  # opt-in keyset pagination ('' for first page)
+        
+        if cursor is not None and sort == 'relevance':
+            return jsonify({'error': 'Cursor pagination is not supported with relevance sorting'}), 400
+        
+        # Build the filtered query
+        jobs = jobs_query(
+            query=query,
+            location=location,
+            job_type=job_type,
+            easy_apply=easy_apply,
+            fresher=fresher,
+            internship=internship,
+            aws_service=aws_service,
+            platform=platform,
+            rank=(sort == 'relevance')
+        )
         
-        # Start building the query
-        jobs_query = Job.query
-        
-        # Apply filters
-        if query:
-            jobs_query = jobs_query.filter(
-                (Job.title.ilike(f'%{query}%')) | 
-                (Job.description.ilike(f'%{query}%')) |
-                (Job.company.ilike(f'%{query}%'))
-            )
-        
-        if location:
-            jobs_query = jobs_query.filter(Job.location.ilike(f'%{location}%'))
-        
-        if job_type:
-            jobs_query = jobs_query.filter(Job.job_type == job_type)
-        
-        if easy_apply:
-            jobs_query = jobs_query.filter(Job.is_easy_apply == True)
-        
-        if fresher:
-            jobs_query = jobs_query.filter(Job.is_fresher == True)
-        
-        if internship:
-            jobs_query = jobs_query.filter(Job.is_internship == True)
-        
-        if aws_service:
-            # Filter by AWS service
-            jobs_query = jobs_query.filter(Job.aws_services.contains([aws_service]))
-        
-        # Order by posted date, newest first
-        jobs_query = jobs_query.order_by(Job.posted_date.desc())
-        
-        # Paginate results
-        paginated_jobs = jobs_query.paginate(page=page, per_page=per_page, error_out=False)
+        if cursor is not None:
+            # Seek on (posted_date, id), newest first, without counting
+            try:
+                page_jobs, next_cursor = keyset_paginate(jobs, JOB_ORDERING, cursor, per_page)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+        else:
+            # Paginate results, newest first (after relevance when ranking)
+            paginated_jobs = jobs.paginate(page=page, per_page=per_page, error_out=False)
+            page_jobs = paginated_jobs.items
+        
+        # Load saved/applied/match-score state for the whole page at once
+        annotations = JobAnnotator().annotate(
+            current_user.id,
+            [job.id for job in page_jobs]
+        )
         
         # Format response
         jobs = []
-        for job in paginated_jobs.items:
-            # Check if user has saved this job
-            saved = SavedJob.query.filter_by(user_id=current_user.id, job_id=job.id).first() is not None
-            
-            # Check if user has applied to this job
-            applied = Application.query.filter_by(user_id=current_user.id, job_id=job.id).first() is not None
-            
-            # Get resume match score if available
-            match_score = None
-            match = ResumeMatchScore.query.filter_by(user_id=current_user.id, job_id=job.id).first()
-            if match:
-                match_score = match.score
+        for job in page_jobs:
+            annotation = annotations[job.id]
             
             jobs.append({
                 'id': job.id,
@@ -192,16 +183,24 @@ def register_routes(app):
                 'location': job.location,
                 'description': job.description,
                 'url': job.url,
+                'platform': job.platform,
+                'source_urls': job.source_urls or [],
                 'posted_date': job.posted_date.strftime('%Y-%m-%d'),
                 'job_type': job.job_type,
                 'salary_range': job.salary_range,
                 'is_easy_apply': job.is_easy_apply,
-                'is_saved': saved,
-                'is_applied': applied,
-                'match_score': match_score,
+                'is_saved': annotation['is_saved'],
+                'is_applied': annotation['is_applied'],
+                'match_score': annotation['match_score'],
                 'aws_services': job.aws_services
             })
         
+        if cursor is not None:
+            return jsonify({
+                'jobs': jobs,
+                'next_cursor': next_cursor
+            })
+        
         return jsonify({
             'jobs': jobs,
             'total': paginated_jobs.total,
@@ -209,6 +208,43 @@ def register_routes(app):
             'current_page': page
         })
     
+    @app.route('/api/jobs/recommendations')
+    @login_required
+    def recommend_jobs():
+        limit = min(request.args.get('limit', 10, type=int), 100)
+        
+        if not current_user.resume_text:
+            return jsonify({'jobs': []})
+        
+        # Rank every job against the resume with one sparse matrix-vector product
+        from services.tfidf_matcher import get_matcher
+        try:
+            matches = get_matcher().top_jobs(current_user.resume_text, k=limit)
+        except RuntimeError as e:
+            return jsonify({'error': str(e)}), 503
+        
+        jobs_by_id = {
+            job.id: job for job in Job.query.filter(Job.id.in_([job_id for job_id, _ in matches]))
+        } if matches else {}
+        
+        jobs = []
+        for job_id, similarity in matches:
+            job = jobs_by_id.get(job_id)
+            if not job:
+                continue
+            jobs.append({
+                'id': job.id,
+                'title': job.title,
+                'company': job.company,
+                'location': job.location,
+                'url': job.url,
+                'posted_date': job.posted_date.strftime('%Y-%m-%d') if job.posted_date else None,
+                'is_easy_apply': job.is_easy_apply,
+                'match_score': round(similarity * 100, 1)
+            })
+        
+        return jsonify({'jobs': jobs})
+    
     @app.route('/api/jobs/<int:job_id>/save', methods=['POST'])
     @login_required
     def save_job(job_id):
@@ -220,7 +256,9 @@ def register_routes(app):
         if saved_job:
             # If already saved, remove it
             db.session.delete(saved_job)
-            db.session.commit()
+            db.session.flush()
+            UserStatsService().increment(current_user.id, saved_jobs=-1)
+            commit_and_award_badges(current_user.id, 'save')
             return jsonify({'message': 'Job removed from saved jobs', 'is_saved': False})
         else:
             # If not saved, save it
@@ -229,36 +267,76 @@ def register_routes(app):
                 job_id=job.id
             )
             db.session.add(new_saved)
-            db.session.commit()
+            try:
+                db.session.flush()
+            except IntegrityError:
+                # A concurrent request already saved it (uq_saved_job_user_job)
+                db.session.rollback()
+            else:
+                UserStatsService().increment(current_user.id, saved_jobs=1)
+                commit_and_award_badges(current_user.id, 'save')
             return jsonify({'message': 'Job saved successfully', 'is_saved': True})
     
     @app.route('/api/jobs/<int:job_id>/apply', methods=['POST'])
     @login_required
     def auto_apply_job(job_id):
         job = Job.query.get_or_404(job_id)
+        queue = ApplyQueue(app)
         
         # Check if already applied
         application = Application.query.filter_by(user_id=current_user.id, job_id=job.id).first()
         
         if application:
+            if application.submission_status == FAILED:
+                # Let the user retry a submission that ran out of attempts
+                queue.requeue(application)
+                db.session.commit()
+                queue.notify()
+                return jsonify({
+                    'success': True,
+                    'message': 'Application queued',
+                    'application_id': application.id,
+                    'submission_status': application.submission_status
+                }), 202
+            
             return jsonify({
                 'success': False, 
                 'message': 'You have already applied to this job'
             }), 400
         
-        # Create new application
-        new_application = Application(
-            user_id=current_user.id,
-            job_id=job.id,
-            status='applied',
-            notes='Auto-applied through AWS Job Track'
-        )
-        
-        db.session.add(new_application)
-        db.session.commit()
+        # Easy Apply jobs are submitted to their platform by the apply queue;
+        # for other jobs the application is only recorded
+        easy_apply = AutoApplyService().is_easy_apply_eligible(job)
+        try:
+            if easy_apply:
+                new_application = queue.enqueue(current_user.id, job.id, notes='Auto-applied through AWS Job Track')
+            else:
+                new_application = Application(
+                    user_id=current_user.id,
+                    job_id=job.id,
+                    status='applied',
+                    notes='Auto-applied through AWS Job Track'
+                )
+                db.session.add(new_application)
+                db.session.flush()
+        except IntegrityError:
+            # A concurrent request already applied (uq_application_user_job)
+            db.session.rollback()
+            return jsonify({
+                'success': False, 
+                'message': 'You have already applied to this job'
+            }), 400
+        UserStatsService().increment(current_user.id, applications=1)
+        commit_and_award_badges(current_user.id, 'apply')
         
-        # This is where you would integrate with job application APIs like LinkedIn Easy Apply
-        # For now, we'll just mark it as applied in our database
+        if easy_apply:
+            queue.notify()
+            return jsonify({
+                'success': True,
+                'message': 'Application queued',
+                'application_id': new_application.id,
+                'submission_status': QUEUED
+            }), 202
         
         return jsonify({
             'success': True,
@@ -266,6 +344,67 @@ def register_routes(app):
             'application_id': new_application.id
         })
     
+    @app.route('/api/jobs/apply', methods=['POST'])
+    @login_required
+    def bulk_apply_jobs():
+        data = request.get_json(silent=True) or {}
+        service = AutoApplyService()
+        
+        if 'job_ids' in data:
+            job_ids = data['job_ids']
+            if not isinstance(job_ids, list) or not all(isinstance(job_id, int) for job_id in job_ids):
+                return jsonify({'error': 'job_ids must be a list of integers'}), 400
+        elif isinstance(data.get('filter'), dict):
+            # e.g. {"filter": {"min_match": 80}}: Easy Apply jobs matching the resume by 80% or more
+            job_filter = data['filter']
+            try:
+                min_match = float(job_filter['min_match']) if job_filter.get('min_match') is not None else None
+            except (TypeError, ValueError):
+                return jsonify({'error': 'min_match must be a number'}), 400
+            job_ids = service.matching_job_ids(
+                current_user.id, min_match=min_match, easy_apply=job_filter.get('easy_apply', True) is not False
+            )
+        else:
+            return jsonify({'error': 'Provide job_ids or a filter'}), 400
+        
+        queue = ApplyQueue(app)
+        try:
+            results = service.apply_to_jobs(
+                current_user.id, job_ids, queue=queue, notes='Auto-applied through AWS Job Track', commit=False
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        queued = sum(1 for result in results if result['result'] == QUEUED)
+        if queued:
+            commit_and_award_badges(current_user.id, 'apply')
+            queue.notify()
+        
+        return jsonify({
+            'success': True,
+            'queued': queued,
+            'results': results
+        }), 202 if queued else 200
+    
+    @app.route('/api/applications/<int:app_id>/submission')
+    @login_required
+    def get_application_submission(app_id):
+        application = Application.query.filter_by(id=app_id, user_id=current_user.id).first_or_404()
+        
+        # Make sure a restarted worker process picks up what is still queued
+        if application.submission_status == QUEUED:
+            ApplyQueue(app).ensure_workers()
+        
+        return jsonify({
+            'application_id': application.id,
+            'job_id': application.job_id,
+            'status': application.status,
+            'submission_status': application.submission_status,
+            'attempts': application.attempts,
+            'next_attempt_at': application.next_attempt_at.isoformat() if application.next_attempt_at else None,
+            'last_error': application.last_error
+        })
+    
     @app.route('/applications')
     @login_required
     def applications():
@@ -278,23 +417,25 @@ def register_routes(app):
         status = request.args.get('status', '')
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        cursor = request.args.get('cursor')  # opt-in keyset pagination ('' for first page)
         
-        # Start building the query
-        apps_query = Application.query.filter_by(user_id=current_user.id)
+        # Build the filtered query, newest first
+        apps_query = user_applications_query(current_user.id, status)
         
-        # Apply status filter if provided
-        if status:
-            apps_query = apps_query.filter_by(status=status)
-        
-        # Order by applied date, newest first
-        apps_query = apps_query.order_by(Application.applied_date.desc())
-        
-        # Paginate results
-        paginated_apps = apps_query.paginate(page=page, per_page=per_page, error_out=False)
+        if cursor is not None:
+            # Seek on (applied_date, id), newest first, without counting
+            try:
+                page_apps, next_cursor = keyset_paginate(apps_query, APPLICATION_ORDERING, cursor, per_page)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+        else:
+            # Paginate results
+            paginated_apps = apps_query.paginate(page=page, per_page=per_page, error_out=False)
+            page_apps = paginated_apps.items
         
         # Format response
         applications = []
-        for app in paginated_apps.items:
+        for app in page_apps:
             job = Job.query.get(app.job_id)
             
             applications.append({
@@ -303,11 +444,18 @@ def register_routes(app):
                 'job_title': job.title if job else 'Unknown Job',
                 'company': job.company if job else 'Unknown Company',
                 'status': app.status,
+                'submission_status': app.submission_status,
                 'applied_date': app.applied_date.strftime('%Y-%m-%d'),
                 'notes': app.notes,
                 'follow_up_date': app.follow_up_date.strftime('%Y-%m-%d') if app.follow_up_date else None
             })
         
+        if cursor is not None:
+            return jsonify({
+                'applications': applications,
+                'next_cursor': next_cursor
+            })
+        
         return jsonify({
             'applications': applications,
             'total': paginated_apps.total,
@@ -350,6 +498,7 @@ def register_routes(app):
     
     @app.route('/api/interview-questions')
     @login_required
+    @response_cache.cached('interview-questions', ttl=120, per_user=True)
     def get_interview_questions():
         # Get query parameters for filtering
         field = request.args.get('field', 'aws_general')
@@ -357,35 +506,27 @@ def register_routes(app):
         difficulty = request.args.get('difficulty', '')
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        cursor = request.args.get('cursor')  # opt-in keyset pagination ('' for first page)
         
-        # Start building the query
-        questions_query = InterviewQuestion.query
-        
-        # Apply field filter
-        questions_query = questions_query.filter_by(field=field)
-        
-        # Apply AWS service filter if provided
-        if aws_service:
-            questions_query = questions_query.filter(InterviewQuestion.aws_service.contains(aws_service))
-        
-        # Apply difficulty filter if provided
-        if difficulty:
-            questions_query = questions_query.filter_by(difficulty=difficulty)
+        # Build the filtered query, pinned questions first
+        questions_query = field_questions_query(field, aws_service, difficulty)
         
-        # Order pinned questions first, then by id 
-        questions_query = questions_query.order_by(InterviewQuestion.is_pinned.desc(), InterviewQuestion.id.asc())
-        
-        # Paginate results
-        paginated_questions = questions_query.paginate(page=page, per_page=per_page, error_out=False)
+        if cursor is not None:
+            # Seek on (is_pinned, id), pinned questions first, without counting
+            try:
+                page_questions, next_cursor = keyset_paginate(questions_query, QUESTION_ORDERING, cursor, per_page)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+        else:
+            # Paginate results
+            paginated_questions = questions_query.paginate(page=page, per_page=per_page, error_out=False)
+            page_questions = paginated_questions.items
         
         # Format response
         questions = []
-        for q in paginated_questions.items:
+        for q in page_questions:
             # Check if user has bookmarked this question
-            is_bookmarked = BookmarkedQuestion.query.filter_by(
-                user_id=current_user.id, 
-                question_id=q.id
-            ).first() is not None
+            is_bookmarked = bookmark_query(current_user.id, q.id).first() is not None
             
             # Get answer count
             answer_count = QuestionAnswer.query.filter_by(question_id=q.id).count()
@@ -401,6 +542,12 @@ def register_routes(app):
                 'answer_count': answer_count
             })
         
+        if cursor is not None:
+            return jsonify({
+                'questions': questions,
+                'next_cursor': next_cursor
+            })
+        
         return jsonify({
             'questions': questions,
             'total': paginated_questions.total,
@@ -410,33 +557,39 @@ def register_routes(app):
     
     @app.route('/api/interview-questions/daily')
     @login_required
+    @response_cache.cached('daily-question', ttl=60, per_user=True)
     def get_daily_question():
-        # Get query parameter for field
+        # Get query parameters for field and answer paging
         field = request.args.get('field', 'aws_general')
+        answers_page = max(request.args.get('answers_page', 1, type=int), 1)
+        answers_per_page = min(max(request.args.get('answers_per_page', 10, type=int), 1), 50)
         
         # Try to get a pinned question first
-        question = InterviewQuestion.query.filter_by(field=field, is_pinned=True).first()
+        question = InterviewQuestion.query.filter_by(field=field, is_pinned=True).order_by(InterviewQuestion.id.asc()).first()
         
-        # If no pinned question, get a random one
+        # If no pinned question, pick the question of the day without loading them all
         if not question:
-            questions = InterviewQuestion.query.filter_by(field=field).all()
-            if questions:
-                question = random.choice(questions)
-            else:
+            question_count = InterviewQuestion.query.filter_by(field=field).count()
+            if not question_count:
                 return jsonify(None)
+            
+            # hashlib rather than hash() so every worker picks the same question
+            day_key = f'{datetime.utcnow().date().isoformat()}:{field}'.encode('utf-8')
+            index = int(hashlib.sha256(day_key).hexdigest(), 16) % question_count
+            question = InterviewQuestion.query.filter_by(field=field).order_by(
+                InterviewQuestion.id.asc()
+            ).offset(index).first()
         
         # Check if user has bookmarked this question
-        is_bookmarked = BookmarkedQuestion.query.filter_by(
-            user_id=current_user.id, 
-            question_id=question.id
-        ).first() is not None
+        is_bookmarked = bookmark_query(current_user.id, question.id).first() is not None
         
-        # Get answers for this question
-        answers_query = QuestionAnswer.query.filter_by(question_id=question.id).order_by(QuestionAnswer.upvotes.desc())
+        # Get the top answers for this question with their authors in one query
+        page_answers = answers_page_query(question.id, answers_page, answers_per_page).all()
+        has_more_answers = len(page_answers) > answers_per_page
         answers = []
         
-        for answer in answers_query.all():
-            user = User.query.get(answer.user_id)
+        for answer in page_answers[:answers_per_page]:
+            user = answer.user
             answers.append({
                 'id': answer.id,
                 'answer': answer.answer,
@@ -456,7 +609,9 @@ def register_routes(app):
             'aws_service': question.aws_service,
             'is_pinned': question.is_pinned,
             'is_bookmarked': is_bookmarked,
-            'answers': answers
+            'answers': answers,
+            'answers_page': answers_page,
+            'has_more_answers': has_more_answers
         })
     
     @app.route('/api/answers/<int:answer_id>/upvote', methods=['POST'])
@@ -468,16 +623,23 @@ def register_routes(app):
         if answer.user_id == current_user.id:
             return jsonify({'error': 'Cannot upvote your own answer'}), 400
         
-        # Increment upvotes
-        answer.upvotes += 1
-        db.session.commit()
-        
-        # Check for badge eligibility
-        check_badge_eligibility(answer.user_id)
+        # Record the vote and increment upvotes atomically (or buffer it)
+        counter = UpvoteCounter(app)
+        try:
+            upvotes = counter.record(answer, current_user.id)
+            if counter.buffered:
+                # Counters, badges and caches are updated when the buffer is flushed
+                db.session.commit()
+            else:
+                commit_and_award_badges(answer.user_id, 'upvote')
+                response_cache.invalidate('daily-question', 'top-contributors')
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({'error': 'You have already upvoted this answer'}), 400
         
         return jsonify({
             'message': 'Answer upvoted successfully',
-            'upvotes': answer.upvotes
+            'upvotes': upvotes
         })
     
     @app.route('/api/interview-questions/<int:question_id>/bookmark', methods=['POST'])
@@ -494,7 +656,10 @@ def register_routes(app):
         if bookmark:
             # If already bookmarked, remove it
             db.session.delete(bookmark)
-            db.session.commit()
+            db.session.flush()
+            UserStatsService().increment(current_user.id, bookmarked_questions=-1)
+            commit_and_award_badges(current_user.id, 'bookmark')
+            response_cache.invalidate('interview-questions', 'daily-question', user_id=current_user.id)
             return jsonify({
                 'message': 'Bookmark removed',
                 'is_bookmarked': False
@@ -506,7 +671,15 @@ def register_routes(app):
                 question_id=question.id
             )
             db.session.add(new_bookmark)
-            db.session.commit()
+            try:
+                db.session.flush()
+            except IntegrityError:
+                # A concurrent request already bookmarked it (uq_bookmarked_question_user_question)
+                db.session.rollback()
+            else:
+                UserStatsService().increment(current_user.id, bookmarked_questions=1)
+                commit_and_award_badges(current_user.id, 'bookmark')
+            response_cache.invalidate('interview-questions', 'daily-question', user_id=current_user.id)
             return jsonify({
                 'message': 'Question bookmarked',
                 'is_bookmarked': True
@@ -532,10 +705,16 @@ def register_routes(app):
         )
         
         db.session.add(new_answer)
-        db.session.commit()
+        db.session.flush()
+        
+        stats_service = UserStatsService()
+        stats_service.increment(current_user.id, answers=1)
+        stats_service.record_answered_field(current_user.id, question.field)
+        LeaderboardService().record_answer(current_user.id, new_answer.created_at)
+        commit_and_award_badges(current_user.id, 'answer')
         
-        # Check for badge eligibility
-        check_badge_eligibility(current_user.id)
+        # Answer counts, answer lists and the leaderboard all changed
+        response_cache.invalidate('interview-questions', 'daily-question', 'top-contributors')
         
         return jsonify({
             'message': 'Answer added successfully',
@@ -557,45 +736,18 @@ def register_routes(app):
         return render_template('community.html')
     
     @app.route('/api/community/top-contributors')
+    @response_cache.cached('top-contributors', ttl=300)
     def get_top_contributors():
-        # Get the top contributors based on answer upvotes
-        # This query gets users with the most total upvotes across all their answers
-        result = db.session.query(
-            User,
-            db.func.sum(QuestionAnswer.upvotes).label('total_upvotes'),
-            db.func.count(QuestionAnswer.id).label('answer_count')
-        ).join(
-            QuestionAnswer, 
-            User.id == QuestionAnswer.user_id
-        ).group_by(
-            User.id
-        ).order_by(
-            db.desc('total_upvotes')
-        ).limit(10).all()
-        
-        # Format the response
-        contributors = []
-        for user, total_upvotes, answer_count in result:
-            # Get badges for this user
-            badges = []
-            for ub in UserBadge.query.filter_by(user_id=user.id).all():
-                badge = Badge.query.get(ub.badge_id)
-                badges.append({
-                    'id': badge.id,
-                    'name': badge.name,
-                    'image_url': badge.image_url
-                })
-            
-            contributors.append({
-                'id': user.id,
-                'username': user.username,
-                'total_upvotes': total_upvotes,
-                'answer_count': answer_count,
-                'badges': badges
-            })
+        # Get the top contributors based on answer upvotes, from the maintained leaderboard
+        window = request.args.get('window', 'all_time')  # all_time, weekly
+        if window not in LEADERBOARD_WINDOWS:
+            return jsonify({'error': f"window must be one of: {', '.join(LEADERBOARD_WINDOWS)}"}), 400
+        
+        contributors = LeaderboardService().top(window=window, limit=10)
         
         return jsonify({
-            'contributors': contributors
+            'contributors': contributors,
+            'window': window
         })
     
     @app.route('/profile')
@@ -608,7 +760,7 @@ def register_routes(app):
     def get_profile():
         # Get user badges
         badges = []
-        for ub in UserBadge.query.filter_by(user_id=current_user.id).all():
+        for ub in user_badges_query(current_user.id).all():
             badge = Badge.query.get(ub.badge_id)
             badges.append({
                 'id': badge.id,
@@ -618,16 +770,10 @@ def register_routes(app):
                 'awarded_at': ub.awarded_at.isoformat()
             })
         
-        # Get user activity stats
-        applications_count = Application.query.filter_by(user_id=current_user.id).count()
-        answers_count = QuestionAnswer.query.filter_by(user_id=current_user.id).count()
-        saved_jobs_count = SavedJob.query.filter_by(user_id=current_user.id).count()
-        bookmarked_questions_count = BookmarkedQuestion.query.filter_by(user_id=current_user.id).count()
-        
-        # Get total upvotes received
-        total_upvotes = db.session.query(db.func.sum(QuestionAnswer.upvotes)).filter(
-            QuestionAnswer.user_id == current_user.id
-        ).scalar() or 0
+        # Get user activity stats from the maintained counters
+        stats_service = UserStatsService()
+        user_stats = stats_service.get(current_user.id)
+        application_stats = stats_service.application_stats(current_user.id)
         
         return jsonify({
             'user': {
@@ -642,11 +788,12 @@ def register_routes(app):
             },
             'badges': badges,
             'stats': {
-                'applications': applications_count,
-                'answers': answers_count,
-                'saved_jobs': saved_jobs_count,
-                'bookmarked_questions': bookmarked_questions_count,
-                'total_upvotes': total_upvotes
+                'applications': user_stats.applications,
+                'application_stats': application_stats,
+                'answers': user_stats.answers,
+                'saved_jobs': user_stats.saved_jobs,
+                'bookmarked_questions': user_stats.bookmarked_questions,
+                'total_upvotes': user_stats.total_upvotes
             }
         })
     
@@ -688,86 +835,18 @@ def register_routes(app):
         return render_template('500.html'), 500
     
     # Helper functions
-    def check_badge_eligibility(user_id):
-        """Check if a user is eligible for any badges and award them if so"""
-        
-        user = User.query.get(user_id)
-        if not user:
-            return
-        
-        # Get user stats
-        answers_count = QuestionAnswer.query.filter_by(user_id=user.id).count()
-        
-        # Get total upvotes received
-        total_upvotes = db.session.query(db.func.sum(QuestionAnswer.upvotes)).filter(
-            QuestionAnswer.user_id == user.id
-        ).scalar() or 0
-        
-        # Get distinct AWS service categories the user has answered questions in
-        service_categories = db.session.query(InterviewQuestion.field).join(
-            QuestionAnswer, InterviewQuestion.id == QuestionAnswer.question_id
-        ).filter(
-            QuestionAnswer.user_id == user.id
-        ).distinct().count()
-        
-        # Check for AWS Solver badge (5+ answers)
-        if answers_count >= 5:
-            aws_solver_badge = Badge.query.filter_by(name="AWS Solver").first()
-            if aws_solver_badge:
-                # Check if user already has this badge
-                existing_badge = UserBadge.query.filter_by(
-                    user_id=user.id,
-                    badge_id=aws_solver_badge.id
-                ).first()
-                
-                if not existing_badge:
-                    # Award the badge
-                    new_badge = UserBadge(
-                        user_id=user.id,
-                        badge_id=aws_solver_badge.id,
-                        awarded_at=datetime.utcnow()
-                    )
-                    db.session.add(new_badge)
-                    db.session.commit()
-        
-        # Check for AWS Expert badge (10+ upvotes)
-        if total_upvotes >= 10:
-            aws_expert_badge = Badge.query.filter_by(name="AWS Expert").first()
-            if aws_expert_badge:
-                # Check if user already has this badge
-                existing_badge = UserBadge.query.filter_by(
-                    user_id=user.id,
-                    badge_id=aws_expert_badge.id
-                ).first()
-                
-                if not existing_badge:
-                    # Award the badge
-                    new_badge = UserBadge(
-                        user_id=user.id,
-                        badge_id=aws_expert_badge.id,
-                        awarded_at=datetime.utcnow()
-                    )
-                    db.session.add(new_badge)
-                    db.session.commit()
-        
-        # Check for AWS Guru badge (answers in 5+ service categories)
-        if service_categories >= 5:
-            aws_guru_badge = Badge.query.filter_by(name="AWS Guru").first()
-            if aws_guru_badge:
-                # Check if user already has this badge
-                existing_badge = UserBadge.query.filter_by(
-                    user_id=user.id,
-                    badge_id=aws_guru_badge.id
-                ).first()
-                
-                if not existing_badge:
-                    # Award the badge
-                    new_badge = UserBadge(
-                        user_id=user.id,
-                        badge_id=aws_guru_badge.id,
-                        awarded_at=datetime.utcnow()
-                    )
-                    db.session.add(new_badge)
-                    db.session.commit()
+    def commit_and_award_badges(user_id, event):
+        """Commit the current write and award any badges the event earned"""
+        
+        engine = BadgeEngine()
+        
+        if app.config.get('BADGE_ENGINE_ASYNC'):
+            # Counters must be committed before the worker reads them
+            db.session.commit()
+            engine.handle_event_async(app, user_id, event)
+        else:
+            # Award in the same transaction as the write
+            engine.handle_event(user_id, event, commit=False)
+            db.session.commit()
     
     return app
\ No newline at end of file
@@ -1,20 +1,204 @@
 #!/usr/bin/env python
+"""
+Runs the AWS Job Search application
+
+    python run.py          # development server with the debugger and reloader
+    python run.py serve    # production server (gunicorn)
+
+`serve` picks gunicorn's worker model from the SERVE_* environment (or flags):
+
+- gthread (default): CPUs + 1 processes with SERVE_THREADS threads each. Requests
+  spend most of their time waiting on the database, so threads add concurrency
+  without another copy of the app per request slot.
+- sync: 2 x CPUs + 1 single-request processes, gunicorn's classic sizing.
+- gevent: one process per CPU serving SERVE_WORKER_CONNECTIONS greenlets each
+  (needs gevent installed; falls back to gthread otherwise).
+
+The app is loaded once in the master and forked (preload), so workers share its
+memory copy-on-write; each worker drops the database connections it inherited.
+Queued auto-applications aren't submitted by the web workers under `serve`; run
+`flask apply-worker` alongside (APPLY_QUEUE_IN_PROCESS=true overrides this).
+"""
+
+import argparse
+import json
+import logging
 import os
 import sys
-import logging
-from app import run_app
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from dotenv import load_dotenv
+
 logger = logging.getLogger(__name__)
 
+WORKER_CLASSES = ('sync', 'gthread', 'gevent')
+
+def default_workers(worker_class, cpus):
+    """
+    Returns the number of worker processes for a worker class
+
+    Args:
+        worker_class: One of WORKER_CLASSES
+        cpus: The number of CPUs available
+
+    Returns:
+        The number of worker processes
+    """
+    if worker_class == 'sync':
+        return 2 * cpus + 1
+    if worker_class == 'gthread':
+        return cpus + 1
+    return cpus
+
+def available_cpus():
+    """Returns the number of CPUs this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def serve_options(args):
+    """
+    Resolves gunicorn settings from the command line, the environment and the CPU count
+
+    Args:
+        args: The parsed `serve` arguments; unset ones fall back to SERVE_* variables
+
+    Returns:
+        A dict of gunicorn settings
+    """
+    worker_class = args.worker_class or os.environ.get('SERVE_WORKER_CLASS', 'gthread')
+    if worker_class not in WORKER_CLASSES:
+        raise ValueError(f"Unknown worker class: {worker_class}")
+    if worker_class == 'gevent':
+        try:
+            import gevent  # noqa: F401
+        except ImportError:
+            logger.warning("gevent is not installed, using gthread workers")
+            worker_class = 'gthread'
+
+    cpus = available_cpus()
+    workers = args.workers or int(os.environ.get('SERVE_WORKERS', 0)) or default_workers(worker_class, cpus)
+    max_requests = int(os.environ.get('SERVE_MAX_REQUESTS', 1000))
+
+    options = {
+        'bind': args.bind or os.environ.get('SERVE_BIND') or f"0.0.0.0:{os.environ.get('PORT', 8080)}",
+        'worker_class': worker_class,
+        'workers': workers,
+        'preload_app': os.environ.get('SERVE_PRELOAD', 'true').lower() == 'true',
+        # Seconds an idle client connection is held open; above nginx's default
+        # upstream reuse window so proxied connections aren't torn down per request
+        'keepalive': int(os.environ.get('SERVE_KEEPALIVE', 5)),
+        # Pending connections queued by the kernel while every worker is busy
+        'backlog': int(os.environ.get('SERVE_BACKLOG', 2048)),
+        'timeout': int(os.environ.get('SERVE_TIMEOUT', 30)),
+        'graceful_timeout': int(os.environ.get('SERVE_GRACEFUL_TIMEOUT', 30)),
+        # Recycle workers now and then (staggered) to cap slow memory growth; 0 disables
+        'max_requests': max_requests,
+        'max_requests_jitter': max_requests // 10,
+        'errorlog': '-',
+        'accesslog': os.environ.get('SERVE_ACCESS_LOG') or None,
+    }
+    if worker_class == 'gthread':
+        options['threads'] = args.threads or int(os.environ.get('SERVE_THREADS', 4))
+    elif worker_class == 'gevent':
+        options['worker_connections'] = int(os.environ.get('SERVE_WORKER_CONNECTIONS', 1000))
+    return options
+
+def post_fork(server, worker):
+    """Drops database connections a worker inherited from the preloading master"""
+    flask_app = getattr(server.app, 'flask_app', None)
+    if flask_app is None:
+        return
+
+    from app import db
+
+    with flask_app.app_context():
+        for engine in db.engines.values():
+            # Leave the sockets to the master; the worker opens its own
+            engine.dispose(close=False)
+
+def serve(options):
+    """
+    Runs the application under gunicorn
+
+    Args:
+        options: A dict of gunicorn settings, see serve_options()
+    """
+    from gunicorn.app.base import BaseApplication
+
+    class ProductionServer(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            self.flask_app = None
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+            self.cfg.set('post_fork', post_fork)
+
+        def load(self):
+            from app import create_app
+
+            self.flask_app = create_app()
+            return self.flask_app
+
+    logger.info(
+        f"Serving on {options['bind']} with {options['workers']} {options['worker_class']} workers"
+        + (f" x {options['threads']} threads" if 'threads' in options else '')
+    )
+    ProductionServer(options).run()
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description='Run the AWS Job Search application')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 8080)),
+                        help='Development server port')
+    commands = parser.add_subparsers(dest='command')
+    serve_parser = commands.add_parser('serve', help='Run the production server (gunicorn)')
+    serve_parser.add_argument('--bind', help='Address to listen on (default SERVE_BIND or 0.0.0.0:$PORT)')
+    serve_parser.add_argument('--workers', type=int, help='Worker processes (default from the CPU count)')
+    serve_parser.add_argument('--worker-class', choices=WORKER_CLASSES, help='Worker model (default SERVE_WORKER_CLASS or gthread)')
+    serve_parser.add_argument('--threads', type=int, help='Threads per gthread worker (default SERVE_THREADS or 4)')
+    serve_parser.add_argument('--dry-run', action='store_true', help='Print the resolved settings and exit')
+    args = parser.parse_args()
+
+    options = None
+    if args.command == 'serve':
+        # Every worker would run its own apply dispatcher and each recycle would stall
+        # it; production submits queued applications from `flask apply-worker` instead
+        os.environ.setdefault('APPLY_QUEUE_IN_PROCESS', 'false')
+        options = serve_options(args)
+        if args.dry_run:
+            print(json.dumps(options, indent=2))
+            return 0
+        if options['worker_class'] == 'gevent':
+            # Patch before the app (and its locks and sockets) is imported
+            from gevent import monkey
+            monkey.patch_all()
+
+    from app import configure_logging
+    configure_logging(os.environ.get('LOG_FILE', 'app.log'))
+
+    if options is not None:
+        if options['workers'] > 1 and os.environ.get('CACHE_BACKEND', 'memory') == 'memory':
+            logger.warning(
+                "CACHE_BACKEND=memory is per worker: responses are only cached for "
+                "CACHE_LOCAL_TTL seconds; set CACHE_BACKEND=redis to share the cache"
+            )
+        serve(options)
+        return 0
+
+    from app import run_app
+
+    logger.info(f"Starting AWS Job Search Python application on port {args.port}")
+    logger.info(f"You can view the application at: http://localhost:{args.port}")
+    run_app(port=args.port)
+    return 0
+
 if __name__ == "__main__":
     try:
-        # Use port 8080 since 5000 is likely in use
-        port = int(os.environ.get('PORT', 8080))
-        logger.info(f"Starting AWS Job Search Python application on port {port}")
-        logger.info(f"You can view the application at: http://localhost:{port}")
-        run_app(port=port)
+        sys.exit(main())
     except Exception as e:
         logger.error(f"Failed to start application: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming listing parser against the BeautifulSoup path
+
+Parses the saved listing pages in scripts/fixtures with both parsers, checks they
+extract the same jobs, and reports time per page and peak memory. Use --repeat to
+blow a fixture up into a larger page (its job cards are repeated).
+
+    python scripts/benchmark_listing_parser.py --repeat 20 --rounds 5
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+# Add project root to path to import app modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.job_scraper import JobScraperService, CHUNK_SIZE
+from services.listing_parser import StreamingListingParser, extractor_for
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+BASE_URLS = {
+    'linkedin': 'https://www.linkedin.com/jobs/search/?keywords=aws',
+    'indeed': 'https://www.indeed.com/jobs?q=aws',
+}
+
+def inflate(html, repeat):
+    """Repeats the body of a page so it holds `repeat` times as many cards"""
+    if repeat <= 1:
+        return html
+    start = html.index('<body>') + len('<body>')
+    end = html.rindex('</body>')
+    return html[:start] + html[start:end] * repeat + html[end:]
+
+def parse_soup(scraper, data, source_name, base_url):
+    return scraper.parse_listing(data.decode('utf-8'), source_name, base_url).jobs
+
+def parse_streaming(scraper, data, source_name, base_url):
+    parser = StreamingListingParser(extractor_for(source_name))
+    chunks = (data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE))
+    return [scraper.job_from_fields(fields, base_url) for fields in parser.iter_jobs(chunks)]
+
+def comparable(jobs):
+    """Drops the time of day, which differs between parses for relative dates like 'today'"""
+    return [{**job, 'posted_date': job['posted_date'] and job['posted_date'].date()} for job in jobs]
+
+def measure(parse, scraper, data, source_name, base_url, rounds):
+    """Returns (jobs, best seconds per parse, peak traced bytes)"""
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        jobs = parse(scraper, data, source_name, base_url)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    parse(scraper, data, source_name, base_url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return jobs, best, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=1, help='Repeat each fixture page this many times')
+    parser.add_argument('--rounds', type=int, default=3, help='Timed parses per parser; the best is reported')
+    args = parser.parse_args()
+
+    scraper = JobScraperService()
+    print(f"{'fixture':<12} {'size':>9} {'jobs':>6} {'soup ms':>9} {'stream ms':>10} {'soup peak':>10} {'stream peak':>12}")
+    for filename in sorted(os.listdir(FIXTURES_DIR)):
+        if not filename.endswith('.html'):
+            continue
+        source_name = filename.split('_')[0]
+        with open(os.path.join(FIXTURES_DIR, filename), encoding='utf-8') as f:
+            data = inflate(f.read(), args.repeat).encode('utf-8')
+        base_url = BASE_URLS.get(source_name, 'http://localhost/')
+
+        soup_jobs, soup_time, soup_peak = measure(parse_soup, scraper, data, source_name, base_url, args.rounds)
+        stream_jobs, stream_time, stream_peak = measure(parse_streaming, scraper, data, source_name, base_url, args.rounds)
+
+        if comparable(soup_jobs) != comparable(stream_jobs):
+            print(f"{source_name}: parsers disagree ({len(soup_jobs)} vs {len(stream_jobs)} jobs)")
+            return 1
+
+        print(
+            f"{source_name:<12} {len(data) / 1024:>7.0f}KB {len(stream_jobs):>6} "
+            f"{soup_time * 1000:>9.1f} {stream_time * 1000:>10.1f} "
+            f"{soup_peak / 1024 / 1024:>8.1f}MB {stream_peak / 1024 / 1024:>10.1f}MB"
+        )
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
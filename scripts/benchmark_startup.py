@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark application cold start
+
+Starts fresh interpreters, as a new gunicorn worker or autoscaled instance would,
+and times importing the app module, create_app() and the first request. It also
+lists which heavy optional modules a web worker ended up importing. Each mode is
+run --rounds times and the median is reported.
+
+    python scripts/benchmark_startup.py --rounds 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules a web worker shouldn't need to import
+HEAVY_MODULES = ('requests', 'bs4', 'selenium', 'numpy', 'scipy', 'alembic', 'redis')
+
+CHILD = '''
+import json, sys, time
+started = time.perf_counter()
+import app as app_module
+imported = time.perf_counter()
+app = app_module.create_app()
+created = time.perf_counter()
+response = app.test_client().get('/')
+served = time.perf_counter()
+print(json.dumps({
+    'import': imported - started,
+    'create_app': created - imported,
+    'first_request': served - created,
+    'status': response.status_code,
+    'heavy': sorted(name for name in %r if name in sys.modules),
+}))
+'''
+
+MODES = {
+    'development': {'AUTO_CREATE_TABLES': 'true'},
+    'production': {'AUTO_CREATE_TABLES': 'false'},
+}
+
+def run_child(env):
+    """Starts one interpreter and returns its timings"""
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD % (HEAVY_MODULES,)],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rounds', type=int, default=5, help='Interpreters started per mode')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, 'startup.db')
+        base_env = {
+            **os.environ,
+            'DATABASE_URL': f'sqlite:///{database}',
+            'LOG_FILE': '',
+            'PYTHONDONTWRITEBYTECODE': '1',
+        }
+        # Create the schema once, so production mode starts against an existing database
+        run_child({**base_env, **MODES['development']})
+
+        print(f"{'mode':<12} {'import ms':>10} {'create_app ms':>14} {'1st request ms':>15} {'total ms':>9}  heavy modules")
+        for mode, overrides in MODES.items():
+            runs = [run_child({**base_env, **overrides}) for _ in range(args.rounds)]
+            phases = {
+                phase: statistics.median(run[phase] for run in runs) * 1000
+                for phase in ('import', 'create_app', 'first_request')
+            }
+            heavy = sorted({name for run in runs for name in run['heavy']})
+            print(
+                f"{mode:<12} {phases['import']:>10.1f} {phases['create_app']:>14.1f} "
+                f"{phases['first_request']:>15.1f} {sum(phases.values()):>9.1f}  {', '.join(heavy) or '-'}"
+            )
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Load test the production server in each worker mode
+
+Seeds a throwaway SQLite database, starts `run.py serve` with each worker class
+on a local port, logs a test user in and drives the server from concurrent
+keep-alive clients for a fixed time. Reports throughput, latency percentiles and
+errors per mode. Modes whose dependencies are missing (gevent) are skipped.
+
+    python scripts/load_test.py --duration 15 --concurrency 64
+    python scripts/load_test.py --modes gthread --workers 4 --path '/api/jobs?per_page=50'
+
+Client and server share the machine, so compare modes against each other rather
+than reading the numbers as capacity; run against a real instance for that.
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+DEFAULT_PATHS = ['/api/jobs?per_page=20', '/api/jobs?query=aws&per_page=20', '/']
+
+SEED = '''
+from datetime import datetime, timedelta
+from app import create_app, db
+from models import User, Job
+
+app = create_app()
+with app.app_context():
+    user = User(username='loadtest', email='loadtest@example.com')
+    user.set_password('loadtest')
+    db.session.add(user)
+    db.session.add_all([
+        Job(title=f'AWS Engineer {i}', company=f'Company {i %% 50}', location='Remote',
+            description='Build and run services on EC2, S3, Lambda and RDS. ' * 5,
+            url=f'https://www.linkedin.com/jobs/view/{i}', platform='linkedin',
+            posted_date=datetime(2024, 1, 1) + timedelta(hours=i),
+            aws_services=['EC2', 'S3'], is_easy_apply=i %% 2 == 0)
+        for i in range(%d)
+    ])
+    db.session.commit()
+'''
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_until_up(port, process, timeout=30):
+    """Waits for the server to accept requests"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/')
+            connection.getresponse().read()
+            connection.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("Server didn't start in time")
+
+def login(port):
+    """Logs the seeded user in and returns the session cookie"""
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    body = urlencode({'email': 'loadtest@example.com', 'password': 'loadtest'})
+    connection.request('POST', '/login', body=body, headers={'Content-Type': 'application/x-www-form-urlencoded'})
+    response = connection.getresponse()
+    response.read()
+    connection.close()
+    cookie = response.getheader('Set-Cookie')
+    if not cookie:
+        raise RuntimeError(f"Login failed with status {response.status}")
+    return cookie.split(';', 1)[0]
+
+def client(port, paths, cookie, deadline, latencies, errors, offset):
+    """Sends requests over one keep-alive connection until the deadline"""
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    index = offset
+    while time.monotonic() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        started = time.perf_counter()
+        try:
+            connection.request('GET', path, headers={'Cookie': cookie})
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors.append(response.status)
+            else:
+                latencies.append(time.perf_counter() - started)
+            if response.getheader('Connection', '').lower() == 'close':
+                connection.close()
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            connection.close()
+    connection.close()
+
+def run_mode(mode, args, env):
+    """Starts the server in one mode, loads it and returns the stats"""
+    port = free_port()
+    command = [sys.executable, 'run.py', 'serve', '--worker-class', mode, '--bind', f'127.0.0.1:{port}']
+    if args.workers:
+        command += ['--workers', str(args.workers)]
+    server = subprocess.Popen(command, cwd=PROJECT_ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_up(port, server)
+        cookie = login(port)
+
+        # Warm every worker up before measuring
+        warmup_deadline = time.monotonic() + 1
+        threads = [
+            threading.Thread(target=client, args=(port, args.paths, cookie, warmup_deadline, [], [], i))
+            for i in range(args.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        latencies, errors = [], []
+        started = time.monotonic()
+        deadline = started + args.duration
+        threads = [
+            threading.Thread(target=client, args=(port, args.paths, cookie, deadline, latencies, errors, i))
+            for i in range(args.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    latencies.sort()
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed,
+        'p50': statistics.median(latencies) * 1000 if latencies else 0.0,
+        'p95': percentile(0.95),
+        'p99': percentile(0.99),
+        'errors': len(errors),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--modes', default='sync,gthread,gevent', help='Comma-separated worker classes to compare')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds of load per mode')
+    parser.add_argument('--concurrency', type=int, default=32, help='Concurrent client connections')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: sized by run.py)')
+    parser.add_argument('--jobs', type=int, default=2000, help='Jobs seeded into the test database')
+    parser.add_argument('--path', dest='paths', action='append', help='Path to request (repeatable)')
+    args = parser.parse_args()
+    args.paths = args.paths or DEFAULT_PATHS
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            'DATABASE_URL': f"sqlite:///{os.path.join(directory, 'load_test.db')}",
+            'LOG_FILE': '',
+            'SECRET_KEY': 'load-test',
+            'AUTO_CREATE_TABLES': 'true',
+            'APPLY_QUEUE_IN_PROCESS': 'false',
+        }
+        subprocess.run([sys.executable, '-c', SEED % args.jobs], cwd=PROJECT_ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        print(f"{'mode':<8} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for mode in args.modes.split(','):
+            mode = mode.strip()
+            if mode == 'gevent':
+                try:
+                    import gevent  # noqa: F401
+                except ImportError:
+                    print(f"{mode:<8} skipped (gevent is not installed)")
+                    continue
+            stats = run_mode(mode, args, env)
+            print(
+                f"{mode:<8} {stats['requests']:>9} {stats['rps']:>8.1f} {stats['p50']:>8.1f} "
+                f"{stats['p95']:>8.1f} {stats['p99']:>8.1f} {stats['errors']:>7}"
+            )
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
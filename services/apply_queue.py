@@ -0,0 +1,362 @@
+"""
+ApplyQueue submits auto-applications in the background
+
+Applying only records an Application with submission_status 'queued', so the
+request returns straight away. Dispatchers poll the table for due submissions,
+claim each one with a conditional UPDATE (any number of processes can share the
+queue) and run the platform call on a bounded thread pool. Per-platform caps on
+concurrent submissions are global: a dispatcher counts the in-progress rows of
+every process when it claims, and on PostgreSQL dispatchers take turns claiming
+under an advisory lock, so the caps hold however many dispatchers run. Web
+processes started by `run.py serve` leave dispatching to `flask apply-worker`.
+Failed submissions are retried with
+exponential backoff up to APPLY_MAX_ATTEMPTS, and a claim whose worker died is
+taken over after APPLY_LEASE_SECONDS. Clients poll the Application row.
+"""
+
+import atexit
+import logging
+import random
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_, text, update
+
+from services.auto_apply import AutoApplyService
+from services.platforms import platform_for_url
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+IN_PROGRESS = 'in_progress'
+SUBMITTED = 'submitted'
+FAILED = 'failed'
+
+# Upper bound on the delay before a retry
+MAX_BACKOFF_SECONDS = 3600
+
+# PostgreSQL advisory lock serializing claims, so two dispatchers can't both see a free platform slot
+CLAIM_LOCK_KEY = 0x6170706c79
+
+def parse_platform_limits(value):
+    """
+    Parses per-platform concurrency caps
+
+    Args:
+        value: A 'linkedin=1,indeed=3' string, or a dict of platform name to cap
+
+    Returns:
+        A dict of platform name to cap
+    """
+    if isinstance(value, dict):
+        return dict(value)
+
+    limits = {}
+    for item in (value or '').split(','):
+        if not item.strip():
+            continue
+        name, _, limit = item.partition('=')
+        try:
+            limits[name.strip().lower()] = int(limit)
+        except ValueError:
+            raise ValueError(f"Invalid platform concurrency: {item}")
+    return limits
+
+class ApplyQueue:
+    """Service for queueing and submitting auto-applications"""
+
+    _lock = threading.Lock()
+    _claim_lock = threading.Lock()
+    _dispatcher = None
+    # Set when work is queued or a worker frees up, to cut a dispatcher's poll short
+    _wake = threading.Event()
+
+    def __init__(self, app=None, workers=None):
+        if app is None:
+            from flask import current_app
+            app = current_app._get_current_object()
+        self.app = app
+
+        config = app.config
+        self.workers = workers or config.get('APPLY_WORKERS', 4)
+        self.platform_limits = parse_platform_limits(config.get('APPLY_PLATFORM_CONCURRENCY'))
+        self.default_platform_limit = config.get('APPLY_PLATFORM_DEFAULT_CONCURRENCY', 2)
+        self.max_attempts = config.get('APPLY_MAX_ATTEMPTS', 5)
+        self.retry_base = config.get('APPLY_RETRY_BASE_SECONDS', 30)
+        self.poll_interval = config.get('APPLY_POLL_SECONDS', 5)
+        self.lease = config.get('APPLY_LEASE_SECONDS', 300)
+
+        self.service = AutoApplyService()
+        # Submissions running on this dispatcher's pool
+        self._in_flight = 0
+        self._state_lock = threading.Lock()
+
+    def enqueue(self, user_id, job_id, notes=None):
+        """
+        Records a queued application in the current transaction
+
+        The caller commits, then calls notify().
+
+        Args:
+            user_id: The ID of the user applying
+            job_id: The ID of the job to apply to
+            notes: Optional notes for the application
+
+        Returns:
+            The flushed Application
+
+        Raises:
+            IntegrityError: If the user has already applied to the job
+        """
+        from models import Application, db
+
+        application = Application(
+            user_id=user_id,
+            job_id=job_id,
+            status='applied',
+            notes=notes,
+            submission_status=QUEUED,
+            attempts=0,
+            next_attempt_at=datetime.utcnow()
+        )
+        db.session.add(application)
+        db.session.flush()
+        return application
+
+    def requeue(self, application):
+        """
+        Queues a failed submission again with a fresh attempt budget
+
+        Args:
+            application: An Application whose submission failed
+        """
+        application.submission_status = QUEUED
+        application.attempts = 0
+        application.next_attempt_at = datetime.utcnow()
+        application.claimed_at = None
+        application.last_error = None
+
+    def notify(self):
+        """Wakes the dispatcher after queueing work, starting it first if it runs in this process"""
+        self.ensure_workers()
+        ApplyQueue._wake.set()
+
+    def ensure_workers(self):
+        """Starts this process's dispatcher thread if APPLY_QUEUE_IN_PROCESS is set and it isn't running"""
+        if not self.app.config.get('APPLY_QUEUE_IN_PROCESS'):
+            return
+
+        with self._lock:
+            if ApplyQueue._dispatcher is not None and ApplyQueue._dispatcher.is_alive():
+                return
+
+            stop = threading.Event()
+            ApplyQueue._dispatcher = threading.Thread(
+                target=self.run, args=(stop,), name='apply-dispatcher', daemon=True
+            )
+            ApplyQueue._dispatcher.start()
+
+            def shutdown():
+                stop.set()
+                ApplyQueue._wake.set()
+
+            # Let in-flight submissions finish; anything still claimed is retried after its lease
+            atexit.register(shutdown)
+
+    def run(self, stop=None, drain=False):
+        """
+        Claims due submissions and runs them on the worker pool until stopped
+
+        Args:
+            stop: Optional threading.Event that ends the loop
+            drain: Return once nothing is due or running instead of polling forever
+
+        Returns:
+            The number of submissions claimed
+        """
+        stop = stop or threading.Event()
+        claimed_total = 0
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='apply') as executor:
+            while not stop.is_set():
+                ApplyQueue._wake.clear()
+                try:
+                    claimed = self.dispatch(executor)
+                except Exception as e:
+                    logger.error(f"Error polling the apply queue: {str(e)}")
+                    claimed = 0
+                claimed_total += claimed
+
+                if not claimed:
+                    with self._state_lock:
+                        idle = self._in_flight == 0
+                    if drain and idle:
+                        break
+                    ApplyQueue._wake.wait(self.poll_interval)
+        return claimed_total
+
+    def platform_limit(self, platform):
+        """Returns the number of concurrent submissions allowed to a platform"""
+        return self.platform_limits.get(platform, self.default_platform_limit)
+
+    def dispatch(self, executor):
+        """
+        Claims as many due submissions as there are free workers and platform slots
+
+        Args:
+            executor: The ThreadPoolExecutor that runs the submissions
+
+        Returns:
+            The number of submissions claimed
+        """
+        from models import Application, Job, db
+
+        with self._state_lock:
+            free = self.workers - self._in_flight
+        if free <= 0:
+            return 0
+
+        # Claims are made one dispatcher at a time: across threads by this lock and, on
+        # PostgreSQL, across processes by an advisory lock held until they commit
+        with ApplyQueue._claim_lock, self.app.app_context():
+            if db.session.get_bind().dialect.name == 'postgresql':
+                db.session.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': CLAIM_LOCK_KEY})
+
+            now = datetime.utcnow()
+            expired = now - timedelta(seconds=self.lease)
+            # Submissions in flight on every dispatcher, per platform (jobs stored
+            # before their platform was recorded are classified by URL)
+            in_flight = db.session.query(Job.platform, Job.url).join(
+                Application, Application.job_id == Job.id
+            ).filter(
+                Application.submission_status == IN_PROGRESS,
+                Application.claimed_at >= expired
+            ).all()
+            running = Counter(stored_platform or platform_for_url(url) for stored_platform, url in in_flight)
+
+            # Over-fetch: some rows may be skipped because their platform is at its cap
+            due = db.session.query(
+                Application.id, Application.submission_status, Application.claimed_at,
+                Application.attempts, Job.platform, Job.url
+            ).join(Job, Job.id == Application.job_id).filter(or_(
+                and_(Application.submission_status == QUEUED, Application.next_attempt_at <= now),
+                and_(Application.submission_status == IN_PROGRESS, Application.claimed_at < expired),
+            )).order_by(Application.next_attempt_at, Application.id).limit(free * 4).all()
+
+            claimed = []
+            for row in due:
+                if len(claimed) >= free:
+                    break
+                platform = row.platform or platform_for_url(row.url)
+                if running[platform] >= self.platform_limit(platform):
+                    continue
+
+                # Only one dispatcher wins: the row must still be in the state it was read in
+                unchanged = and_(
+                    Application.id == row.id,
+                    Application.submission_status == row.submission_status,
+                    Application.claimed_at.is_(None) if row.claimed_at is None else Application.claimed_at == row.claimed_at
+                )
+                if row.submission_status == IN_PROGRESS and row.attempts >= self.max_attempts:
+                    # Its worker died on the last attempt
+                    db.session.execute(
+                        update(Application).where(unchanged).values(
+                            submission_status=FAILED, claimed_at=None, last_error='Submission timed out'
+                        ),
+                        execution_options={'synchronize_session': False}
+                    )
+                    continue
+
+                result = db.session.execute(
+                    update(Application).where(unchanged).values(
+                        submission_status=IN_PROGRESS,
+                        claimed_at=now,
+                        attempts=Application.attempts + 1
+                    ),
+                    execution_options={'synchronize_session': False}
+                )
+                if result.rowcount == 1:
+                    claimed.append(row.id)
+                    running[platform] += 1
+
+            db.session.commit()
+
+        for application_id in claimed:
+            with self._state_lock:
+                self._in_flight += 1
+            executor.submit(self._run, application_id)
+
+        if claimed:
+            logger.info(f"Claimed {len(claimed)} queued applications")
+        return len(claimed)
+
+    def _run(self, application_id):
+        """Processes one claimed submission on a worker thread and frees its slot"""
+        try:
+            self.process(application_id)
+        except Exception as e:
+            logger.error(f"Error processing application {application_id}: {str(e)}")
+        finally:
+            with self._state_lock:
+                self._in_flight -= 1
+            ApplyQueue._wake.set()
+
+    def backoff(self, attempts):
+        """
+        Returns the delay before retrying a submission
+
+        Args:
+            attempts: The number of attempts made so far
+
+        Returns:
+            The delay in seconds: doubling per attempt, capped, with jitter so
+            submissions that failed together don't retry together
+        """
+        delay = min(MAX_BACKOFF_SECONDS, self.retry_base * 2 ** max(attempts - 1, 0))
+        return delay * random.uniform(0.5, 1.0)
+
+    def process(self, application_id):
+        """
+        Submits one claimed application and records the outcome
+
+        Args:
+            application_id: The ID of an Application claimed by this worker
+
+        Returns:
+            The application's new submission status, or None if it wasn't claimed
+        """
+        from models import Application, User, Job, db
+
+        with self.app.app_context():
+            application = db.session.get(Application, application_id)
+            if application is None or application.submission_status != IN_PROGRESS:
+                return None
+
+            user = db.session.get(User, application.user_id)
+            job = db.session.get(Job, application.job_id)
+            try:
+                if user is None or job is None:
+                    raise ValueError("User or job not found")
+                self.service.submit(user, job)
+            except ValueError as e:
+                # The job can't be applied to this way; retrying won't help
+                application.submission_status = FAILED
+                application.last_error = str(e)
+            except Exception as e:
+                application.last_error = str(e)
+                if application.attempts >= self.max_attempts:
+                    application.submission_status = FAILED
+                else:
+                    application.submission_status = QUEUED
+                    application.next_attempt_at = datetime.utcnow() + timedelta(
+                        seconds=self.backoff(application.attempts)
+                    )
+                logger.warning(f"Attempt {application.attempts} to submit application {application_id} failed: {str(e)}")
+            else:
+                application.submission_status = SUBMITTED
+                application.last_error = None
+
+            application.claimed_at = None
+            db.session.commit()
+            return application.submission_status
@@ -7,16 +7,21 @@ like LinkedIn, Glassdoor, Shine, Internshala, and Indeed, using the user's resum
 
 import logging
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from services.platforms import get_platform, platform_for_url, register_platform
+from services.user_stats import UserStatsService
+from upsert import dialect_insert
+
 logger = logging.getLogger(__name__)
 
+# Most jobs a single bulk apply may cover
+MAX_BULK_APPLY = 200
+
 class AutoApplyService:
     """Service for automating job applications"""
     
-    def __init__(self):
-        self.platforms = ['linkedin', 'indeed', 'glassdoor', 'shine', 'internshala']
-    
     def is_easy_apply_eligible(self, job):
         """
         Checks if a job is eligible for Easy Apply
@@ -49,27 +54,8 @@ class AutoApplyService:
         if not user or not job:
             raise ValueError("User or job not found")
             
-        if not self.is_easy_apply_eligible(job):
-            raise ValueError("This job does not support Easy Apply")
-            
-        # Determine the appropriate platform method to use
-        source_name = self.get_source_name_from_url(job.url)
-        
         try:
-            # Apply using the platform-specific method
-            if source_name == 'linkedin':
-                self.apply_via_linkedin(user, job)
-            elif source_name == 'indeed':
-                self.apply_via_indeed(user, job)
-            elif source_name == 'glassdoor':
-                self.apply_via_glassdoor(user, job)
-            elif source_name == 'shine':
-                self.apply_via_shine(user, job)
-            elif source_name == 'internshala':
-                self.apply_via_internshala(user, job)
-            else:
-                # Generic application
-                logger.info(f"Using generic application method for {source_name}")
+            self.submit(user, job)
             
             # Create an application record
             application = Application(
@@ -80,6 +66,8 @@ class AutoApplyService:
             )
             
             db.session.add(application)
+            db.session.flush()
+            UserStatsService().increment(user_id, applications=1)
             db.session.commit()
             
             logger.info(f"Successfully applied to job {job_id} for user {user_id}")
@@ -89,6 +77,195 @@ class AutoApplyService:
             logger.error(f"Error applying to job {job_id}: {str(e)}")
             raise
     
+    def matching_job_ids(self, user_id, min_match=None, easy_apply=True, limit=MAX_BULK_APPLY):
+        """
+        Finds the jobs a user hasn't applied to that match a bulk apply filter
+        
+        Args:
+            user_id: The ID of the user applying
+            min_match: Optional minimum resume match score (0-100)
+            easy_apply: Whether to only include Easy Apply jobs
+            limit: The most job IDs to return
+            
+        Returns:
+            A list of job IDs, best matches first
+        """
+        from models import Job, Application, ResumeMatchScore, db
+        
+        query = db.session.query(Job.id).filter(
+            ~db.session.query(Application.id).filter(
+                Application.user_id == user_id, Application.job_id == Job.id
+            ).exists()
+        )
+        if easy_apply:
+            query = query.filter(Job.is_easy_apply.is_(True))
+        if min_match is not None:
+            query = query.join(ResumeMatchScore, db.and_(
+                ResumeMatchScore.job_id == Job.id, ResumeMatchScore.user_id == user_id
+            )).filter(ResumeMatchScore.score >= min_match).order_by(ResumeMatchScore.score.desc(), Job.id)
+        else:
+            query = query.order_by(Job.posted_date.desc(), Job.id)
+        return [job_id for job_id, in query.limit(limit)]
+    
+    def apply_to_jobs(self, user_id, job_ids, queue=None, notes=None, commit=True):
+        """
+        Applies to many jobs at once
+        
+        The user, the jobs and the user's existing applications are each loaded with
+        one query, and every Application row is written with one INSERT in a single
+        transaction. Without a queue, the jobs are grouped by platform and the groups
+        are submitted in parallel, one thread per platform.
+        
+        Args:
+            user_id: The ID of the user applying
+            job_ids: The IDs of the jobs to apply to, at most MAX_BULK_APPLY
+            queue: Optional ApplyQueue; submissions are queued on it instead of made now
+            notes: Optional notes for the applications
+            commit: Whether to commit; pass False to write inside the caller's transaction
+            
+        Returns:
+            A list of dicts with 'job_id', 'result' and, where relevant,
+            'application_id' and 'error', in the order of job_ids. The result is one
+            of 'queued', 'submitted', 'failed', 'already_applied', 'not_eligible'
+            or 'not_found'.
+            
+        Raises:
+            ValueError: If the user doesn't exist or there are too many jobs
+        """
+        from models import User, Job, Application, db
+        
+        job_ids = list(dict.fromkeys(job_ids))
+        if len(job_ids) > MAX_BULK_APPLY:
+            raise ValueError(f"Cannot apply to more than {MAX_BULK_APPLY} jobs at once")
+        
+        user = db.session.get(User, user_id)
+        if user is None:
+            raise ValueError("User not found")
+        
+        jobs = {job.id: job for job in Job.query.filter(Job.id.in_(job_ids))} if job_ids else {}
+        applied = {
+            job_id for job_id, in db.session.query(Application.job_id).filter(
+                Application.user_id == user_id, Application.job_id.in_(job_ids)
+            )
+        } if job_ids else set()
+        
+        results = {}
+        eligible = []
+        for job_id in job_ids:
+            job = jobs.get(job_id)
+            if job is None:
+                results[job_id] = {'job_id': job_id, 'result': 'not_found'}
+            elif job_id in applied:
+                results[job_id] = {'job_id': job_id, 'result': 'already_applied'}
+            elif not self.is_easy_apply_eligible(job):
+                results[job_id] = {'job_id': job_id, 'result': 'not_eligible'}
+            else:
+                eligible.append(job)
+        
+        now = datetime.utcnow()
+        if queue is not None:
+            from services.apply_queue import QUEUED
+            
+            record = eligible
+            values = {'submission_status': QUEUED, 'next_attempt_at': now}
+            result = 'queued'
+        else:
+            groups = {}
+            for job in eligible:
+                groups.setdefault(self.platform_for_job(job), []).append(job)
+            
+            record = []
+            if groups:
+                with ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix='apply') as executor:
+                    for outcomes in executor.map(lambda group: self._submit_group(user, group), groups.values()):
+                        for job, error in outcomes:
+                            if error is None:
+                                record.append(job)
+                            else:
+                                results[job.id] = {'job_id': job.id, 'result': 'failed', 'error': error}
+            values = {}
+            result = 'submitted'
+        
+        # IDs are read before committing, which expires the loaded jobs
+        record_ids = [job.id for job in record]
+        try:
+            inserted = {}
+            if record:
+                # A concurrent apply may have recorded some of these meanwhile; those rows are skipped
+                statement = dialect_insert(db.session, Application).on_conflict_do_nothing(
+                    index_elements=['user_id', 'job_id']
+                ).returning(Application.id, Application.job_id)
+                rows = [
+                    {'user_id': user_id, 'job_id': job_id, 'status': 'applied', 'applied_date': now,
+                     'notes': notes, 'attempts': 0, **values}
+                    for job_id in record_ids
+                ]
+                inserted = {job_id: application_id for application_id, job_id in db.session.execute(statement, rows)}
+                if inserted:
+                    UserStatsService().increment(user_id, applications=len(inserted))
+            if commit:
+                db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error applying to jobs for user {user_id}: {str(e)}")
+            raise
+        
+        for job_id in record_ids:
+            if job_id in inserted:
+                results[job_id] = {'job_id': job_id, 'result': result, 'application_id': inserted[job_id]}
+            else:
+                results[job_id] = {'job_id': job_id, 'result': 'already_applied'}
+        
+        logger.info(f"Bulk applied to {len(inserted)} of {len(job_ids)} jobs for user {user_id}")
+        return [results[job_id] for job_id in job_ids]
+    
+    def _submit_group(self, user, jobs):
+        """Submits one platform's jobs in turn, returning (job, error or None) tuples"""
+        outcomes = []
+        for job in jobs:
+            try:
+                self.submit(user, job)
+                outcomes.append((job, None))
+            except Exception as e:
+                logger.error(f"Error applying to job {job.id}: {str(e)}")
+                outcomes.append((job, str(e)))
+        return outcomes
+    
+    def submit(self, user, job):
+        """
+        Submits an application on the job's platform, without recording it
+        
+        Args:
+            user: The user applying
+            job: The job to apply to
+            
+        Raises:
+            ValueError: If the job does not support Easy Apply
+        """
+        if not self.is_easy_apply_eligible(job):
+            raise ValueError("This job does not support Easy Apply")
+            
+        # Apply using the handler registered for the job's platform
+        source_name = self.platform_for_job(job)
+        platform = get_platform(source_name)
+        if platform is not None and platform.apply_handler is not None:
+            platform.apply_handler(self, user, job)
+        else:
+            # Generic application
+            logger.info(f"Using generic application method for {source_name}")
+    
+    def platform_for_job(self, job):
+        """
+        Returns the platform a job is applied on
+        
+        Args:
+            job: The job, whose stored platform is used when set
+            
+        Returns:
+            The platform name
+        """
+        return job.platform or platform_for_url(job.url)
+    
     def get_source_name_from_url(self, url):
         """
         Extracts the name of the job source from its URL
@@ -99,10 +276,7 @@ class AutoApplyService:
         Returns:
             The name of the job source
         """
-        for platform in self.platforms:
-            if platform in url.lower():
-                return platform
-        return "other"
+        return platform_for_url(url)
     
     def apply_via_linkedin(self, user, job):
         """
@@ -157,4 +331,11 @@ class AutoApplyService:
             job: The job to apply to
         """
         # This would implement Internshala API integration in a production environment
-        logger.info(f"Applied to Internshala job {job.id} for user {user.id}")
\ No newline at end of file
+        logger.info(f"Applied to Internshala job {job.id} for user {user.id}")
+
+# Built-in Easy Apply integrations; other platforms can register theirs the same way
+register_platform('linkedin', apply_handler=AutoApplyService.apply_via_linkedin)
+register_platform('indeed', apply_handler=AutoApplyService.apply_via_indeed)
+register_platform('glassdoor', apply_handler=AutoApplyService.apply_via_glassdoor)
+register_platform('shine', apply_handler=AutoApplyService.apply_via_shine)
+register_platform('internshala', apply_handler=AutoApplyService.apply_via_internshala)
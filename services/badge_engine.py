@@ -0,0 +1,184 @@
+"""
+BadgeEngine awards badges from rules stored in Badge.requirements
+
+Requirements are a JSON object mapping a UserStats counter to the minimum value
+needed, e.g. ``{"answers": 5}``; every listed counter must reach its threshold.
+Each write event only touches a few counters, so the engine only evaluates the
+rules that read one of those counters, reads the user's cached counters once and
+awards any new badges in a single transaction.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from services.user_stats import UserStatsService
+
+logger = logging.getLogger(__name__)
+
+# Counters each write event can change
+EVENT_COUNTERS = {
+    'apply': {'applications'},
+    'save': {'saved_jobs'},
+    'bookmark': {'bookmarked_questions'},
+    'answer': {'answers', 'answered_field_count'},
+    'upvote': {'total_upvotes'},
+}
+
+# Requirements for the seeded badges, used when a Badge row has none stored
+DEFAULT_REQUIREMENTS = {
+    'AWS Solver': {'answers': 5},
+    'AWS Expert': {'total_upvotes': 10},
+    'AWS Guru': {'answered_field_count': 5},
+}
+
+# Seconds cached rules are used before the Badge table is read again
+RULES_TTL_SECONDS = 300
+
+class BadgeEngine:
+    """Service for evaluating badge rules and awarding badges"""
+
+    # Rules are cached per process for RULES_TTL_SECONDS; reload_rules() drops them sooner
+    _rules = None
+    _rules_loaded_at = 0.0
+    _executor = None
+    _lock = threading.Lock()
+
+    def load_rules(self):
+        """
+        Loads badge rules from the Badge table
+
+        An empty rule set isn't cached, so badges seeded after the first event
+        take effect straight away.
+
+        Returns:
+            A list of (badge_id, requirements) tuples
+        """
+        expired = time.monotonic() - BadgeEngine._rules_loaded_at >= RULES_TTL_SECONDS
+        if BadgeEngine._rules is None or expired:
+            from models import Badge
+
+            rules = []
+            for badge in Badge.query.all():
+                requirements = badge.requirements or DEFAULT_REQUIREMENTS.get(badge.name)
+                if requirements:
+                    rules.append((badge.id, dict(requirements)))
+            if not rules:
+                return rules
+            BadgeEngine._rules = rules
+            BadgeEngine._rules_loaded_at = time.monotonic()
+        return BadgeEngine._rules
+
+    @classmethod
+    def reload_rules(cls):
+        """Drops the cached rules so they are reloaded on next use"""
+        cls._rules = None
+
+    def rules_for_event(self, event):
+        """
+        Selects the rules a write event can affect
+
+        Args:
+            event: The event name, one of EVENT_COUNTERS
+
+        Returns:
+            A list of (badge_id, requirements) tuples
+        """
+        counters = EVENT_COUNTERS.get(event, set())
+        return [
+            (badge_id, requirements)
+            for badge_id, requirements in self.load_rules()
+            if counters.intersection(requirements)
+        ]
+
+    def handle_event(self, user_id, event, commit=True):
+        """
+        Evaluates the rules affected by an event and awards any newly earned badges
+
+        Args:
+            user_id: The ID of the user whose counters changed
+            event: The event name, one of EVENT_COUNTERS
+            commit: Whether to commit; pass False to award inside the caller's transaction
+
+        Returns:
+            A list of newly created UserBadge records
+        """
+        from models import UserBadge, db
+
+        rules = self.rules_for_event(event)
+        if not rules:
+            return []
+
+        stats = UserStatsService().get(user_id, commit=False)
+        if stats is None:
+            return []
+
+        earned = [
+            badge_id for badge_id, requirements in rules
+            if all((getattr(stats, counter, 0) or 0) >= threshold
+                   for counter, threshold in requirements.items())
+        ]
+        if not earned:
+            return []
+
+        owned = {
+            badge_id for (badge_id,) in db.session.query(UserBadge.badge_id).filter(
+                UserBadge.user_id == user_id,
+                UserBadge.badge_id.in_(earned)
+            )
+        }
+
+        awarded = []
+        for badge_id in earned:
+            if badge_id not in owned:
+                user_badge = UserBadge(user_id=user_id, badge_id=badge_id, awarded_at=datetime.utcnow())
+                # A savepoint, so a badge awarded concurrently doesn't abort the caller's transaction
+                try:
+                    with db.session.begin_nested():
+                        db.session.add(user_badge)
+                except IntegrityError:
+                    continue
+                awarded.append(user_badge)
+
+        if commit:
+            db.session.commit()
+
+        if awarded:
+            logger.info(f"Awarded badges {[ub.badge_id for ub in awarded]} to user {user_id}")
+        return awarded
+
+    def handle_event_async(self, app, user_id, event):
+        """
+        Evaluates an event on a background thread after the request's transaction
+
+        Args:
+            app: The Flask application, used to push an app context on the worker
+            user_id: The ID of the user whose counters changed
+            event: The event name, one of EVENT_COUNTERS
+
+        Returns:
+            A Future for the list of awarded badge IDs
+        """
+        with self._lock:
+            if BadgeEngine._executor is None:
+                BadgeEngine._executor = ThreadPoolExecutor(
+                    max_workers=app.config.get('BADGE_ENGINE_WORKERS', 2),
+                    thread_name_prefix='badge-engine'
+                )
+
+        def run():
+            from models import db
+
+            with app.app_context():
+                try:
+                    return [ub.badge_id for ub in self.handle_event(user_id, event)]
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error(f"Error evaluating badges for user {user_id}: {str(e)}")
+                    return []
+
+        return BadgeEngine._executor.submit(run)
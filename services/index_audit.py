@@ -0,0 +1,121 @@
+"""
+IndexAuditService runs EXPLAIN on the queries made by the routes and reports
+sequential scans
+
+The audited statements are built by the same functions the routes call. On SQLite
+plans come from EXPLAIN QUERY PLAN; on PostgreSQL from EXPLAIN. Note that PostgreSQL may still
+choose a sequential scan on very small tables even when a usable index exists.
+"""
+
+import logging
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+class IndexAuditService:
+    """Service for auditing index usage of route queries"""
+
+    def __init__(self, db=None):
+        if db is None:
+            from models import db
+        self.db = db
+
+    def route_queries(self, user_id=1, job_ids=(1, 2, 3), question_id=1, per_page=10):
+        """
+        Builds the statements made by the routes for a representative user
+
+        The statements come from the same query builders the routes call, so the
+        audit follows any change to a route's query.
+
+        Args:
+            user_id: The user ID to bind into per-user lookups
+            job_ids: The page of job IDs to bind into per-job lookups
+            question_id: The question ID to bind into per-question lookups
+            per_page: The page size of the paginated listings
+
+        Returns:
+            A dict mapping a descriptive name to a SQLAlchemy select statement
+        """
+        from pagination import keyset_query
+        from queries import (JOB_ORDERING, APPLICATION_ORDERING, QUESTION_ORDERING, jobs_query,
+                             user_applications_query, field_questions_query, bookmark_query,
+                             answers_page_query, user_answers_query, user_badges_query)
+        from services.job_annotator import JobAnnotator
+        from services.user_stats import UserStatsService
+
+        saved, applied, scores = JobAnnotator().queries(user_id, list(job_ids))
+        stats_service = UserStatsService()
+
+        queries = {
+            'search_jobs: latest jobs': jobs_query().limit(per_page),
+            'search_jobs: latest jobs (cursor)': keyset_query(jobs_query(), JOB_ORDERING, '', per_page),
+            'search_jobs: saved lookup': saved,
+            'search_jobs: applied lookup': applied,
+            'search_jobs: match score lookup': scores,
+            'get_applications: user applications': user_applications_query(user_id).limit(per_page),
+            'get_applications: user applications (cursor)': keyset_query(
+                user_applications_query(user_id), APPLICATION_ORDERING, '', per_page),
+            'get_interview_questions: questions by field': field_questions_query('aws_general').limit(per_page),
+            'get_interview_questions: questions by field (cursor)': keyset_query(
+                field_questions_query('aws_general'), QUESTION_ORDERING, '', per_page),
+            'get_interview_questions: bookmark lookup': bookmark_query(user_id, question_id),
+            'get_daily_question: answers by question': answers_page_query(question_id, 1, per_page),
+            'get_profile: application stats': stats_service.application_stats_query(user_id),
+            'get_profile: user badges': user_badges_query(user_id),
+            'dashboard: recent applications': user_applications_query(user_id).limit(5),
+            'dashboard: recent answers': user_answers_query(user_id).limit(3),
+            'dashboard: recommended jobs': stats_service.recommended_jobs_query(user_id, limit=3),
+        }
+        return {name: query.statement for name, query in queries.items()}
+
+    def explain(self, statement):
+        """
+        Returns the query plan for a statement
+
+        Args:
+            statement: A SQLAlchemy select statement
+
+        Returns:
+            A list of plan lines
+        """
+        dialect = self.db.engine.dialect
+        sql = str(statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+
+        with self.db.engine.connect() as conn:
+            if dialect.name == 'sqlite':
+                # Rows are (id, parent, notused, detail)
+                return [row[-1] for row in conn.execute(text(f'EXPLAIN QUERY PLAN {sql}'))]
+            return [row[0] for row in conn.execute(text(f'EXPLAIN {sql}'))]
+
+    def is_sequential_scan(self, plan_line):
+        """
+        Checks whether a plan line describes a full table scan
+
+        Args:
+            plan_line: A single line of query plan output
+
+        Returns:
+            Boolean indicating whether the line is a sequential scan
+        """
+        line = plan_line.strip()
+        if self.db.engine.dialect.name == 'sqlite':
+            # "SCAN job USING INDEX ..." walks an index in order; a bare "SCAN job" does not
+            return line.startswith('SCAN ') and 'USING' not in line
+        return 'Seq Scan' in line
+
+    def audit(self):
+        """
+        Explains every route query and collects sequential scans
+
+        Returns:
+            A list of dicts with 'name', 'plan' and 'seq_scans' keys, one per query
+        """
+        results = []
+        for name, statement in self.route_queries().items():
+            plan = self.explain(statement)
+            seq_scans = [line for line in plan if self.is_sequential_scan(line)]
+            if seq_scans:
+                logger.warning(f"Sequential scan in {name}: {seq_scans}")
+            results.append({'name': name, 'plan': plan, 'seq_scans': seq_scans})
+        return results
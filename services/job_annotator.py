@@ -0,0 +1,81 @@
+"""
+JobAnnotator loads per-user state (saved, applied, match score) for a page of jobs
+
+Instead of querying SavedJob, Application and ResumeMatchScore once per job, the
+annotator issues a single set-based query per table for the whole page and keys
+the results by job id.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+class JobAnnotator:
+    """Service for batch-loading a user's state for a list of jobs"""
+
+    def queries(self, user_id, job_ids):
+        """
+        Builds the set-based lookups annotate() runs for a page of jobs
+
+        Args:
+            user_id: The ID of the user
+            job_ids: A list of job IDs
+
+        Returns:
+            A tuple of (saved, applied, scores) queries
+        """
+        from models import SavedJob, Application, ResumeMatchScore, db
+
+        # Jobs the user has saved
+        saved = db.session.query(SavedJob.job_id).filter(
+            SavedJob.user_id == user_id,
+            SavedJob.job_id.in_(job_ids)
+        )
+
+        # Jobs the user has applied to
+        applied = db.session.query(Application.job_id).filter(
+            Application.user_id == user_id,
+            Application.job_id.in_(job_ids)
+        )
+
+        # Resume match scores for this user
+        scores = db.session.query(ResumeMatchScore.job_id, ResumeMatchScore.score).filter(
+            ResumeMatchScore.user_id == user_id,
+            ResumeMatchScore.job_id.in_(job_ids)
+        )
+
+        return saved, applied, scores
+
+    def annotate(self, user_id, job_ids):
+        """
+        Loads saved/applied/match-score state for a set of jobs in one query per table
+
+        Args:
+            user_id: The ID of the user
+            job_ids: An iterable of job IDs to annotate
+
+        Returns:
+            A dict mapping each job ID to a dict with 'is_saved', 'is_applied'
+            and 'match_score' keys
+        """
+        job_ids = list(set(job_ids))
+        annotations = {
+            job_id: {'is_saved': False, 'is_applied': False, 'match_score': None}
+            for job_id in job_ids
+        }
+
+        if not job_ids:
+            return annotations
+
+        saved_rows, applied_rows, score_rows = self.queries(user_id, job_ids)
+
+        for (job_id,) in saved_rows:
+            annotations[job_id]['is_saved'] = True
+
+        for (job_id,) in applied_rows:
+            annotations[job_id]['is_applied'] = True
+
+        for job_id, score in score_rows:
+            annotations[job_id]['match_score'] = score
+
+        return annotations
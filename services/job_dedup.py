@@ -0,0 +1,364 @@
+"""
+JobDeduplicator merges the same posting scraped from several job boards
+
+Every job gets an exact fingerprint (SHA-1 of its normalized title, company,
+location and a hash of its description's word shingles) and a MinHash signature of
+those shingles. The signature is split into bands whose hashes are stored as
+JobDedupBucket rows, so near-duplicate candidates for a new posting are found with
+one indexed lookup (locality-sensitive hashing) instead of comparing against every
+job. Postings scraped from listing pages have no description; they fingerprint on
+title, company and location alone and only match jobs posted within
+DATE_WINDOW_DAYS of them. Duplicates are merged into the existing Job row, which
+keeps the other boards' URLs in `source_urls`.
+"""
+
+import functools
+import hashlib
+import logging
+import random
+import re
+import struct
+import zlib
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+# Estimated Jaccard similarity at which two descriptions are the same posting
+SIMILARITY_THRESHOLD = 0.7
+# Days apart that postings without a description can be posted and still be the
+# same opening (boards show the same posting with slightly different dates)
+DATE_WINDOW_DAYS = 3
+
+_MASK_64 = (1 << 64) - 1
+
+# Multiply-shift hash functions h(x) = ((a * x + b) mod 2^64) >> 32, with odd a.
+# The arithmetic wraps like uint64, so NumPy computes exactly the same signatures.
+# Fixed seed: signatures are persisted, so the functions must never change.
+_rng = random.Random(1729)
+_PERMUTATIONS = [
+    (_rng.randrange(1, 1 << 64) | 1, _rng.randrange(0, 1 << 64))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+_NON_WORD = re.compile(r'[^a-z0-9+#]+')
+_COMPANY_SUFFIXES = {'inc', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'pvt', 'private', 'gmbh', 'plc'}
+
+# Fields filled in on the surviving row when it is missing them
+MERGE_FIELDS = (
+    'location', 'description', 'job_type', 'salary_range', 'posted_date',
+    'aws_services', 'certification_types'
+)
+
+def normalize_text(text):
+    """Lowercases a text and reduces it to space-separated words"""
+    return ' '.join(_NON_WORD.sub(' ', (text or '').lower()).split())
+
+def normalize_company(company):
+    """Normalizes a company name and drops legal suffixes such as 'Inc' or 'Pvt Ltd'"""
+    words = normalize_text(company).split()
+    while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+def fingerprint(title, company, location, description=None):
+    """
+    Returns the exact-match fingerprint of a posting
+
+    Two reqs for the same role at the same company and location are different
+    postings unless their descriptions match too. Without a description only the
+    title, company and location are compared; find_duplicate() then also requires
+    the posted dates to be close.
+
+    Args:
+        title: The job title
+        company: The company name
+        location: The job location
+        description: The job description
+
+    Returns:
+        A 40-character hex digest
+    """
+    hashes = shingles(description)
+    if hashes:
+        # Order-independent digest of the shingle set
+        body = 'd:' + hashlib.sha1(struct.pack(f'>{len(hashes)}I', *sorted(hashes))).hexdigest()
+    else:
+        body = 'n:'
+    key = '|'.join((normalize_text(title), normalize_company(company), normalize_text(location), body))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def shingles(text, size=SHINGLE_SIZE):
+    """
+    Hashes the overlapping word shingles of a text
+
+    Args:
+        text: The text to shingle
+        size: The number of words per shingle
+
+    Returns:
+        A set of 32-bit shingle hashes
+    """
+    words = normalize_text(text).split()
+    if len(words) < size:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))} if words else set()
+    return {
+        zlib.crc32(' '.join(words[i:i + size]).encode('utf-8'))
+        for i in range(len(words) - size + 1)
+    }
+
+def minhash(text):
+    """
+    Computes the MinHash signature of a text's shingles
+
+    Args:
+        text: The text to sign, typically a job description
+
+    Returns:
+        A list of NUM_PERMUTATIONS integers, or None if the text has no words
+    """
+    hashes = shingles(text)
+    if not hashes:
+        return None
+
+    arrays = _numpy_permutations()
+    if arrays is not None:
+        np, multipliers, increments = arrays
+        values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+        signature = ((multipliers * values + increments) >> np.uint64(32)).min(axis=1)
+        return signature.tolist()
+
+    return [
+        min(((a * h + b) & _MASK_64) >> 32 for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+@functools.lru_cache(maxsize=1)
+def _numpy_permutations():
+    """Returns (numpy, multipliers, increments) column arrays, or None without NumPy"""
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    multipliers = np.array([a for a, _ in _PERMUTATIONS], dtype=np.uint64).reshape(-1, 1)
+    increments = np.array([b for _, b in _PERMUTATIONS], dtype=np.uint64).reshape(-1, 1)
+    return np, multipliers, increments
+
+def signature_similarity(first, second):
+    """Estimates the Jaccard similarity of two signed texts from their signatures"""
+    if not first or not second or len(first) != len(second):
+        return 0.0
+    return sum(1 for a, b in zip(first, second) if a == b) / len(first)
+
+def band_buckets(signature):
+    """
+    Splits a signature into LSH bands
+
+    Args:
+        signature: A MinHash signature
+
+    Returns:
+        A list of (band, bucket) tuples, bucket being a 16-character hex digest
+    """
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(struct.pack(f'>{len(rows)}Q', *rows), digest_size=8).hexdigest()
+        buckets.append((band, digest))
+    return buckets
+
+class JobDeduplicator:
+    """Service for detecting and merging duplicate job postings"""
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+
+    def sign(self, job):
+        """
+        Computes and sets a job's fingerprint and description signature
+
+        Args:
+            job: A Job object
+        """
+        job.fingerprint = fingerprint(job.title, job.company, job.location, job.description)
+        job.description_minhash = minhash(job.description)
+
+    def find_duplicate(self, job):
+        """
+        Finds an existing job that is the same posting as a signed job
+
+        Args:
+            job: A signed Job object, usually not yet added to the session. For a
+                saved job, only older jobs are considered.
+
+        Returns:
+            The existing Job, or None
+        """
+        from models import Job, JobDedupBucket, db
+
+        if job.id is None and job.url:
+            # A posting scraped again, perhaps with edited details (URLs are unique)
+            match = Job.query.filter(Job.url == job.url).first()
+            if match is not None:
+                return match
+
+        exact = Job.query.filter(Job.fingerprint == job.fingerprint)
+        if not job.description_minhash:
+            # Nothing but the posted date tells apart openings for the same role
+            posted = job.posted_date or datetime.utcnow()
+            window = timedelta(days=DATE_WINDOW_DAYS)
+            exact = exact.filter(Job.posted_date.between(posted - window, posted + window))
+        if job.id is not None:
+            exact = exact.filter(Job.id < job.id)
+        match = exact.order_by(Job.id).first()
+        if match is not None:
+            return match
+
+        if not job.description_minhash:
+            return None
+
+        buckets = band_buckets(job.description_minhash)
+        candidate_ids = db.session.query(JobDedupBucket.job_id).filter(
+            db.tuple_(JobDedupBucket.band, JobDedupBucket.bucket).in_(buckets)
+        ).distinct()
+        if job.id is not None:
+            candidate_ids = candidate_ids.filter(JobDedupBucket.job_id < job.id)
+
+        company = normalize_company(job.company)
+        best, best_similarity = None, 0.0
+        for candidate in Job.query.filter(Job.id.in_(candidate_ids.scalar_subquery())).order_by(Job.id):
+            # The same description from a different company is a template, not a duplicate
+            if normalize_company(candidate.company) != company:
+                continue
+            similarity = signature_similarity(job.description_minhash, candidate.description_minhash)
+            if similarity >= self.threshold and similarity > best_similarity:
+                best, best_similarity = candidate, similarity
+        return best
+
+    def index(self, job):
+        """
+        Stores the LSH buckets of a signed, flushed job
+
+        Args:
+            job: A Job object with an ID
+        """
+        from models import JobDedupBucket, db
+
+        JobDedupBucket.query.filter_by(job_id=job.id).delete(synchronize_session=False)
+        if job.description_minhash:
+            db.session.add_all([
+                JobDedupBucket(band=band, bucket=bucket, job_id=job.id)
+                for band, bucket in band_buckets(job.description_minhash)
+            ])
+
+    def merge(self, survivor, duplicate):
+        """
+        Folds a duplicate posting's URLs and missing details into the surviving job
+
+        Args:
+            survivor: The Job that is kept
+            duplicate: The duplicate Job, or an unsaved Job holding the scraped posting
+        """
+        urls = list(survivor.source_urls or [])
+        for url in [duplicate.url] + list(duplicate.source_urls or []):
+            if url and url != survivor.url and url not in urls:
+                urls.append(url)
+        survivor.source_urls = urls
+
+        for field in MERGE_FIELDS:
+            if not getattr(survivor, field) and getattr(duplicate, field):
+                setattr(survivor, field, getattr(duplicate, field))
+        survivor.is_easy_apply = survivor.is_easy_apply or duplicate.is_easy_apply
+
+        # Its description may have been filled in from the duplicate
+        self.sign(survivor)
+
+    def add(self, job):
+        """
+        Adds a scraped job to the session unless it duplicates an existing one
+
+        Args:
+            job: An unsaved Job object
+
+        Returns:
+            A (job, created) tuple: the new job, or the existing job it was merged into
+        """
+        from models import db
+
+        self.sign(job)
+        existing = self.find_duplicate(job)
+        if existing is not None:
+            self.merge(existing, job)
+            self.index(existing)
+            return existing, False
+
+        db.session.add(job)
+        db.session.flush()
+        self.index(job)
+        return job, True
+
+    def _absorb(self, survivor, duplicate):
+        """Moves a duplicate's user data onto the survivor and deletes it"""
+        from models import Application, SavedJob, ResumeMatchScore, JobDedupBucket, db
+
+        for model in (Application, SavedJob, ResumeMatchScore):
+            survivor_users = db.session.query(model.user_id).filter(model.job_id == survivor.id)
+            # Unique (user_id, job_id) indexes: a user keeps their row on the survivor
+            model.query.filter(
+                model.job_id == duplicate.id, model.user_id.in_(survivor_users.scalar_subquery())
+            ).delete(synchronize_session=False)
+            model.query.filter(model.job_id == duplicate.id).update(
+                {'job_id': survivor.id}, synchronize_session=False
+            )
+
+        self.merge(survivor, duplicate)
+        JobDedupBucket.query.filter_by(job_id=duplicate.id).delete(synchronize_session=False)
+        db.session.delete(duplicate)
+
+    def rebuild(self, merge=False, batch_size=500):
+        """
+        Signs and indexes every job, optionally merging existing duplicates
+
+        Jobs are processed oldest first, so the earliest posting survives a merge.
+
+        Args:
+            merge: Whether to merge duplicates, or only report them
+            batch_size: The number of jobs loaded per query
+
+        Returns:
+            A list of (survivor_id, duplicate_id) tuples
+        """
+        from models import Job, JobDedupBucket, db
+        from services.tfidf_matcher import unindex_jobs
+
+        JobDedupBucket.query.delete()
+        db.session.commit()
+
+        duplicates = []
+        last_id = 0
+        while True:
+            jobs = Job.query.filter(Job.id > last_id).order_by(Job.id).limit(batch_size).all()
+            if not jobs:
+                break
+            last_id = jobs[-1].id
+
+            for job in jobs:
+                self.sign(job)
+                existing = self.find_duplicate(job)
+                if existing is not None:
+                    duplicates.append((existing.id, job.id))
+                    if merge:
+                        self._absorb(existing, job)
+                        self.index(existing)
+                        continue
+                self.index(job)
+                db.session.flush()
+            db.session.commit()
+
+        if merge:
+            unindex_jobs(duplicate_id for _, duplicate_id in duplicates)
+        logger.info(f"Found {len(duplicates)} duplicate jobs{' and merged them' if merge else ''}")
+        return duplicates
@@ -0,0 +1,248 @@
+"""
+JobIngestService bulk loads job postings from dumps and feeds
+
+Records are validated and normalized in Python, then written a chunk at a time
+with one batched INSERT ... ON CONFLICT (url) DO UPDATE per chunk. No ORM objects
+are created, so a large import neither issues a query per row nor grows the
+session's identity map. Dedup fingerprints, signatures and LSH buckets are written
+alongside (see JobDeduplicator). An update that omits the description or location
+keeps the stored one, so the signature is then recomputed from the merged row.
+Run `flask dedupe-jobs --merge` after an import to merge postings that duplicate
+a job under a different URL.
+"""
+
+import logging
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, update
+
+from services.job_dedup import band_buckets, fingerprint, minhash
+from services.platforms import platform_for_url
+from upsert import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+# Column lengths of Job's string fields; longer values are truncated
+STRING_FIELDS = {
+    'title': 100,
+    'company': 100,
+    'location': 100,
+    'job_type': 50,
+    'salary_range': 100,
+}
+BOOLEAN_FIELDS = ('is_easy_apply', 'is_fresher', 'is_internship', 'requires_certification')
+LIST_FIELDS = ('aws_services', 'certification_types')
+REQUIRED_FIELDS = ('title', 'company', 'url')
+
+# Columns written by an ingest; on update, a missing value keeps the stored one
+# (Job's JSON columns store None as SQL NULL, so COALESCE works for them too)
+COLUMNS = (
+    ('title', 'company', 'location', 'description', 'url', 'posted_date', 'source_id')
+    + tuple(name for name in STRING_FIELDS if name not in ('title', 'company', 'location'))
+    + BOOLEAN_FIELDS + LIST_FIELDS + ('platform', 'fingerprint', 'description_minhash')
+)
+
+# Validation errors kept in the report
+MAX_REPORTED_ERRORS = 20
+
+def _parse_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'y')
+    return bool(value)
+
+def _parse_list(value):
+    if isinstance(value, str):
+        return [item.strip() for item in value.replace(';', ',').split(',') if item.strip()]
+    return list(value)
+
+class JobIngestService:
+    """Service for bulk upserting job postings"""
+
+    def validate(self, record, source_id=None):
+        """
+        Validates and normalizes one job record
+
+        Args:
+            record: A dict of Job fields; unknown keys are ignored
+            source_id: A JobSource ID for records that don't name one
+
+        Returns:
+            A row dict with every ingested column
+
+        Raises:
+            ValueError: If the record can't be ingested
+        """
+        if not isinstance(record, dict):
+            raise ValueError("Record is not an object")
+
+        for name in REQUIRED_FIELDS:
+            value = record.get(name)
+            if not isinstance(value, str) or not value.strip():
+                raise ValueError(f"Missing {name}")
+
+        url = record['url'].strip()
+        if not url.startswith(('http://', 'https://')):
+            raise ValueError(f"Invalid url: {url}")
+        if len(url) > 255:
+            raise ValueError("url is longer than 255 characters")
+
+        row = dict.fromkeys(COLUMNS)
+        row['url'] = url
+        row['platform'] = platform_for_url(url)
+        for name, length in STRING_FIELDS.items():
+            value = record.get(name)
+            if value is not None:
+                row[name] = ' '.join(str(value).split())[:length] or None
+        row['description'] = record.get('description') or None
+
+        posted_date = record.get('posted_date')
+        if isinstance(posted_date, str):
+            try:
+                posted_date = datetime.fromisoformat(posted_date.replace('Z', '+00:00')).replace(tzinfo=None)
+            except ValueError:
+                raise ValueError(f"Invalid posted_date: {posted_date}")
+        elif posted_date is not None and not isinstance(posted_date, datetime):
+            raise ValueError(f"Invalid posted_date: {posted_date!r}")
+        row['posted_date'] = posted_date
+
+        source = record.get('source_id', source_id)
+        try:
+            row['source_id'] = int(source) if source not in (None, '') else None
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid source_id: {source!r}")
+
+        for name in BOOLEAN_FIELDS:
+            if record.get(name) not in (None, ''):
+                row[name] = _parse_bool(record[name])
+        for name in LIST_FIELDS:
+            if record.get(name) not in (None, ''):
+                try:
+                    row[name] = _parse_list(record[name])
+                except TypeError:
+                    raise ValueError(f"Invalid {name}: {record[name]!r}")
+
+        row['fingerprint'] = fingerprint(row['title'], row['company'], row['location'], row['description'])
+        row['description_minhash'] = minhash(row['description'])
+        return row
+
+    def ingest(self, records, chunk_size=500, source_id=None):
+        """
+        Validates and upserts job records, keyed on their URL
+
+        Args:
+            records: An iterable of job dicts, consumed lazily
+            chunk_size: The number of rows written per statement and transaction
+            source_id: A JobSource ID for records that don't name one
+
+        Returns:
+            A dict with 'inserted', 'updated' and 'skipped' counts, and up to
+            MAX_REPORTED_ERRORS (record number, reason) tuples under 'errors'
+        """
+        report = {'inserted': 0, 'updated': 0, 'skipped': 0, 'errors': []}
+
+        chunk = {}
+        for number, record in enumerate(records, start=1):
+            try:
+                row = self.validate(record, source_id)
+            except ValueError as e:
+                report['skipped'] += 1
+                if len(report['errors']) < MAX_REPORTED_ERRORS:
+                    report['errors'].append((number, str(e)))
+                continue
+
+            if row['url'] in chunk:
+                # One statement can't upsert the same key twice; the later record wins
+                report['skipped'] += 1
+            chunk[row['url']] = row
+            if len(chunk) >= chunk_size:
+                self._write(list(chunk.values()), report)
+                chunk = {}
+
+        if chunk:
+            self._write(list(chunk.values()), report)
+
+        logger.info(
+            f"Ingested jobs: {report['inserted']} inserted, {report['updated']} updated, "
+            f"{report['skipped']} skipped"
+        )
+        return report
+
+    def _write(self, rows, report):
+        """Upserts one chunk of rows and refreshes their dedup buckets in one transaction"""
+        from models import Job, JobDedupBucket, db
+        from services.resume_matcher import ResumeMatcherService
+        from services.tfidf_matcher import index_jobs
+
+        urls = [row['url'] for row in rows]
+        try:
+            existing = dict(db.session.query(Job.url, Job.posted_date).filter(Job.url.in_(urls)))
+
+            now = datetime.utcnow()
+            for row in rows:
+                if row['posted_date'] is None:
+                    # NOT NULL is checked before ON CONFLICT, so an update must carry the stored date
+                    row['posted_date'] = existing.get(row['url']) or now
+                for name in BOOLEAN_FIELDS:
+                    if row[name] is None and row['url'] not in existing:
+                        row[name] = False
+
+            # One cached statement run as an executemany, rather than a multi-row
+            # VALUES clause that has to be compiled again for every chunk
+            statement = dialect_insert(db.session, Job.__table__)
+            statement = statement.on_conflict_do_update(
+                index_elements=['url'],
+                set_={
+                    name: func.coalesce(statement.excluded[name], getattr(Job, name))
+                    for name in COLUMNS if name != 'url'
+                }
+            )
+            db.session.execute(statement, rows)
+
+            jobs = db.session.query(
+                Job.id, Job.url, Job.title, Job.company, Job.location, Job.description, Job.description_minhash
+            ).filter(Job.url.in_(urls)).all()
+            signatures = {job.id: job.description_minhash for job in jobs}
+
+            # Rows whose stored description or location was kept were signed without it
+            partial = {
+                row['url'] for row in rows
+                if row['url'] in existing and (row['description'] is None or row['location'] is None)
+            }
+            resigned = []
+            for job in jobs:
+                if job.url in partial:
+                    signatures[job.id] = minhash(job.description)
+                    resigned.append({
+                        'job_id': job.id,
+                        'fingerprint': fingerprint(job.title, job.company, job.location, job.description),
+                        'description_minhash': signatures[job.id],
+                    })
+            if resigned:
+                table = Job.__table__
+                db.session.execute(
+                    update(table).where(table.c.id == bindparam('job_id')).values(
+                        fingerprint=bindparam('fingerprint'),
+                        description_minhash=bindparam('description_minhash')
+                    ),
+                    resigned
+                )
+
+            JobDedupBucket.query.filter(JobDedupBucket.job_id.in_(list(signatures))).delete(synchronize_session=False)
+            buckets = [
+                {'band': band, 'bucket': bucket, 'job_id': job_id}
+                for job_id, signature in signatures.items() if signature
+                for band, bucket in band_buckets(signature)
+            ]
+            if buckets:
+                db.session.execute(dialect_insert(db.session, JobDedupBucket.__table__).on_conflict_do_nothing(), buckets)
+
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error ingesting jobs: {str(e)}")
+            raise
+
+        report['inserted'] += len(rows) - len(existing)
+        report['updated'] += len(existing)
+        index_jobs(jobs)
+        ResumeMatcherService().score_new_jobs(job.id for job in jobs if job.url not in existing)
@@ -2,18 +2,103 @@
 JobScraperService handles scraping job listings from various job boards
 
 This service focuses on AWS cloud-related job postings from multiple sources.
+requests and BeautifulSoup are imported on first use, so importing the service
+(e.g. from a web worker) doesn't pay for them.
 """
 
-import requests
-from bs4 import BeautifulSoup
 import json
 import random
+import logging
+from collections import namedtuple
 from datetime import datetime, timedelta
+from urllib.parse import urljoin
+
+from services.job_dedup import JobDeduplicator
+from services.listing_parser import ListingExtractor, StreamingListingParser, extractor_for, register_extractor
+from services.platforms import platform_for_url
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (compatible; AWSJobsBot/1.0)'
+
+# Posting dates are often only day-accurate, so pages overlapping the watermark by
+# this much are still read; the deduplicator absorbs postings seen twice
+WATERMARK_OVERLAP = timedelta(days=1)
+
+ListingPage = namedtuple('ListingPage', ['jobs', 'next_url'])
+SyncResult = namedtuple('SyncResult', ['jobs', 'not_modified', 'etag', 'last_modified', 'pages', 'unchanged', 'bytes'])
+
+# CSS selectors for the job cards on each board's listing page
+LISTING_SELECTORS = {
+    'linkedin': {
+        'card': 'div.base-card',
+        'title': '.base-search-card__title',
+        'company': '.base-search-card__subtitle',
+        'location': '.job-search-card__location',
+        'link': 'a.base-card__full-link',
+        'posted': 'time',
+        'next': 'a.see-more-jobs',
+    },
+    'indeed': {
+        'card': 'div.job_seen_beacon',
+        'title': 'h2.jobTitle',
+        'company': '[data-testid="company-name"]',
+        'location': '[data-testid="text-location"]',
+        'link': 'a.jcs-JobTitle',
+        'posted': '[data-testid="myJobsStateDate"]',
+        'next': 'a[data-testid="pagination-page-next"]',
+    },
+    'glassdoor': {
+        'card': 'li[data-test="jobListing"]',
+        'title': 'a[data-test="job-title"]',
+        'company': '[class*="EmployerProfile_compactEmployerName"]',
+        'location': '[data-test="emp-location"]',
+        'link': 'a[data-test="job-title"]',
+        'posted': '[data-test="job-age"]',
+        'next': 'a[data-test="pagination-next"]',
+    },
+    'shine': {
+        'card': 'div.jobCard',
+        'title': 'h2',
+        'company': '.jobCard_jobCard_cName__mYnow',
+        'location': '.jobCard_jobCard_lists_item__YxRkV',
+        'link': 'h2 a',
+        'posted': '.jobCard_jobCard_features__wJid6',
+        'next': 'a.pagination_next',
+    },
+    'internshala': {
+        'card': 'div.individual_internship',
+        'title': '.job-internship-name',
+        'company': '.company-name',
+        'location': '.locations',
+        'link': 'a.job-title-href',
+        'posted': '.status-inactive',
+        'next': '#navigation-forward',
+    },
+    # Generic markup, also used by local fixture pages
+    'other': {
+        'card': '.job-card',
+        'title': '.job-title',
+        'company': '.company',
+        'location': '.location',
+        'link': 'a[href]',
+        'posted': 'time',
+        'next': 'a[rel="next"]',
+    },
+}
+
+for _source_name, _selectors in LISTING_SELECTORS.items():
+    register_extractor(_source_name, ListingExtractor(_selectors))
+
+# Listing pages are read from the network in chunks of this many bytes
+CHUNK_SIZE = 16384
 
 class JobScraperService:
     """Service for scraping AWS job listings from various platforms"""
     
-    def __init__(self):
+    def __init__(self, parser='streaming'):
+        # 'streaming' parses pages incrementally as they download, 'soup' builds a BeautifulSoup DOM
+        self.parser = parser
         self.sources = {
             'linkedin': 'https://www.linkedin.com/jobs/search/?keywords=aws',
             'indeed': 'https://www.indeed.com/jobs?q=aws',
@@ -32,21 +117,292 @@ class JobScraperService:
         Returns:
             The name of the job source
         """
-        for source_name, source_url in self.sources.items():
-            if source_name in url.lower():
-                return source_name
-        return "other"
+        return platform_for_url(url)
+    
+    def fetch_listing(self, url, session=None, timeout=15, headers=None):
+        """
+        Downloads a listing page
+        
+        Args:
+            url: The URL of the listing page
+            session: An optional requests.Session to reuse pooled connections
+            timeout: The request timeout in seconds
+            headers: Optional extra request headers, e.g. conditional request validators
+            
+        Returns:
+            The requests.Response, which may be a 304 Not Modified
+        """
+        if session is None:
+            import requests
+            session = requests
+        
+        response = session.get(
+            url, headers={'User-Agent': USER_AGENT, **(headers or {})}, timeout=timeout, stream=True
+        )
+        response.raise_for_status()
+        return response
+    
+    def parse_listing(self, html, source_name, base_url):
+        """
+        Extracts job cards from a listing page with BeautifulSoup
+        
+        Args:
+            html: The page HTML
+            source_name: The job board, selecting the extraction rules
+            base_url: The page URL, to resolve relative links
+            
+        Returns:
+            A ListingPage of job dicts (title, company, location, url, posted_date)
+            and the URL of the next page, or None
+        """
+        selectors = LISTING_SELECTORS.get(source_name, LISTING_SELECTORS['other'])
+        from bs4 import BeautifulSoup
+        
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        jobs = []
+        for card in soup.select(selectors['card']):
+            fields = {}
+            for name in ('title', 'company', 'location'):
+                element = card.select_one(selectors[name])
+                if element is not None:
+                    fields[name] = element.get_text(' ', strip=True)
+            link = card.select_one(selectors['link'])
+            if link is not None and link.get('href'):
+                fields['link'] = link['href']
+            posted = card.select_one(selectors['posted'])
+            if posted is not None:
+                fields['posted'] = posted.get('datetime') or posted.get_text(' ', strip=True)
+            
+            if fields.get('title') and fields.get('link'):
+                jobs.append(self.job_from_fields(fields, base_url))
+        
+        next_link = soup.select_one(selectors['next'])
+        next_url = urljoin(base_url, next_link['href']) if next_link is not None and next_link.get('href') else None
+        return ListingPage(jobs, next_url)
     
-    def scrape_jobs(self, source):
+    def stream_listing(self, response, source_name, base_url):
+        """
+        Extracts job cards from a listing response as it downloads
+        
+        Args:
+            response: A streamed requests.Response
+            source_name: The job board, selecting the registered extractor
+            base_url: The page URL, to resolve relative links
+            
+        Returns:
+            A (ListingPage, bytes read) tuple
+        """
+        parser = StreamingListingParser(extractor_for(source_name))
+        received = 0
+        
+        def chunks():
+            nonlocal received
+            for chunk in response.iter_content(CHUNK_SIZE):
+                received += len(chunk)
+                yield chunk
+        
+        jobs = [
+            self.job_from_fields(fields, base_url)
+            for fields in parser.iter_jobs(chunks(), response.encoding or 'utf-8')
+        ]
+        next_url = urljoin(base_url, parser.next_url) if parser.next_url else None
+        return ListingPage(jobs, next_url), received
+    
+    def read_listing(self, response, source_name, base_url):
+        """
+        Parses a listing response with the configured parser
+        
+        Args:
+            response: A streamed requests.Response
+            source_name: The job board, selecting the extraction rules
+            base_url: The page URL, to resolve relative links
+            
+        Returns:
+            A (ListingPage, bytes read) tuple
+        """
+        if self.parser == 'soup':
+            return self.parse_listing(response.text, source_name, base_url), len(response.content)
+        return self.stream_listing(response, source_name, base_url)
+    
+    def job_from_fields(self, fields, base_url):
+        """
+        Normalizes the raw fields extracted from a job card
+        
+        Args:
+            fields: A dict of title, company, location, link and posted values
+            base_url: The page URL, to resolve relative links
+            
+        Returns:
+            A job dict with title, company, location, url and posted_date
+        """
+        return {
+            'title': fields['title'],
+            'company': fields.get('company') or '',
+            'location': fields.get('location') or None,
+            'url': urljoin(base_url, fields['link']),
+            'posted_date': self.parse_posted_date(fields.get('posted')),
+        }
+    
+    def parse_posted_date(self, value):
+        """
+        Parses an ISO date or a relative age such as '3 days ago'
+        
+        Args:
+            value: The posted date text, or None
+            
+        Returns:
+            A datetime, or None if it can't be parsed
+        """
+        if not value:
+            return None
+        value = value.strip().lower()
+        try:
+            return datetime.fromisoformat(value.replace('z', '+00:00')).replace(tzinfo=None)
+        except ValueError:
+            pass
+        
+        if value in ('today', 'just now') or 'hour' in value or 'minute' in value:
+            return datetime.utcnow()
+        number = ''.join(ch for ch in value if ch.isdigit())
+        if not number:
+            return None
+        for unit, days in (('day', 1), ('week', 7), ('month', 30), ('d', 1)):
+            if unit in value:
+                return datetime.utcnow() - timedelta(days=int(number) * days)
+        return None
+    
+    def build_job(self, data, source):
+        """
+        Builds an unsaved Job from a parsed job dict
+        
+        Args:
+            data: A job dict from read_listing
+            source: The JobSource the job was scraped from
+            
+        Returns:
+            A Job object
+        """
+        from models import Job
+        
+        return Job(
+            title=data['title'][:100],
+            company=(data.get('company') or 'Unknown')[:100],
+            location=data['location'][:100] if data.get('location') else None,
+            description=data.get('description'),
+            url=data['url'][:255],
+            posted_date=data.get('posted_date') or datetime.utcnow(),
+            source_id=source.id,
+            platform=platform_for_url(data['url']),
+            is_easy_apply=data.get('is_easy_apply', False),
+            is_internship=self.get_source_name_from_url(source.url) == 'internshala'
+        )
+    
+    def scrape_jobs(self, source, session=None, timeout=15, max_pages=5):
         """
         Scrapes job listings from a given job source
         
         Args:
             source: The JobSource object to scrape
+            session: An optional requests.Session to reuse pooled connections
+            timeout: The request timeout in seconds
+            max_pages: The maximum number of listing pages to follow
             
         Returns:
-            A list of jobs scraped from the source
+            A list of unsaved Job objects scraped from the source
+        """
+        return self.sync_source(source, session=session, timeout=timeout, max_pages=max_pages).jobs
+    
+    def sync_source(self, source, session=None, timeout=15, max_pages=5):
         """
-        # This would implement actual web scraping logic in a production environment
-        # For this demo, we'll return an empty list as jobs would be created manually
-        return []
\ No newline at end of file
+        Incrementally scrapes the postings added to a source since its last sync
+        
+        The first page is requested conditionally with the ETag and Last-Modified
+        validators of the previous sync. Pagination stops at the first page holding
+        postings older than the source's last_synced watermark. Updating the
+        source's watermark and validators is left to the caller, in the same
+        transaction that stores the jobs.
+        
+        Args:
+            source: The JobSource object to scrape
+            session: An optional requests.Session to reuse pooled connections
+            timeout: The request timeout in seconds
+            max_pages: The maximum number of listing pages to follow
+            
+        Returns:
+            A SyncResult with the new unsaved Job objects, whether the listing was
+            unchanged (304), the new validators, and page, skipped posting and byte counts
+        """
+        etag = getattr(source, 'etag', None)
+        last_modified = getattr(source, 'last_modified', None)
+        watermark = getattr(source, 'last_synced', None)
+        cutoff = watermark - WATERMARK_OVERLAP if watermark else None
+        
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        
+        response = self.fetch_listing(source.url, session=session, timeout=timeout, headers=headers)
+        if response.status_code == 304:
+            response.close()
+            return SyncResult([], True, etag, last_modified, 1, 0, 0)
+        
+        source_name = self.get_source_name_from_url(source.url)
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        jobs = []
+        unchanged = 0
+        total_bytes = 0
+        pages = 0
+        url = source.url
+        while True:
+            pages += 1
+            page, received = self.read_listing(response, source_name, url)
+            total_bytes += received
+            
+            reached_watermark = False
+            for data in page.jobs:
+                if cutoff is not None and data['posted_date'] is not None and data['posted_date'] < cutoff:
+                    unchanged += 1
+                    reached_watermark = True
+                    continue
+                jobs.append(self.build_job(data, source))
+            
+            if reached_watermark or not page.next_url or pages >= max_pages:
+                break
+            url = page.next_url
+            response = self.fetch_listing(url, session=session, timeout=timeout)
+        
+        return SyncResult(jobs, False, etag, last_modified, pages, unchanged, total_bytes)
+    
+    def store_jobs(self, jobs):
+        """
+        Saves scraped jobs, merging postings already stored from another source
+        
+        Args:
+            jobs: A list of unsaved Job objects
+            
+        Returns:
+            A dict with the number of 'created' and 'merged' jobs
+        """
+        from models import db
+        from services.resume_matcher import ResumeMatcherService
+        from services.tfidf_matcher import index_jobs
+        
+        deduplicator = JobDeduplicator()
+        stored = {}
+        created_ids = []
+        for job in jobs:
+            job, is_new = deduplicator.add(job)
+            stored[job.id] = job
+            if is_new:
+                created_ids.append(job.id)
+        db.session.commit()
+        
+        index_jobs(stored.values())
+        ResumeMatcherService().score_new_jobs(created_ids)
+        created = len(created_ids)
+        logger.info(f"Stored {created} new jobs and merged {len(jobs) - created} duplicates")
+        return {'created': created, 'merged': len(jobs) - created}
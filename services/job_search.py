@@ -0,0 +1,205 @@
+"""
+JobSearchService provides full-text search over job postings
+
+On SQLite the service maintains an FTS5 table (kept in sync with triggers) and on
+PostgreSQL a GIN index over a tsvector expression. When neither index exists the
+service falls back to the original ILIKE filters on title, description and company.
+"""
+
+import logging
+import re
+import time
+
+from sqlalchemy import column, literal_column, select, table, text
+
+logger = logging.getLogger(__name__)
+
+# Document expression shared by the PostgreSQL index and queries. The planner only
+# uses the GIN index when the query expression matches the indexed one exactly.
+PG_DOCUMENT = (
+    "to_tsvector('english', coalesce(job.title, '') || ' ' || "
+    "coalesce(job.company, '') || ' ' || coalesce(job.description, ''))"
+)
+PG_INDEX_NAME = 'ix_job_search_document'
+
+SQLITE_FTS_TABLE = 'job_fts'
+
+SQLITE_FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5(
+        title, company, description, content='job', content_rowid='id'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ai AFTER INSERT ON job BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, company, description)
+        VALUES (new.id, new.title, new.company, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ad AFTER DELETE ON job BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, company, description)
+        VALUES ('delete', old.id, old.title, old.company, old.description);
+    END""",
+    # Only edits to indexed columns touch the index, not backfills of other columns;
+    # dropped first so running `flask search-index` replaces an older unrestricted trigger
+    f"DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_au",
+    f"""CREATE TRIGGER {SQLITE_FTS_TABLE}_au AFTER UPDATE OF title, company, description ON job BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, company, description)
+        VALUES ('delete', old.id, old.title, old.company, old.description);
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, company, description)
+        VALUES (new.id, new.title, new.company, new.description);
+    END""",
+]
+
+class JobSearchService:
+    """Service for full-text searching job postings"""
+
+    # Database URLs known to have an index, so the catalog is only checked once
+    _index_available = {}
+    # When a database was last found without an index, so it is checked again
+    # every INDEX_RECHECK_SECONDS and picks up `flask search-index` without a restart
+    _index_missing_at = {}
+    INDEX_RECHECK_SECONDS = 60
+
+    def __init__(self, db=None):
+        if db is None:
+            from models import db
+        self.db = db
+
+    @property
+    def dialect(self):
+        return self.db.engine.dialect.name
+
+    def create_index(self):
+        """
+        Creates the full-text index for the current database and indexes existing jobs
+
+        Returns:
+            True if an index was created, False if the dialect is not supported
+        """
+        if self.dialect == 'sqlite':
+            with self.db.engine.begin() as conn:
+                for statement in SQLITE_FTS_DDL:
+                    conn.execute(text(statement))
+                conn.execute(text(f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')"))
+        elif self.dialect == 'postgresql':
+            with self.db.engine.begin() as conn:
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS {PG_INDEX_NAME} ON job USING GIN ({PG_DOCUMENT})"
+                ))
+        else:
+            logger.warning(f"Full-text search is not supported on {self.dialect}")
+            return False
+
+        self._index_available[str(self.db.engine.url)] = True
+        self._index_missing_at.pop(str(self.db.engine.url), None)
+        logger.info(f"Full-text search index ready on {self.dialect}")
+        return True
+
+    def rebuild_index(self):
+        """
+        Rebuilds the full-text index from the job table, repairing any drift
+        """
+        if not self.has_index():
+            return self.create_index()
+
+        with self.db.engine.begin() as conn:
+            if self.dialect == 'sqlite':
+                conn.execute(text(f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')"))
+            elif self.dialect == 'postgresql':
+                conn.execute(text(f"REINDEX INDEX {PG_INDEX_NAME}"))
+        return True
+
+    def has_index(self):
+        """
+        Checks whether a full-text index exists for the current database
+
+        Returns:
+            Boolean indicating whether full-text search can be used
+        """
+        key = str(self.db.engine.url)
+        if key in self._index_available:
+            return True
+        missing_at = self._index_missing_at.get(key)
+        if missing_at is not None and time.monotonic() - missing_at < self.INDEX_RECHECK_SECONDS:
+            return False
+
+        if self.dialect == 'sqlite':
+            statement = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name")
+            params = {'name': SQLITE_FTS_TABLE}
+        elif self.dialect == 'postgresql':
+            statement = text("SELECT 1 FROM pg_indexes WHERE indexname = :name")
+            params = {'name': PG_INDEX_NAME}
+        else:
+            self._index_missing_at[key] = time.monotonic()
+            return False
+
+        with self.db.engine.connect() as conn:
+            available = conn.execute(statement, params).first() is not None
+
+        if available:
+            self._index_available[key] = True
+            self._index_missing_at.pop(key, None)
+        else:
+            self._index_missing_at[key] = time.monotonic()
+        return available
+
+    def tokenize_query(self, query_text):
+        """
+        Splits a user search string into safe search terms
+
+        Args:
+            query_text: The raw search string
+
+        Returns:
+            A list of lowercase word tokens
+        """
+        return re.findall(r'\w+', query_text.lower())
+
+    def apply(self, jobs_query, query_text, rank=False):
+        """
+        Filters a Job query by a search string
+
+        Args:
+            jobs_query: The Job query to filter
+            query_text: The raw search string
+            rank: Whether to order results by relevance, best match first
+
+        Returns:
+            The filtered (and optionally ordered) query
+        """
+        from models import Job
+
+        terms = self.tokenize_query(query_text)
+
+        if not terms or not self.has_index():
+            return jobs_query.filter(
+                (Job.title.ilike(f'%{query_text}%')) |
+                (Job.description.ilike(f'%{query_text}%')) |
+                (Job.company.ilike(f'%{query_text}%'))
+            )
+
+        if self.dialect == 'sqlite':
+            # Prefix match every term so partially typed words still match
+            match = ' '.join(f'"{term}"*' for term in terms)
+            # Weight title matches above company and description matches
+            matches = select(
+                column('rowid').label('job_id'),
+                literal_column(f'bm25({SQLITE_FTS_TABLE}, 10.0, 5.0, 1.0)').label('rank')
+            ).select_from(
+                table(SQLITE_FTS_TABLE)
+            ).where(
+                text(f'{SQLITE_FTS_TABLE} MATCH :fts_query').bindparams(fts_query=match)
+            ).subquery()
+
+            jobs_query = jobs_query.join(matches, Job.id == matches.c.job_id)
+            if rank:
+                # bm25 scores are negative, lower is better
+                jobs_query = jobs_query.order_by(matches.c.rank.asc())
+            return jobs_query
+
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        jobs_query = jobs_query.filter(
+            text(f"{PG_DOCUMENT} @@ to_tsquery('english', :ts_query)").bindparams(ts_query=tsquery)
+        )
+        if rank:
+            jobs_query = jobs_query.order_by(
+                text(f"ts_rank({PG_DOCUMENT}, to_tsquery('english', :ts_query)) DESC").bindparams(ts_query=tsquery)
+            )
+        return jobs_query
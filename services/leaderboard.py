@@ -0,0 +1,173 @@
+"""
+LeaderboardService ranks community contributors by upvotes received
+
+All-time rankings read the UserStats counters (indexed on total_upvotes) and weekly
+rankings read ContributorWeek rows, which are upserted as answers and upvotes come
+in. The top contributors and their badges are fetched in a single query.
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_
+
+from upsert import increment_upsert
+
+logger = logging.getLogger(__name__)
+
+WINDOWS = ('all_time', 'weekly')
+
+def week_start(moment=None):
+    """
+    Returns the Monday (UTC) of the week containing a moment
+
+    Args:
+        moment: A datetime, defaults to now
+    """
+    day = (moment or datetime.utcnow()).date()
+    return day - timedelta(days=day.weekday())
+
+class LeaderboardService:
+    """Service for maintaining and reading the contributor leaderboard"""
+
+    def record_answer(self, user_id, moment=None):
+        """
+        Counts a new answer towards the author's weekly activity
+
+        Args:
+            user_id: The ID of the answer's author
+            moment: When the answer was posted, defaults to now
+        """
+        from models import ContributorWeek, db
+
+        increment_upsert(
+            db.session, ContributorWeek,
+            {'user_id': user_id, 'week_start': week_start(moment)},
+            {'answers': 1, 'upvotes': 0}
+        )
+
+    def record_upvotes(self, user_id, count=1, moment=None):
+        """
+        Counts upvotes received towards the author's weekly activity
+
+        Args:
+            user_id: The ID of the upvoted answer's author
+            count: The number of upvotes received
+            moment: When the upvotes were cast, defaults to now
+        """
+        from models import ContributorWeek, db
+
+        increment_upsert(
+            db.session, ContributorWeek,
+            {'user_id': user_id, 'week_start': week_start(moment)},
+            {'upvotes': count, 'answers': 0}
+        )
+
+    def top(self, window='all_time', limit=10):
+        """
+        Loads the top contributors with their badges in a single query
+
+        Args:
+            window: 'all_time' or 'weekly'
+            limit: The number of contributors to return
+
+        Returns:
+            A list of contributor dicts ordered by upvotes received
+        """
+        from models import User, UserStats, ContributorWeek, UserBadge, Badge, db
+
+        if window == 'weekly':
+            ranked = db.session.query(
+                ContributorWeek.user_id.label('user_id'),
+                ContributorWeek.upvotes.label('total_upvotes'),
+                ContributorWeek.answers.label('answer_count')
+            ).filter(
+                ContributorWeek.week_start == week_start()
+            )
+            upvotes_column, answers_column = ContributorWeek.upvotes, ContributorWeek.answers
+        elif window == 'all_time':
+            ranked = db.session.query(
+                UserStats.user_id.label('user_id'),
+                UserStats.total_upvotes.label('total_upvotes'),
+                UserStats.answers.label('answer_count')
+            )
+            upvotes_column, answers_column = UserStats.total_upvotes, UserStats.answers
+        else:
+            raise ValueError(f"Unknown leaderboard window: {window}")
+
+        # Anyone who answered or was upvoted in the window ranks, e.g. a contributor
+        # whose older answers were upvoted this week without answering anything new
+        ranked = ranked.filter(
+            or_(answers_column > 0, upvotes_column > 0)
+        ).order_by(
+            upvotes_column.desc(), answers_column.desc()
+        ).limit(limit).subquery()
+
+        rows = db.session.query(
+            User.id, User.username, ranked.c.total_upvotes, ranked.c.answer_count,
+            Badge.id, Badge.name, Badge.image_url
+        ).join(
+            ranked, ranked.c.user_id == User.id
+        ).outerjoin(
+            UserBadge, UserBadge.user_id == User.id
+        ).outerjoin(
+            Badge, Badge.id == UserBadge.badge_id
+        ).order_by(
+            ranked.c.total_upvotes.desc(), ranked.c.answer_count.desc(), User.id, Badge.id
+        ).all()
+
+        contributors = {}
+        for user_id, username, total_upvotes, answer_count, badge_id, badge_name, badge_image in rows:
+            contributor = contributors.setdefault(user_id, {
+                'id': user_id,
+                'username': username,
+                'total_upvotes': total_upvotes,
+                'answer_count': answer_count,
+                'badges': []
+            })
+            if badge_id is not None:
+                contributor['badges'].append({
+                    'id': badge_id,
+                    'name': badge_name,
+                    'image_url': badge_image
+                })
+
+        return list(contributors.values())
+
+    def rebuild(self):
+        """
+        Recomputes weekly activity from answers and recorded upvotes
+
+        Upvotes cast before per-user upvote rows existed have no timestamp and only
+        count towards the all-time ranking.
+
+        Returns:
+            The number of ContributorWeek rows written
+        """
+        from models import ContributorWeek, QuestionAnswer, AnswerUpvote, db
+
+        weeks = {}
+        for user_id, created_at in db.session.query(QuestionAnswer.user_id, QuestionAnswer.created_at):
+            if created_at is None:
+                continue
+            key = (user_id, week_start(created_at))
+            weeks.setdefault(key, {'answers': 0, 'upvotes': 0})['answers'] += 1
+
+        upvotes = db.session.query(QuestionAnswer.user_id, AnswerUpvote.created_at).join(
+            AnswerUpvote, AnswerUpvote.answer_id == QuestionAnswer.id
+        )
+        for user_id, created_at in upvotes:
+            if created_at is None:
+                continue
+            key = (user_id, week_start(created_at))
+            weeks.setdefault(key, {'answers': 0, 'upvotes': 0})['upvotes'] += 1
+
+        ContributorWeek.query.delete()
+        db.session.add_all([
+            ContributorWeek(user_id=user_id, week_start=start, **counts)
+            for (user_id, start), counts in weeks.items()
+        ])
+        db.session.commit()
+
+        logger.info(f"Rebuilt {len(weeks)} weekly leaderboard rows")
+        return len(weeks)
@@ -0,0 +1,260 @@
+"""
+Streaming extraction of job cards from listing pages
+
+StreamingListingParser is an event-based html.parser.HTMLParser fed with chunks
+as they arrive from the network. It tracks only the stack of open elements and
+the fields of the card being read, and hands each card out as soon as it closes,
+so memory stays flat however large the page is, unlike building a full DOM.
+
+What is extracted is pluggable per source: a ListingExtractor holds the card and
+field selectors and turns captured fields into a job dict. Selectors are a CSS
+subset that can be matched on an open element stack: tag, #id, .class, [attr],
+[attr="value"], [attr*="value"] and the descendant combinator.
+"""
+
+import codecs
+import re
+from html.parser import HTMLParser
+
+# Elements that never have an end tag
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+}
+
+FIELDS = ('title', 'company', 'location', 'link', 'posted')
+
+# Fields captured from an attribute rather than text, in order of preference
+ATTRIBUTE_FIELDS = {
+    'link': ('href',),
+    'posted': ('datetime',),
+}
+
+_COMPOUND_PART = re.compile(
+    r'(?P<tag>^[a-zA-Z][\w-]*)'
+    r'|#(?P<id>[\w-]+)'
+    r'|\.(?P<class>[\w-]+)'
+    r'|\[(?P<attr>[\w-]+)(?:(?P<op>\*?=)"(?P<value>[^"]*)")?\]'
+)
+
+class SimpleSelector:
+    """A CSS selector subset matched against a stack of open elements"""
+
+    def __init__(self, selector):
+        self.selector = selector
+        self.compounds = [self._parse_compound(part) for part in selector.split()]
+
+    @staticmethod
+    def _parse_compound(text):
+        compound = {'tag': None, 'id': None, 'classes': [], 'attrs': []}
+        position = 0
+        while position < len(text):
+            match = _COMPOUND_PART.match(text, position)
+            if match is None or match.end() == position:
+                raise ValueError(f"Unsupported selector: {text}")
+            if match.group('tag'):
+                compound['tag'] = match.group('tag').lower()
+            elif match.group('id'):
+                compound['id'] = match.group('id')
+            elif match.group('class'):
+                compound['classes'].append(match.group('class'))
+            else:
+                compound['attrs'].append((match.group('attr').lower(), match.group('op'), match.group('value')))
+            position = match.end()
+        return compound
+
+    @staticmethod
+    def _matches_element(compound, tag, attrs):
+        if compound['tag'] and compound['tag'] != tag:
+            return False
+        if compound['id'] and attrs.get('id') != compound['id']:
+            return False
+        if compound['classes']:
+            classes = (attrs.get('class') or '').split()
+            if any(name not in classes for name in compound['classes']):
+                return False
+        for name, op, value in compound['attrs']:
+            actual = attrs.get(name)
+            if actual is None:
+                return False
+            if op == '=' and actual != value:
+                return False
+            if op == '*=' and value not in actual:
+                return False
+        return True
+
+    def matches(self, stack):
+        """
+        Checks whether the last element of a stack matches the selector
+
+        Args:
+            stack: The open elements from the root down, as (tag, attrs) tuples
+
+        Returns:
+            True if the innermost element matches
+        """
+        if not stack:
+            return False
+        tag, attrs = stack[-1]
+        if not self._matches_element(self.compounds[-1], tag, attrs):
+            return False
+
+        # Descendant combinator: the remaining compounds match ancestors, in order
+        remaining = len(self.compounds) - 2
+        for tag, attrs in reversed(stack[:-1]):
+            if remaining < 0:
+                break
+            if self._matches_element(self.compounds[remaining], tag, attrs):
+                remaining -= 1
+        return remaining < 0
+
+class ListingExtractor:
+    """Extraction rules for one job board's listing pages"""
+
+    def __init__(self, selectors):
+        self.card = SimpleSelector(selectors['card'])
+        self.fields = {name: SimpleSelector(selectors[name]) for name in FIELDS if selectors.get(name)}
+        self.next = SimpleSelector(selectors['next']) if selectors.get('next') else None
+
+    def build(self, fields):
+        """
+        Turns the captured fields of a card into a raw job dict
+
+        Override to post-process a board's markup.
+
+        Args:
+            fields: A dict of field name to captured text or attribute value
+
+        Returns:
+            A dict of fields, or None to skip the card
+        """
+        if not fields.get('title') or not fields.get('link'):
+            return None
+        return fields
+
+class StreamingListingParser(HTMLParser):
+    """Incremental job card parser; feed() it chunks and drain jobs as they complete"""
+
+    def __init__(self, extractor):
+        super().__init__(convert_charrefs=True)
+        self.extractor = extractor
+        self.stack = []
+        self.next_url = None
+        self._jobs = []
+        self._card_depth = None
+        self._fields = {}
+        # Open text captures: field name -> [depth, text parts]
+        self._captures = {}
+
+    def handle_starttag(self, tag, attrs):
+        self._break_text()
+        attrs = dict((name, value or '') for name, value in attrs)
+        self.stack.append((tag, attrs))
+        self._start(tag, attrs)
+        if tag in VOID_ELEMENTS:
+            self.stack.pop()
+
+    def handle_startendtag(self, tag, attrs):
+        self._break_text()
+        attrs = dict((name, value or '') for name, value in attrs)
+        self.stack.append((tag, attrs))
+        self._start(tag, attrs)
+        self.stack.pop()
+
+    def _start(self, tag, attrs):
+        depth = len(self.stack)
+        if self._card_depth is None:
+            if self.extractor.card.matches(self.stack):
+                self._card_depth = depth
+                self._fields = {}
+                self._captures = {}
+            elif self.next_url is None and self.extractor.next is not None and self.extractor.next.matches(self.stack):
+                self.next_url = attrs.get('href') or None
+            return
+
+        for name, selector in self.extractor.fields.items():
+            if name in self._fields or name in self._captures or not selector.matches(self.stack):
+                continue
+            value = next((attrs[attr] for attr in ATTRIBUTE_FIELDS.get(name, ()) if attrs.get(attr)), None)
+            if value is not None:
+                self._fields[name] = value.strip()
+            elif name != 'link' and tag not in VOID_ELEMENTS:
+                self._captures[name] = [depth, []]
+
+    def handle_data(self, data):
+        # Text can arrive in several calls when it spans chunks, so parts are joined as is
+        for _, parts in self._captures.values():
+            parts.append(data)
+
+    def _break_text(self):
+        # Element boundaries separate words, like BeautifulSoup's get_text(' ')
+        for _, parts in self._captures.values():
+            parts.append(' ')
+
+    def handle_endtag(self, tag):
+        self._break_text()
+        # Tolerate unclosed elements: close up to the nearest matching open tag
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index][0] == tag:
+                break
+        else:
+            return
+
+        while len(self.stack) > index:
+            depth = len(self.stack)
+            for name in [name for name, (start, _) in self._captures.items() if start == depth]:
+                _, parts = self._captures.pop(name)
+                self._fields[name] = ' '.join(''.join(parts).split())
+            if self._card_depth == depth:
+                self._finish_card()
+            self.stack.pop()
+
+    def _finish_card(self):
+        for name, (_, parts) in self._captures.items():
+            self._fields.setdefault(name, ' '.join(''.join(parts).split()))
+        job = self.extractor.build(self._fields)
+        if job is not None:
+            self._jobs.append(job)
+        self._card_depth = None
+        self._fields = {}
+        self._captures = {}
+
+    def drain(self):
+        """Returns the cards completed since the last call"""
+        jobs, self._jobs = self._jobs, []
+        return jobs
+
+    def iter_jobs(self, chunks, encoding='utf-8'):
+        """
+        Parses a listing page incrementally
+
+        Args:
+            chunks: An iterable of bytes (or str) chunks, e.g. response.iter_content()
+            encoding: The encoding of byte chunks
+
+        Yields:
+            Raw job dicts as their cards close; next_url is set once the page is consumed
+        """
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        for chunk in chunks:
+            self.feed(decoder.decode(chunk) if isinstance(chunk, bytes) else chunk)
+            yield from self.drain()
+        self.feed(decoder.decode(b'', final=True))
+        self.close()
+        yield from self.drain()
+
+_extractors = {}
+
+def register_extractor(source_name, extractor):
+    """
+    Registers the extractor used for a job board's listing pages
+
+    Args:
+        source_name: The board name, as returned by services.platforms.platform_for_url
+        extractor: A ListingExtractor
+    """
+    _extractors[source_name] = extractor
+
+def extractor_for(source_name):
+    """Returns the extractor registered for a board, falling back to the generic 'other' one"""
+    return _extractors.get(source_name) or _extractors['other']
@@ -0,0 +1,107 @@
+"""
+Registry of the job boards (platforms) that jobs are scraped from and applied on
+
+A URL's platform is found from its host alone: the host is parsed once and its
+suffixes are looked up in a dict of registered domains, most specific first
+(uk.indeed.com, then indeed.com, then com), so classifying a URL costs a few
+dict lookups however many platforms there are. Hosts are cached after their
+first lookup. New boards register as plugins with register_platform(), which
+can also attach the handler that submits Easy Apply applications on them.
+"""
+
+import functools
+from urllib.parse import urlsplit
+
+# Platform of URLs on no registered domain
+OTHER = 'other'
+
+class Platform:
+    """A job board: its name, domains and optional Easy Apply handler"""
+
+    def __init__(self, name, domains=(), apply_handler=None):
+        self.name = name
+        self.domains = tuple(domains)
+        # Called as apply_handler(auto_apply_service, user, job)
+        self.apply_handler = apply_handler
+
+    def __repr__(self):
+        return f'<Platform {self.name}>'
+
+_platforms = {}
+_domains = {}
+
+def register_platform(name, domains=(), apply_handler=None):
+    """
+    Registers a job board, or adds domains and a handler to a registered one
+
+    Args:
+        name: The platform name stored on jobs, e.g. 'linkedin'
+        domains: Domains whose hosts (and subdomains) belong to the platform
+        apply_handler: Optional callable(auto_apply_service, user, job) that
+            submits an application on the platform
+
+    Returns:
+        The Platform
+    """
+    platform = _platforms.get(name)
+    if platform is None:
+        platform = _platforms[name] = Platform(name)
+
+    for domain in domains:
+        domain = domain.lower().strip('.')
+        _domains[domain] = name
+        if domain not in platform.domains:
+            platform.domains += (domain,)
+    if apply_handler is not None:
+        platform.apply_handler = apply_handler
+
+    platform_for_host.cache_clear()
+    return platform
+
+def get_platform(name):
+    """Returns the registered Platform with a name, or None"""
+    return _platforms.get(name)
+
+def platform_names():
+    """Returns the names of the registered platforms"""
+    return list(_platforms)
+
+@functools.lru_cache(maxsize=4096)
+def platform_for_host(host):
+    """
+    Finds the platform a host belongs to
+
+    Args:
+        host: A lowercase host name without port
+
+    Returns:
+        The platform name, or OTHER
+    """
+    labels = host.split('.')
+    for start in range(len(labels)):
+        name = _domains.get('.'.join(labels[start:]))
+        if name is not None:
+            return name
+    return OTHER
+
+def platform_for_url(url):
+    """
+    Finds the platform a URL belongs to
+
+    Args:
+        url: An absolute URL
+
+    Returns:
+        The platform name, or OTHER for unknown or unparsable URLs
+    """
+    try:
+        host = urlsplit(url or '').hostname
+    except ValueError:
+        return OTHER
+    return platform_for_host(host) if host else OTHER
+
+register_platform('linkedin', ['linkedin.com'])
+register_platform('indeed', ['indeed.com', 'indeed.co.in', 'indeed.co.uk', 'indeed.ca', 'indeed.com.au'])
+register_platform('glassdoor', ['glassdoor.com', 'glassdoor.co.in', 'glassdoor.co.uk', 'glassdoor.ca', 'glassdoor.com.au'])
+register_platform('shine', ['shine.com'])
+register_platform('internshala', ['internshala.com'])
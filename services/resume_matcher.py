@@ -6,16 +6,20 @@ by analyzing skills, experience, and keywords.
 """
 
 import logging
-import re
+import os
 import json
 from datetime import datetime
 
+from upsert import dialect_insert
+from services.skill_extractor import SkillExtractor, get_extractor
+from services.text_terms import term_set
+
 logger = logging.getLogger(__name__)
 
 class ResumeMatcherService:
     """Service for calculating resume-job matches"""
     
-    def __init__(self):
+    def __init__(self, taxonomy_path=None):
         # Common AWS skills and keywords to look for
         self.aws_skills = [
             'ec2', 'elastic compute cloud', 's3', 'simple storage service',
@@ -27,6 +31,14 @@ class ResumeMatcherService:
             'aws certified', 'solutions architect', 'sysops administrator', 'devops engineer',
             'cloud practitioner', 'aws security', 'aws networking', 'aws storage'
         ]
+        
+        # A larger skill taxonomy can be loaded from a JSON list or one-skill-per-line file
+        taxonomy_path = taxonomy_path or os.environ.get('SKILL_TAXONOMY_PATH')
+        if taxonomy_path:
+            self.skill_extractor = SkillExtractor.from_file(taxonomy_path)
+            self.aws_skills = list(self.skill_extractor.skills.values())
+        else:
+            self.skill_extractor = get_extractor(tuple(self.aws_skills))
     
     def calculate_match_score(self, user_id, job_id):
         """
@@ -58,6 +70,32 @@ class ResumeMatcherService:
         if existing_score:
             return existing_score
             
+        # Create and save the match score
+        match_score = ResumeMatchScore(
+            user_id=user_id,
+            job_id=job_id,
+            calculated_at=datetime.utcnow(),
+            **self.score_pair(user, job)
+        )
+        
+        db.session.add(match_score)
+        db.session.commit()
+        
+        logger.info(f"Created match score {match_score.score}% for user {user_id} and job {job_id}")
+        return match_score
+    
+    def score_pair(self, user, job):
+        """
+        Calculates the match components and overall score for a user and job
+        
+        Args:
+            user: The user object
+            job: The job object
+            
+        Returns:
+            A dict of ResumeMatchScore column values: score, skills_match,
+            experience_match, education_match and keyword_match
+        """
         # Get user resume text
         resume_text = user.resume_text or ""
         
@@ -75,23 +113,123 @@ class ResumeMatcherService:
             keyword_match * 0.15
         )
         
-        # Create and save the match score
-        match_score = ResumeMatchScore(
-            user_id=user_id,
-            job_id=job_id,
-            score=overall_score,
-            skills_match=skills_match,
-            experience_match=experience_match,
-            education_match=education_match,
-            keyword_match=keyword_match,
-            calculated_at=datetime.utcnow()
-        )
+        return {
+            'score': overall_score,
+            'skills_match': skills_match,
+            'experience_match': experience_match,
+            'education_match': education_match,
+            'keyword_match': keyword_match
+        }
+    
+    def bulk_score(self, user_ids=None, job_ids=None, missing_only=False, batch_size=500):
+        """
+        Scores many (user, job) pairs in batches and upserts them into ResumeMatchScore
         
-        db.session.add(match_score)
-        db.session.commit()
+        Users without a resume are skipped. Users and jobs are read as plain rows
+        (not ORM objects, so commits don't expire them and the identity map stays
+        empty) in keyset-ordered batches with only the columns scoring needs, and
+        each batch of scores is written with one INSERT ... ON CONFLICT statement
+        run as an executemany, so a block of batch_size x batch_size pairs never
+        becomes one statement with more bind parameters than the database allows.
         
-        logger.info(f"Created match score {overall_score}% for user {user_id} and job {job_id}")
-        return match_score
+        Args:
+            user_ids: Only score these users (default: every user with a resume)
+            job_ids: Only score these jobs (default: every job)
+            missing_only: Skip pairs that already have a score instead of rescoring them
+            batch_size: The number of users or jobs loaded per batch
+            
+        Returns:
+            The number of scores written
+        """
+        from models import User, Job, ResumeMatchScore, db
+        
+        users_query = db.session.query(
+            User.id, User.resume_text, User.resume_skills, User.resume_education, User.resume_experience
+        ).filter(User.resume_text.isnot(None), User.resume_text != '')
+        if user_ids is not None:
+            users_query = users_query.filter(User.id.in_(list(user_ids)))
+        
+        jobs_query = db.session.query(Job.id, Job.description, Job.aws_services)
+        if job_ids is not None:
+            jobs_query = jobs_query.filter(Job.id.in_(list(job_ids)))
+        
+        written = 0
+        for users in self._batches(users_query, User.id, batch_size):
+            for jobs in self._batches(jobs_query, Job.id, batch_size):
+                existing = set()
+                if missing_only:
+                    existing = set(db.session.query(ResumeMatchScore.user_id, ResumeMatchScore.job_id).filter(
+                        ResumeMatchScore.user_id.in_([user.id for user in users]),
+                        ResumeMatchScore.job_id.in_([job.id for job in jobs])
+                    ))
+                
+                now = datetime.utcnow()
+                rows = [
+                    dict(user_id=user.id, job_id=job.id, calculated_at=now, **self.score_pair(user, job))
+                    for user in users
+                    for job in jobs
+                    if (user.id, job.id) not in existing
+                ]
+                if not rows:
+                    continue
+                
+                statement = dialect_insert(db.session, ResumeMatchScore.__table__)
+                if missing_only:
+                    statement = statement.on_conflict_do_nothing(index_elements=['user_id', 'job_id'])
+                else:
+                    statement = statement.on_conflict_do_update(
+                        index_elements=['user_id', 'job_id'],
+                        set_={
+                            name: statement.excluded[name]
+                            for name in ('score', 'skills_match', 'experience_match',
+                                         'education_match', 'keyword_match', 'calculated_at')
+                        }
+                    )
+                db.session.execute(statement, rows)
+                db.session.commit()
+                written += len(rows)
+        
+        logger.info(f"Bulk scored {written} resume-job pairs")
+        return written
+    
+    def score_new_jobs(self, job_ids):
+        """
+        Scores newly stored jobs against every user with a resume
+        
+        Called after a scrape or ingest has committed its jobs. A failure is
+        logged rather than raised, since the jobs themselves are already saved
+        and `flask score-matches --missing-only` fills in any gaps.
+        
+        Args:
+            job_ids: IDs of the jobs that were just created
+            
+        Returns:
+            The number of scores written
+        """
+        from models import db
+        
+        job_ids = list(job_ids)
+        if not job_ids:
+            return 0
+        try:
+            return self.bulk_score(job_ids=job_ids, missing_only=True)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error scoring new jobs: {str(e)}")
+            return 0
+    
+    def _batches(self, query, id_column, batch_size):
+        """Yields lists of rows from a query in id order, batch_size at a time"""
+        last_id = None
+        while True:
+            batch_query = query
+            if last_id is not None:
+                batch_query = batch_query.filter(id_column > last_id)
+            batch = batch_query.order_by(id_column).limit(batch_size).all()
+            if not batch:
+                return
+            yield batch
+            last_id = batch[-1].id
     
     def extract_skills_from_text(self, text):
         """
@@ -106,16 +244,20 @@ class ResumeMatcherService:
         if not text:
             return []
             
-        skills = []
-        text = text.lower()
+        # Match all skills in one pass of the compiled pattern
+        return self.skill_extractor.extract(text)
+    
+    def find_skills_in_text(self, text):
+        """
+        Finds every skill occurrence in text, with character offsets
         
-        # Extract AWS skills
-        for skill in self.aws_skills:
-            if skill.lower() in text:
-                skills.append(skill)
-                
-        # Return unique skills
-        return list(set(skills))
+        Args:
+            text: The text to scan
+            
+        Returns:
+            A list of SkillMatch(skill, start, end) tuples in text order
+        """
+        return self.skill_extractor.find(text)
     
     def calculate_skills_match(self, resume_text, job_description, job_aws_services):
         """
@@ -203,15 +345,9 @@ class ResumeMatcherService:
         # In a real implementation, this would use more sophisticated NLP techniques
         # to identify key phrases and concepts
         
-        # Extract key phrases from job description
-        job_words = set(re.findall(r'\b\w+\b', job_description.lower()))
-        resume_words = set(re.findall(r'\b\w+\b', resume_text.lower()))
-        
-        # Filter out common words
-        common_words = {'a', 'an', 'the', 'and', 'or', 'but', 'is', 'are', 'was', 'were', 
-                       'to', 'of', 'in', 'on', 'for', 'with', 'by', 'at', 'from'}
-        job_words = job_words - common_words
-        resume_words = resume_words - common_words
+        # Stopword-filtered term sets, tokenized once per distinct text and cached
+        job_words = term_set(job_description)
+        resume_words = term_set(resume_text)
         
         # Count matches
         if not job_words:
@@ -0,0 +1,300 @@
+"""
+ScrapePipeline syncs every active job source concurrently
+
+Listing pages are fetched on a thread pool. Each host gets one pooled
+requests.Session, a cap on concurrent requests and a minimum interval between
+requests, so adding sources speeds up a sync without hammering any one board.
+Sources that share a URL and sync state (many users follow the same board) are
+fetched once. Parsed jobs are streamed back to the calling thread, which
+deduplicates and commits them in batches while other fetches are still in flight.
+
+Syncs are incremental: see JobScraperService.sync_source. A source's watermark,
+validators and JobSourceSync stats row are committed in the same transaction as
+its jobs, so a failed batch never advances the watermark past unsaved postings.
+"""
+
+import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from services.job_dedup import JobDeduplicator
+from services.job_scraper import JobScraperService
+
+logger = logging.getLogger(__name__)
+
+# Detached copy of a JobSource, safe to hand to worker threads
+SourceSnapshot = namedtuple('SourceSnapshot', ['id', 'name', 'url', 'etag', 'last_modified', 'last_synced'])
+
+# Outcome of syncing one source URL, handed from a worker to the storing thread
+SourceOutcome = namedtuple('SourceOutcome', ['followers', 'result', 'error', 'started_at', 'duration'])
+
+class HostThrottle:
+    """Limits concurrent requests and request rate for one host"""
+
+    def __init__(self, concurrency, rate):
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._interval = 1.0 / rate if rate > 0 else 0
+        self._next_request = 0.0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._slots.acquire()
+        if self._interval:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._next_request - now
+                self._next_request = max(now, self._next_request) + self._interval
+            if wait > 0:
+                time.sleep(wait)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._slots.release()
+
+class ThrottledSession:
+    """A pooled session whose requests go through its host's throttle"""
+
+    def __init__(self, session, throttle):
+        self.session = session
+        self.throttle = throttle
+
+    def get(self, url, **kwargs):
+        with self.throttle:
+            return self.session.get(url, **kwargs)
+
+class ScrapePipeline:
+    """Concurrent scraper over all active job sources"""
+
+    def __init__(self, app=None, max_workers=None, host_concurrency=None, host_rate=None,
+                 batch_size=None, timeout=None, max_pages=None):
+        if app is None:
+            from flask import current_app
+            app = current_app._get_current_object()
+        self.app = app
+
+        config = app.config
+        self.max_workers = max_workers or config.get('SCRAPE_MAX_WORKERS', 8)
+        self.host_concurrency = host_concurrency or config.get('SCRAPE_HOST_CONCURRENCY', 2)
+        self.host_rate = host_rate if host_rate is not None else config.get('SCRAPE_HOST_RATE', 1.0)
+        self.batch_size = batch_size or config.get('SCRAPE_BATCH_SIZE', 200)
+        self.timeout = timeout or config.get('SCRAPE_TIMEOUT', 15)
+        self.max_pages = max_pages or config.get('SCRAPE_MAX_PAGES', 5)
+
+        self.scraper = JobScraperService(parser=config.get('SCRAPE_PARSER', 'streaming'))
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, url):
+        """
+        Returns the pooled, throttled session for a URL's host
+
+        Args:
+            url: The URL about to be requested
+
+        Returns:
+            A ThrottledSession
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._sessions:
+                session = requests.Session()
+                # Blocking pool: streamed bodies keep their connection until read, so
+                # the pool size is what caps concurrent downloads from the host
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.host_concurrency, pool_block=True)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = ThrottledSession(
+                    session, HostThrottle(self.host_concurrency, self.host_rate)
+                )
+            return self._sessions[host]
+
+    def close(self):
+        """Closes the pooled sessions"""
+        with self._lock:
+            for throttled in self._sessions.values():
+                throttled.session.close()
+            self._sessions.clear()
+
+    def fetch_source(self, followers):
+        """
+        Syncs one source URL on a worker thread
+
+        Args:
+            followers: The SourceSnapshots sharing the URL and sync state
+
+        Returns:
+            A SourceOutcome
+        """
+        source = followers[0]
+        started_at = datetime.utcnow()
+        started = time.monotonic()
+        try:
+            result = self.scraper.sync_source(
+                source, session=self.session_for(source.url), timeout=self.timeout, max_pages=self.max_pages
+            )
+            return SourceOutcome(followers, result, None, started_at, time.monotonic() - started)
+        except Exception as e:
+            logger.error(f"Error scraping {source.url}: {str(e)}")
+            return SourceOutcome(followers, None, str(e), started_at, time.monotonic() - started)
+
+    def load_sources(self, source_ids=None):
+        """
+        Loads the active sources to sync, grouped by URL and sync state
+
+        Args:
+            source_ids: Optional list of JobSource IDs to restrict the sync to
+
+        Returns:
+            A list of SourceSnapshot lists, each fetched once
+        """
+        from models import JobSource, db
+
+        query = db.session.query(
+            JobSource.id, JobSource.name, JobSource.url,
+            JobSource.etag, JobSource.last_modified, JobSource.last_synced
+        ).filter(JobSource.active.is_(True))
+        if source_ids:
+            query = query.filter(JobSource.id.in_(source_ids))
+
+        groups = {}
+        for row in query.order_by(JobSource.id):
+            snapshot = SourceSnapshot(*row)
+            groups.setdefault((row.url, row.etag, row.last_modified, row.last_synced), []).append(snapshot)
+        return list(groups.values())
+
+    def run(self, source_ids=None):
+        """
+        Incrementally scrapes all active sources concurrently and stores their jobs
+
+        Args:
+            source_ids: Optional list of JobSource IDs to restrict the sync to
+
+        Returns:
+            A dict of source ID -> stats dict with 'status', 'fetched', 'new',
+            'merged', 'unchanged', 'bytes', 'duration' and 'error'
+        """
+        with self.app.app_context():
+            groups = self.load_sources(source_ids)
+            stats = {}
+            if not groups:
+                return stats
+
+            pending = []
+            completed = []
+            started = time.monotonic()
+            try:
+                with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='scraper') as executor:
+                    futures = [executor.submit(self.fetch_source, followers) for followers in groups]
+                    for future in as_completed(futures):
+                        outcome = future.result()
+                        if outcome.result is not None:
+                            # Jobs are attributed to the first source following the URL
+                            pending.extend((job, outcome.followers[0].id) for job in outcome.result.jobs)
+                        completed.append(outcome)
+                        if len(pending) >= self.batch_size:
+                            self._store(pending, completed, stats)
+                            pending, completed = [], []
+
+                if pending or completed:
+                    self._store(pending, completed, stats)
+            finally:
+                self.close()
+
+            logger.info(
+                f"Synced {len(groups)} source URLs in {time.monotonic() - started:.1f}s: "
+                f"{sum(s['new'] for s in stats.values())} new jobs, "
+                f"{sum(s['bytes'] for s in stats.values())} bytes"
+            )
+            return stats
+
+    def _store(self, pending, completed, stats):
+        """
+        Commits a batch of scraped jobs with the sync state of the sources they completed
+
+        A batch holds every job of the sources it completes, so if it fails to
+        commit, only those sources are recorded as errors (their watermarks stay
+        put and the postings are fetched again next sync) and the run goes on.
+        """
+        from models import db
+        from services.resume_matcher import ResumeMatcherService
+        from services.tfidf_matcher import index_jobs
+
+        counts = {}
+        deduplicator = JobDeduplicator()
+        stored = {}
+        created_ids = []
+        try:
+            for job, source_id in pending:
+                job, created = deduplicator.add(job)
+                stored[job.id] = job
+                if created:
+                    created_ids.append(job.id)
+                source_counts = counts.setdefault(source_id, {'new': 0, 'merged': 0})
+                source_counts['new' if created else 'merged'] += 1
+
+            self._record(completed, counts, stats)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error storing scraped jobs: {str(e)}")
+            self._record_failure(completed, f"Error storing jobs: {str(e)}", stats)
+            return
+
+        index_jobs(stored.values())
+        ResumeMatcherService().score_new_jobs(created_ids)
+
+    def _record(self, completed, counts, stats, error=None):
+        """Adds JobSourceSync rows for completed sources and advances the watermarks of successful ones"""
+        from models import JobSource, JobSourceSync, db
+
+        for outcome in completed:
+            result = outcome.result
+            if error is not None or result is None:
+                status = 'error'
+            elif result.not_modified:
+                status = 'not_modified'
+            else:
+                status = 'ok'
+
+            for source in outcome.followers:
+                source_counts = counts.get(source.id, {'new': 0, 'merged': 0})
+                source_stats = {
+                    'status': status,
+                    'fetched': len(result.jobs) if result else 0,
+                    'new': source_counts['new'],
+                    'merged': source_counts['merged'],
+                    'unchanged': result.unchanged if result else 0,
+                    'bytes': result.bytes if result else 0,
+                    'duration': round(outcome.duration, 3),
+                    'error': error or outcome.error,
+                }
+                stats[source.id] = source_stats
+                db.session.add(JobSourceSync(source_id=source.id, started_at=outcome.started_at, **source_stats))
+
+            if status != 'error':
+                # The watermark is the sync's start, so postings published mid-sync are picked up next time
+                JobSource.query.filter(
+                    JobSource.id.in_([source.id for source in outcome.followers])
+                ).update({
+                    'last_synced': outcome.started_at,
+                    'etag': result.etag,
+                    'last_modified': result.last_modified,
+                }, synchronize_session=False)
+
+    def _record_failure(self, completed, error, stats):
+        """Records a batch that failed to commit as an error for each of its sources"""
+        from models import db
+
+        try:
+            self._record(completed, {}, stats, error=error)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error recording failed sync: {str(e)}")
@@ -0,0 +1,105 @@
+"""
+SkillExtractor finds known skills in free text with a single compiled regex
+
+All skills are compiled into one alternation, longest first, anchored on word
+boundaries, so 's3' no longer matches inside other tokens and 'iam' no longer
+matches inside 'william'. Compiled extractors are cached per process by taxonomy,
+so building one is paid once no matter how many texts are scanned.
+"""
+
+import functools
+import json
+import logging
+import re
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+SkillMatch = namedtuple('SkillMatch', ['skill', 'start', 'end'])
+
+def normalize_skill(text):
+    """Lowercases a skill and collapses internal whitespace"""
+    return ' '.join(text.lower().split())
+
+class SkillExtractor:
+    """Multi-pattern skill matcher over a fixed taxonomy"""
+
+    def __init__(self, skills):
+        # Canonical skill for every normalized spelling
+        self.skills = {}
+        for skill in skills:
+            normalized = normalize_skill(skill)
+            if normalized:
+                self.skills.setdefault(normalized, skill)
+
+        # Longest first so 'aws certified' wins over a shorter skill at the same position
+        alternatives = sorted(self.skills, key=len, reverse=True)
+        body = '|'.join(r'\s+'.join(re.escape(word) for word in skill.split()) for skill in alternatives)
+
+        # The lookahead makes every match zero-width, so skills nested inside longer
+        # ones (e.g. 'kubernetes' in 'elastic kubernetes service') are found as well
+        self.pattern = re.compile(rf'(?<!\w)(?=({body})(?!\w))', re.IGNORECASE) if body else None
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Builds an extractor from a taxonomy file
+
+        Args:
+            path: A JSON file holding a list of skills, or a text file with one skill per line
+
+        Returns:
+            A SkillExtractor for the skills in the file
+        """
+        with open(path, encoding='utf-8') as f:
+            if path.endswith('.json'):
+                skills = json.load(f)
+            else:
+                skills = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+        logger.info(f"Loaded {len(skills)} skills from {path}")
+        return get_extractor(tuple(skills))
+
+    def find(self, text):
+        """
+        Finds every skill occurrence in a text
+
+        Args:
+            text: The text to scan
+
+        Returns:
+            A list of SkillMatch(skill, start, end) tuples in text order
+        """
+        if not text or self.pattern is None:
+            return []
+
+        matches = []
+        for match in self.pattern.finditer(text):
+            start, end = match.span(1)
+            matches.append(SkillMatch(self.skills[normalize_skill(match.group(1))], start, end))
+        return matches
+
+    def extract(self, text):
+        """
+        Returns the distinct skills found in a text
+
+        Args:
+            text: The text to scan
+
+        Returns:
+            A list of unique skills, in order of first occurrence
+        """
+        return list(dict.fromkeys(match.skill for match in self.find(text)))
+
+@functools.lru_cache(maxsize=8)
+def get_extractor(skills):
+    """
+    Returns the process-wide extractor for a taxonomy, compiling it on first use
+
+    Args:
+        skills: A tuple of skills
+
+    Returns:
+        A SkillExtractor
+    """
+    return SkillExtractor(skills)
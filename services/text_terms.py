@@ -0,0 +1,45 @@
+"""
+Tokenization helpers shared by the resume matching services
+
+Term sets are cached per process keyed by the text itself, so a job description or
+resume is tokenized once however many times it is scored, and editing the text
+simply produces a new cache entry instead of needing explicit invalidation.
+"""
+
+import functools
+import re
+
+# Common words ignored when comparing resumes and job descriptions
+STOPWORDS = frozenset({
+    'a', 'an', 'the', 'and', 'or', 'but', 'is', 'are', 'was', 'were',
+    'to', 'of', 'in', 'on', 'for', 'with', 'by', 'at', 'from'
+})
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+def tokenize(text):
+    """
+    Splits text into lowercase word tokens, stopwords included
+
+    Args:
+        text: The text to tokenize
+
+    Returns:
+        A list of tokens in text order
+    """
+    if not text:
+        return []
+    return WORD_PATTERN.findall(text.lower())
+
+@functools.lru_cache(maxsize=4096)
+def term_set(text):
+    """
+    Returns the distinct non-stopword terms of a text
+
+    Args:
+        text: The text to tokenize
+
+    Returns:
+        A frozenset of terms
+    """
+    return frozenset(tokenize(text)) - STOPWORDS
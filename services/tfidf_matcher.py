@@ -0,0 +1,345 @@
+"""
+TfidfMatcher ranks every job against a resume with one sparse matrix-vector product
+
+Job descriptions are kept as a sparse term-count matrix (SciPy CSR). TF-IDF weights
+and L2 row normalization are recomputed with vectorized NumPy operations whenever
+jobs have been added, so scoring a resume is a single product over all postings
+followed by a partial sort for the top K.
+
+Each process keeps its own index. Jobs are usually added by CLI scrapes and
+imports, so get_matcher() compares the index with the Job table at most every
+TFIDF_REFRESH_SECONDS (job count and highest ID), adding new jobs and dropping
+deleted ones, and rebuilds it every TFIDF_REBUILD_SECONDS to pick up edited
+postings and compact superseded rows.
+
+NumPy and SciPy are optional dependencies (`pip install .[matching]`).
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+
+from services.text_terms import STOPWORDS, tokenize
+
+logger = logging.getLogger(__name__)
+
+def _require_numeric():
+    try:
+        import numpy
+        import scipy.sparse
+    except ImportError:
+        raise RuntimeError("TF-IDF matching requires numpy and scipy (pip install .[matching])")
+    return numpy, scipy.sparse
+
+def document_terms(text):
+    """Returns the non-stopword tokens of a text, with repeats"""
+    return [token for token in tokenize(text) if token not in STOPWORDS]
+
+class TfidfMatcher:
+    """In-memory TF-IDF index over job postings"""
+
+    def __init__(self):
+        self.np, self.sparse = _require_numeric()
+        self.vocabulary = {}
+        self.job_ids = []
+        self._positions = {}
+        self._counts = None
+        # Rows added since the last weighting, as (indices, counts) pairs
+        self._pending = []
+        self._weights = None
+        self._idf = None
+        self._removed = set()
+        # Highest job ID indexed; jobs above it are new to this index
+        self.last_job_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.job_ids) - len(self._removed)
+
+    def add(self, job_id, text):
+        """
+        Adds (or replaces) a job posting
+
+        Args:
+            job_id: The ID of the job
+            text: The text to index, e.g. title and description
+        """
+        terms = document_terms(text)
+
+        with self._lock:
+            counts = Counter()
+            for term in terms:
+                column = self.vocabulary.setdefault(term, len(self.vocabulary))
+                counts[column] += 1
+
+            if job_id in self._positions:
+                # Superseded rows stay in the matrix but are masked out of results
+                self._removed.add(self._positions[job_id])
+            self._positions[job_id] = len(self.job_ids)
+            self.job_ids.append(job_id)
+            self._pending.append((list(counts.keys()), list(counts.values())))
+            self._weights = None
+            self.last_job_id = max(self.last_job_id, job_id)
+
+    def remove(self, job_id):
+        """
+        Removes a job posting from results
+
+        Args:
+            job_id: The ID of the job
+        """
+        with self._lock:
+            position = self._positions.pop(job_id, None)
+            if position is not None:
+                self._removed.add(position)
+
+    def indexed_ids(self):
+        """Returns the IDs of the jobs in the index"""
+        with self._lock:
+            return set(self._positions)
+
+    def _merge_pending(self):
+        np, sparse = self.np, self.sparse
+
+        indptr = [0]
+        indices = []
+        data = []
+        for row_indices, row_counts in self._pending:
+            indices.extend(row_indices)
+            data.extend(row_counts)
+            indptr.append(len(indices))
+
+        vocabulary_size = len(self.vocabulary)
+        new_rows = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(self._pending), vocabulary_size)
+        )
+
+        if self._counts is None:
+            self._counts = new_rows
+        else:
+            # New terms widen the matrix
+            self._counts.resize((self._counts.shape[0], vocabulary_size))
+            self._counts = sparse.vstack([self._counts, new_rows], format='csr')
+        self._pending = []
+
+    def _ensure_weights(self):
+        """Recomputes TF-IDF weights after jobs were added"""
+        np, sparse = self.np, self.sparse
+
+        with self._lock:
+            if self._weights is not None:
+                return self._weights, self._idf
+
+            if self._pending:
+                self._merge_pending()
+            if self._counts is None:
+                return None, None
+
+            counts = self._counts
+            rows = counts.shape[0]
+
+            # Smoothed inverse document frequency, as in scikit-learn
+            document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+            idf = np.log((1 + rows) / (1 + document_frequency)) + 1
+
+            # Sublinear term frequency, weighted by idf
+            weights = counts.copy()
+            weights.data = (1 + np.log(weights.data)) * idf[weights.indices]
+
+            # L2-normalize every row so a dot product is the cosine similarity
+            norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+            weights = sparse.diags(1 / norms) @ weights
+
+            self._weights = weights.tocsr()
+            self._idf = idf
+            return self._weights, self._idf
+
+    def vectorize(self, text):
+        """
+        Builds the normalized TF-IDF vector of a query text
+
+        Args:
+            text: The query text, e.g. a resume
+
+        Returns:
+            A NumPy array over the current vocabulary, or None if nothing matched
+        """
+        return self._search(text)[0]
+
+    def _search(self, text):
+        """Returns (query vector, weights, removed positions, job IDs) from one consistent state"""
+        np = self.np
+
+        weights, idf = self._ensure_weights()
+        if weights is None:
+            return None, None, None, None
+
+        terms = document_terms(text)
+        with self._lock:
+            counts = Counter(
+                self.vocabulary[term] for term in terms
+                if term in self.vocabulary and self.vocabulary[term] < weights.shape[1]
+            )
+            removed = [position for position in self._removed if position < weights.shape[0]]
+            job_ids = self.job_ids[:weights.shape[0]]
+        if not counts:
+            return None, None, None, None
+
+        vector = np.zeros(weights.shape[1])
+        columns = np.fromiter(counts.keys(), dtype=np.int64)
+        vector[columns] = (1 + np.log(np.fromiter(counts.values(), dtype=np.float64))) * idf[columns]
+        return vector / np.linalg.norm(vector), weights, removed, job_ids
+
+    def top_jobs(self, text, k=10):
+        """
+        Scores a text against every job and returns the best matches
+
+        Args:
+            text: The query text, e.g. a resume
+            k: The number of jobs to return
+
+        Returns:
+            A list of (job_id, similarity) tuples, best first, similarity in 0-1
+        """
+        np = self.np
+
+        vector, weights, removed, job_ids = self._search(text)
+        if vector is None:
+            return []
+
+        scores = weights @ vector
+        if removed:
+            scores[removed] = -1
+
+        k = min(k, len(scores))
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        best = candidates[np.argsort(-scores[candidates])]
+
+        return [
+            (job_ids[position], float(scores[position]))
+            for position in best
+            if scores[position] > 0
+        ]
+
+    def load(self, after_id=0, batch_size=1000):
+        """
+        Adds jobs from the database
+
+        Args:
+            after_id: Only load jobs with a higher ID
+            batch_size: The number of jobs loaded per query
+
+        Returns:
+            The number of jobs added
+        """
+        from models import Job, db
+
+        added = 0
+        last_id = after_id
+        while True:
+            rows = db.session.query(Job.id, Job.title, Job.description).filter(
+                Job.id > last_id
+            ).order_by(Job.id).limit(batch_size).all()
+            if not rows:
+                break
+            for job_id, title, description in rows:
+                self.add(job_id, f"{title or ''} {description or ''}")
+            added += len(rows)
+            last_id = rows[-1][0]
+        return added
+
+    def sync(self):
+        """
+        Brings the index in line with the Job table: adds jobs created since it was
+        built and drops jobs that were deleted (e.g. merged as duplicates)
+
+        Returns:
+            A (added, removed) tuple of job counts
+        """
+        from sqlalchemy import func
+        from models import Job, db
+
+        count, max_id = db.session.query(func.count(Job.id), func.max(Job.id)).one()
+        added = self.load(after_id=self.last_job_id) if (max_id or 0) > self.last_job_id else 0
+
+        removed = 0
+        if count != len(self):
+            existing = {job_id for job_id, in db.session.query(Job.id)}
+            for job_id in self.indexed_ids() - existing:
+                self.remove(job_id)
+                removed += 1
+
+        if added or removed:
+            logger.info(f"Synced TF-IDF index: {added} jobs added, {removed} removed")
+        return added, removed
+
+    @classmethod
+    def from_database(cls, batch_size=1000):
+        """
+        Builds a matcher over every job in the database
+
+        Args:
+            batch_size: The number of jobs loaded per query
+
+        Returns:
+            A TfidfMatcher
+        """
+        matcher = cls()
+        matcher.load(batch_size=batch_size)
+        logger.info(f"Built TF-IDF index over {len(matcher)} jobs and {len(matcher.vocabulary)} terms")
+        return matcher
+
+# Process-wide index, built on first use
+_matcher = None
+_matcher_lock = threading.Lock()
+# When the index was last built and last compared with the Job table (time.monotonic())
+_built_at = 0.0
+_synced_at = 0.0
+
+def get_matcher():
+    """
+    Returns the process-wide TF-IDF index, building it from the database on first use
+
+    Needs an application context. The index is synced with the Job table at most
+    every TFIDF_REFRESH_SECONDS and rebuilt every TFIDF_REBUILD_SECONDS.
+    """
+    from flask import current_app
+
+    global _matcher, _built_at, _synced_at
+    config = current_app.config
+    with _matcher_lock:
+        now = time.monotonic()
+        if _matcher is None or now - _built_at >= config.get('TFIDF_REBUILD_SECONDS', 3600):
+            _matcher = TfidfMatcher.from_database()
+            _built_at = _synced_at = now
+        elif now - _synced_at >= config.get('TFIDF_REFRESH_SECONDS', 30):
+            _matcher.sync()
+            _synced_at = now
+        return _matcher
+
+def index_jobs(jobs):
+    """
+    Adds new or updated jobs to the process-wide index if it has been built
+
+    Args:
+        jobs: An iterable of Job objects
+    """
+    if _matcher is None:
+        return
+    for job in jobs:
+        _matcher.add(job.id, f"{job.title or ''} {job.description or ''}")
+
+def unindex_jobs(job_ids):
+    """
+    Removes deleted jobs from the process-wide index if it has been built
+
+    Args:
+        job_ids: An iterable of job IDs
+    """
+    if _matcher is None:
+        return
+    for job_id in job_ids:
+        _matcher.remove(job_id)
@@ -0,0 +1,191 @@
+"""
+UpvoteCounter records answer upvotes without read-modify-write races
+
+Every upvote inserts an AnswerUpvote row, whose unique (answer_id, user_id) index
+stops a user from voting twice. The answer's count is then either incremented in
+SQL straight away, or, in buffered mode, left for later: the vote row is stored
+with counted = false. A background thread periodically claims every uncounted
+vote with one UPDATE ... RETURNING and applies them as one additive UPDATE per
+answer, so bursts of votes on a hot answer don't serialize on its row lock.
+Pending votes live in the database with their dedup rows, so a worker that is
+killed before flushing loses nothing; any process's flush (or
+`flask flush-upvotes`) counts them.
+"""
+
+import atexit
+import logging
+import threading
+from datetime import datetime
+
+from sqlalchemy import func, update
+
+from services.user_stats import UserStatsService
+from services.leaderboard import LeaderboardService, week_start
+
+logger = logging.getLogger(__name__)
+
+class UpvoteCounter:
+    """Service for counting answer upvotes"""
+
+    _lock = threading.Lock()
+    _flusher = None
+
+    def __init__(self, app=None):
+        if app is None:
+            from flask import current_app
+            app = current_app._get_current_object()
+        self.app = app
+
+    @property
+    def flush_interval(self):
+        """Seconds between buffer flushes; 0 disables buffering"""
+        return self.app.config.get('UPVOTE_BUFFER_SECONDS', 0)
+
+    @property
+    def buffered(self):
+        return self.flush_interval > 0
+
+    def record(self, answer, user_id):
+        """
+        Records an upvote by a user on an answer in the current transaction
+
+        Args:
+            answer: The QuestionAnswer being upvoted
+            user_id: The ID of the user voting
+
+        Returns:
+            The answer's upvote count including this vote (and, in buffered mode,
+            every vote not flushed yet)
+
+        Raises:
+            IntegrityError: If the user has already upvoted this answer
+        """
+        from models import AnswerUpvote, QuestionAnswer, db
+
+        db.session.add(AnswerUpvote(answer_id=answer.id, user_id=user_id, counted=not self.buffered))
+        db.session.flush()
+
+        if self.buffered:
+            self.ensure_flusher()
+            return (answer.upvotes or 0) + self.pending_count(answer.id)
+
+        upvotes = db.session.execute(
+            update(QuestionAnswer)
+            .where(QuestionAnswer.id == answer.id)
+            .values(upvotes=db.func.coalesce(QuestionAnswer.upvotes, 0) + 1)
+            .returning(QuestionAnswer.upvotes),
+            execution_options={'synchronize_session': False}
+        ).scalar()
+        UserStatsService().increment(answer.user_id, total_upvotes=1)
+        LeaderboardService().record_upvotes(answer.user_id)
+        return upvotes
+
+    def pending_count(self, answer_id):
+        """
+        Returns the number of buffered, not yet flushed votes for an answer
+
+        Args:
+            answer_id: The ID of the answer
+        """
+        from models import AnswerUpvote, db
+
+        return db.session.query(func.count(AnswerUpvote.id)).filter(
+            AnswerUpvote.answer_id == answer_id,
+            AnswerUpvote.counted == db.false()
+        ).scalar()
+
+    def flush(self):
+        """
+        Counts every buffered vote in the database in a single transaction
+
+        The votes are claimed with one conditional UPDATE, so concurrent flushes in
+        other processes never count a vote twice. If the transaction fails the
+        votes stay uncounted for the next flush.
+
+        Returns:
+            The number of votes flushed
+        """
+        from models import AnswerUpvote, QuestionAnswer, db
+        from services.badge_engine import BadgeEngine
+
+        with self.app.app_context():
+            try:
+                claimed = db.session.execute(
+                    update(AnswerUpvote)
+                    .where(AnswerUpvote.counted == db.false())
+                    .values(counted=True)
+                    .returning(AnswerUpvote.answer_id, AnswerUpvote.created_at),
+                    execution_options={'synchronize_session': False}
+                ).all()
+                if not claimed:
+                    db.session.rollback()
+                    return 0
+
+                answer_votes = {}
+                for answer_id, _ in claimed:
+                    answer_votes[answer_id] = answer_votes.get(answer_id, 0) + 1
+                authors = dict(db.session.query(QuestionAnswer.id, QuestionAnswer.user_id).filter(
+                    QuestionAnswer.id.in_(list(answer_votes))
+                ))
+
+                author_votes = {}
+                for answer_id, count in answer_votes.items():
+                    db.session.execute(
+                        update(QuestionAnswer)
+                        .where(QuestionAnswer.id == answer_id)
+                        .values(upvotes=db.func.coalesce(QuestionAnswer.upvotes, 0) + count),
+                        execution_options={'synchronize_session': False}
+                    )
+                    author_votes[authors[answer_id]] = author_votes.get(authors[answer_id], 0) + count
+
+                # Weekly activity goes to the week each vote was cast in
+                weekly_votes = {}
+                for answer_id, created_at in claimed:
+                    moment = created_at or datetime.utcnow()
+                    votes = weekly_votes.setdefault((authors[answer_id], week_start(moment)), [0, moment])
+                    votes[0] += 1
+
+                leaderboard = LeaderboardService()
+                for (author_id, _), (count, moment) in weekly_votes.items():
+                    leaderboard.record_upvotes(author_id, count, moment)
+
+                stats_service = UserStatsService()
+                engine = BadgeEngine()
+                for author_id, count in author_votes.items():
+                    stats_service.increment(author_id, total_upvotes=count)
+                    engine.handle_event(author_id, 'upvote', commit=False)
+
+                db.session.commit()
+
+                cache = self.app.extensions.get('response_cache')
+                if cache is not None:
+                    cache.invalidate('daily-question', 'top-contributors')
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error flushing upvotes, leaving them for the next flush: {str(e)}")
+                return 0
+
+        logger.info(f"Flushed {len(claimed)} buffered upvotes for {len(answer_votes)} answers")
+        return len(claimed)
+
+    def ensure_flusher(self):
+        """Starts the background flush thread for this process if it isn't running"""
+        with self._lock:
+            if UpvoteCounter._flusher is not None and UpvoteCounter._flusher.is_alive():
+                return
+
+            stop = threading.Event()
+
+            def run():
+                while not stop.wait(self.flush_interval):
+                    self.flush()
+
+            UpvoteCounter._flusher = threading.Thread(target=run, name='upvote-flusher', daemon=True)
+            UpvoteCounter._flusher.start()
+
+            def shutdown():
+                stop.set()
+                self.flush()
+
+            # Count buffered votes promptly when the worker exits
+            atexit.register(shutdown)
@@ -0,0 +1,280 @@
+"""
+UserStatsService computes per-user activity statistics shared by the dashboard
+and profile endpoints
+
+Statistics are built with set-based queries (a single GROUP BY for application
+statuses, a join for recommended jobs) instead of one query per value. Activity
+counters live in the denormalized UserStats table: write paths adjust them with
+atomic in-place updates, and rebuild() recomputes them to repair drift.
+"""
+
+import logging
+
+from upsert import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+# Maps application status values to the keys used by the dashboard
+APPLICATION_STATUS_KEYS = {
+    'applied': 'active',
+    'interview': 'interviews',
+    'offered': 'offers',
+    'rejected': 'rejected',
+}
+
+# UserStats counter columns that can be adjusted with increment()
+COUNTER_COLUMNS = ('applications', 'answers', 'saved_jobs', 'bookmarked_questions', 'total_upvotes')
+
+class UserStatsService:
+    """Service for computing user activity statistics"""
+
+    def get(self, user_id, commit=True):
+        """
+        Loads a user's activity counters, building them if they don't exist yet
+
+        Args:
+            user_id: The ID of the user
+            commit: Whether to commit counters that had to be built
+
+        Returns:
+            The UserStats row for the user, or None if the user doesn't exist
+        """
+        from models import UserStats, db
+
+        stats = db.session.get(UserStats, user_id)
+        if stats is None:
+            rebuilt = self.rebuild(user_id, commit=commit)
+            stats = rebuilt[0] if rebuilt else None
+        return stats
+
+    def increment(self, user_id, **deltas):
+        """
+        Atomically adjusts a user's activity counters in the current transaction
+
+        The update is done in SQL (``col = col + delta``) so concurrent writers never
+        lose increments. Call it after flushing the row being counted; if the user has
+        no counters yet, the row is created with INSERT ... ON CONFLICT DO NOTHING and
+        counted from the source tables. A writer that loses the race to create it
+        applies its deltas to the winner's row instead.
+
+        Args:
+            user_id: The ID of the user
+            **deltas: Counter names mapped to the amount to add (may be negative)
+        """
+        from models import UserStats, db
+
+        unknown = set(deltas) - set(COUNTER_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown counters: {', '.join(sorted(unknown))}")
+
+        values = {
+            getattr(UserStats, name): getattr(UserStats, name) + delta
+            for name, delta in deltas.items()
+        }
+        updated = UserStats.query.filter_by(user_id=user_id).update(values, synchronize_session=False)
+
+        if not updated:
+            if self._create(user_id):
+                # The source tables already include the row being counted
+                self.rebuild(user_id, commit=False)
+                return
+            # A concurrent writer created the counters first
+            UserStats.query.filter_by(user_id=user_id).update(values, synchronize_session=False)
+
+        # Keep an already loaded row from serving stale values
+        stats = db.session.identity_map.get(db.session.identity_key(UserStats, user_id))
+        if stats is not None:
+            db.session.expire(stats)
+
+    def _create(self, user_id):
+        """
+        Creates a user's counter row with zeroed counters unless it already exists
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            True if the row was created by this call
+        """
+        from models import UserStats, db
+
+        statement = dialect_insert(db.session, UserStats.__table__).values(user_id=user_id)
+        result = db.session.execute(statement.on_conflict_do_nothing())
+        return result.rowcount == 1
+
+    def record_answered_field(self, user_id, field):
+        """
+        Adds a question field to the set of fields a user has answered in
+
+        Args:
+            user_id: The ID of the user
+            field: The InterviewQuestion field that was answered
+        """
+        from models import UserStats
+
+        if self.get(user_id, commit=False) is None:
+            return
+        # Lock the row so concurrent answers can't each extend the same old list
+        stats = UserStats.query.filter_by(user_id=user_id).with_for_update().populate_existing().one()
+        fields = stats.answered_fields or []
+        if field not in fields:
+            stats.answered_fields = fields + [field]
+
+    def rebuild(self, user_id=None, commit=True):
+        """
+        Recomputes activity counters from the source tables
+
+        Args:
+            user_id: The ID of a single user to rebuild, or None for every user
+            commit: Whether to commit the rebuilt counters
+
+        Returns:
+            A list of the rebuilt UserStats rows
+        """
+        from models import (User, Application, QuestionAnswer, SavedJob, BookmarkedQuestion,
+                            InterviewQuestion, UserStats, db)
+
+        def per_user(query, user_column):
+            if user_id is not None:
+                query = query.filter(user_column == user_id)
+            return dict(query.group_by(user_column).all())
+
+        counts = {
+            'applications': per_user(
+                db.session.query(Application.user_id, db.func.count(Application.id)), Application.user_id),
+            'answers': per_user(
+                db.session.query(QuestionAnswer.user_id, db.func.count(QuestionAnswer.id)), QuestionAnswer.user_id),
+            'saved_jobs': per_user(
+                db.session.query(SavedJob.user_id, db.func.count(SavedJob.id)), SavedJob.user_id),
+            'bookmarked_questions': per_user(
+                db.session.query(BookmarkedQuestion.user_id, db.func.count(BookmarkedQuestion.id)),
+                BookmarkedQuestion.user_id),
+            'total_upvotes': per_user(
+                db.session.query(QuestionAnswer.user_id, db.func.coalesce(db.func.sum(QuestionAnswer.upvotes), 0)),
+                QuestionAnswer.user_id),
+        }
+
+        fields_query = db.session.query(QuestionAnswer.user_id, InterviewQuestion.field).join(
+            InterviewQuestion, InterviewQuestion.id == QuestionAnswer.question_id
+        ).distinct()
+        if user_id is not None:
+            fields_query = fields_query.filter(QuestionAnswer.user_id == user_id)
+        answered_fields = {}
+        for stats_user_id, field in fields_query:
+            answered_fields.setdefault(stats_user_id, []).append(field)
+
+        user_ids_query = db.session.query(User.id)
+        if user_id is not None:
+            user_ids_query = user_ids_query.filter(User.id == user_id)
+        user_ids = [row[0] for row in user_ids_query]
+
+        def load(ids):
+            return {
+                stats.user_id: stats
+                for stats in UserStats.query.filter(UserStats.user_id.in_(ids))
+            } if ids else {}
+
+        existing = load(user_ids)
+        missing = [stats_user_id for stats_user_id in user_ids if stats_user_id not in existing]
+        if missing:
+            # Concurrent first writes may be creating the same rows
+            db.session.execute(
+                dialect_insert(db.session, UserStats.__table__).on_conflict_do_nothing(),
+                [{'user_id': stats_user_id} for stats_user_id in missing]
+            )
+            existing.update(load(missing))
+
+        rebuilt = []
+        for stats_user_id in user_ids:
+            stats = existing[stats_user_id]
+            for name in COUNTER_COLUMNS:
+                setattr(stats, name, int(counts[name].get(stats_user_id, 0)))
+            stats.answered_fields = sorted(answered_fields.get(stats_user_id, []))
+            rebuilt.append(stats)
+
+        if commit:
+            db.session.commit()
+        else:
+            db.session.flush()
+
+        logger.info(f"Rebuilt activity counters for {len(rebuilt)} user(s)")
+        return rebuilt
+
+    def application_stats_query(self, user_id):
+        """
+        Builds the per-status application count run by application_stats()
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            A query of (status, count) rows
+        """
+        from models import Application, db
+
+        return db.session.query(
+            Application.status,
+            db.func.count(Application.id)
+        ).filter(
+            Application.user_id == user_id
+        ).group_by(
+            Application.status
+        )
+
+    def application_stats(self, user_id):
+        """
+        Counts a user's applications by status in a single query
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            A dict with 'total', 'active', 'interviews', 'offers' and 'rejected' counts
+        """
+        rows = self.application_stats_query(user_id).all()
+
+        stats = {'total': 0}
+        stats.update({key: 0 for key in APPLICATION_STATUS_KEYS.values()})
+
+        for status, count in rows:
+            stats['total'] += count
+            if status in APPLICATION_STATUS_KEYS:
+                stats[APPLICATION_STATUS_KEYS[status]] = count
+
+        return stats
+
+    def recommended_jobs_query(self, user_id, limit=3):
+        """
+        Builds the best-match join run by recommended_jobs()
+
+        Args:
+            user_id: The ID of the user
+            limit: The maximum number of jobs to return
+
+        Returns:
+            A query of (Job, score) rows, best match first
+        """
+        from models import Job, ResumeMatchScore, db
+
+        return db.session.query(Job, ResumeMatchScore.score).join(
+            ResumeMatchScore, ResumeMatchScore.job_id == Job.id
+        ).filter(
+            ResumeMatchScore.user_id == user_id
+        ).order_by(
+            ResumeMatchScore.score.desc()
+        ).limit(limit)
+
+    def recommended_jobs(self, user_id, limit=3):
+        """
+        Loads a user's best-matching jobs together with their match scores
+
+        Args:
+            user_id: The ID of the user
+            limit: The maximum number of jobs to return
+
+        Returns:
+            A list of dicts with 'job' and 'match_score' keys, best match first
+        """
+        rows = self.recommended_jobs_query(user_id, limit).all()
+
+        return [{'job': job, 'match_score': score} for job, score in rows]
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fixture_server import FixtureServer  # noqa: E402
+
+@pytest.fixture
+def app(tmp_path):
+    from app import create_app, db
+
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'TESTING': True,
+        'LOG_FILE': '',
+        'AUTO_CREATE_TABLES': True,
+        'APPLY_QUEUE_IN_PROCESS': False,
+    })
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+@pytest.fixture
+def fixture_server():
+    with FixtureServer() as server:
+        yield server
@@ -0,0 +1,140 @@
+"""
+Local HTTP server serving job listing pages for scraper tests
+
+Pages use the generic markup read by the 'other' listing extractor. Responses
+carry an ETag and honour If-None-Match with 304 Not Modified, like the job
+boards do. Every request is logged with the Host it was addressed to, and the
+peak number of requests in flight per host is tracked, so tests can check
+per-host throttling. Addressing the same server as 127.0.0.1 and localhost
+gives two hosts.
+"""
+
+import hashlib
+import threading
+import time
+from collections import namedtuple
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# One request received by the server
+FixtureRequest = namedtuple('FixtureRequest', ['host', 'path', 'headers', 'started', 'finished'])
+
+def listing_html(jobs, next_path=None):
+    """
+    Renders a listing page
+
+    Args:
+        jobs: A list of dicts with title, company, location, path and posted (ISO date)
+        next_path: The path of the next page, or None
+
+    Returns:
+        The page HTML
+    """
+    cards = ''.join(
+        f'<div class="job-card">'
+        f'<a href="{escape(job["path"])}"><span class="job-title">{escape(job["title"])}</span></a>'
+        f'<span class="company">{escape(job["company"])}</span>'
+        f'<span class="location">{escape(job.get("location") or "")}</span>'
+        f'<time datetime="{job["posted"]}">{job["posted"]}</time>'
+        f'</div>'
+        for job in jobs
+    )
+    pager = f'<a rel="next" href="{escape(next_path)}">Next</a>' if next_path else ''
+    return f'<!DOCTYPE html><html><body>{cards}{pager}</body></html>'
+
+class FixtureServer:
+    """Serves listing pages from memory on a free local port"""
+
+    def __init__(self, delay=0.0):
+        # Seconds each response takes, so concurrent requests overlap
+        self.delay = delay
+        self.pages = {}
+        self.requests = []
+        self.peak_in_flight = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def add_page(self, path, jobs, next_path=None):
+        """Serves a listing page at a path"""
+        self.pages[path] = listing_html(jobs, next_path).encode('utf-8')
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def url(self, path, host='127.0.0.1'):
+        """Returns the URL of a path on the server, addressed to a host name"""
+        return f'http://{host}:{self.port}{path}'
+
+    def requests_to(self, host):
+        """Returns the requests addressed to a host, in arrival order"""
+        with self._lock:
+            return [request for request in self.requests if request.host.split(':')[0] == host]
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                host = self.headers.get('Host', '')
+                started = time.monotonic()
+                with server._lock:
+                    server._in_flight[host] = server._in_flight.get(host, 0) + 1
+                    server.peak_in_flight[host] = max(server.peak_in_flight.get(host, 0), server._in_flight[host])
+                try:
+                    if server.delay:
+                        time.sleep(server.delay)
+                    self._respond()
+                finally:
+                    with server._lock:
+                        server._in_flight[host] -= 1
+                        server.requests.append(FixtureRequest(
+                            host, self.path, dict(self.headers), started, time.monotonic()
+                        ))
+
+            def _respond(self):
+                body = server.pages.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+from services.apply_queue import IN_PROGRESS, QUEUED, ApplyQueue
+
+class RecordingExecutor:
+    """Collects submitted work instead of running it"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append(args)
+
+def add_applications(statuses, platforms=None):
+    from models import Application, Job, User, db
+
+    user = User(username='applicant', email='applicant@example.com')
+    user.set_password('password')
+    db.session.add(user)
+    now = datetime.utcnow()
+    platforms = platforms or [None] * len(statuses)
+    for i, (status, platform) in enumerate(zip(statuses, platforms)):
+        # Jobs stored before platforms were recorded have none, and are classified by URL
+        job = Job(title=f'Cloud Engineer {i}', company='Example', url=f'https://www.linkedin.com/jobs/view/{i}',
+                  platform=platform)
+        db.session.add(job)
+        db.session.flush()
+        db.session.add(Application(
+            user_id=user.id, job_id=job.id, submission_status=status,
+            next_attempt_at=now - timedelta(seconds=1),
+            claimed_at=now if status == IN_PROGRESS else None
+        ))
+    db.session.commit()
+
+def test_platform_cap_counts_other_dispatchers(app):
+    app.config['APPLY_PLATFORM_CONCURRENCY'] = 'linkedin=2'
+    with app.app_context():
+        # One submission is already running on another dispatcher
+        add_applications([IN_PROGRESS, QUEUED, QUEUED, QUEUED], ['linkedin', None, None, None])
+
+    executor = RecordingExecutor()
+    assert ApplyQueue(app, workers=4).dispatch(executor) == 1
+    assert len(executor.submitted) == 1
+
+def test_platform_cap_per_dispatch(app):
+    app.config['APPLY_PLATFORM_CONCURRENCY'] = 'linkedin=2'
+    with app.app_context():
+        add_applications([QUEUED, QUEUED, QUEUED])
+
+    queue = ApplyQueue(app, workers=4)
+    assert queue.dispatch(RecordingExecutor()) == 2
+    # Both slots are taken until those submissions finish
+    assert queue.dispatch(RecordingExecutor()) == 0
@@ -0,0 +1,35 @@
+from cache import MemoryCache, ResponseCache
+
+def cached_ttls(app, monkeypatch):
+    ttls = []
+    set_entry = MemoryCache.set
+
+    def recording_set(self, key, value, ttl):
+        ttls.append(ttl)
+        return set_entry(self, key, value, ttl)
+
+    monkeypatch.setattr(MemoryCache, 'set', recording_set)
+    cache = ResponseCache(app)
+
+    @app.route('/test/shared')
+    @cache.cached('test-shared', ttl=300)
+    def shared_view():
+        return {'ok': True}
+
+    @app.route('/test/mine')
+    @cache.cached('test-mine', ttl=300, per_user=True)
+    def user_view():
+        return {'ok': True}
+
+    client = app.test_client()
+    assert client.get('/test/shared').headers['X-Cache'] == 'MISS'
+    assert client.get('/test/mine').headers['X-Cache'] == 'MISS'
+    return ttls
+
+def test_memory_backend_caps_ttl(app, monkeypatch):
+    app.config['CACHE_LOCAL_TTL'] = 5
+    assert cached_ttls(app, monkeypatch) == [5, 5]
+
+def test_shared_backend_keeps_ttl(app, monkeypatch):
+    monkeypatch.setattr(MemoryCache, 'shared', True)
+    assert cached_ttls(app, monkeypatch) == [300, 300]
@@ -0,0 +1,16 @@
+from services.index_audit import IndexAuditService
+
+def test_route_queries_have_no_sequential_scans(app):
+    with app.app_context():
+        results = IndexAuditService().audit()
+
+    assert results
+    assert [result['name'] for result in results if result['seq_scans']] == []
+
+def test_audit_follows_the_batched_lookups(app):
+    with app.app_context():
+        statements = IndexAuditService().route_queries(user_id=7, job_ids=(1, 2, 3))
+        sql = str(statements['search_jobs: saved lookup'].compile(compile_kwargs={'literal_binds': True}))
+
+    assert 'saved_job.job_id IN (1, 2, 3)' in sql
+    assert 'get_profile: application stats' in statements
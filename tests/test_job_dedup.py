@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+from services.job_dedup import JobDeduplicator
+
+BOARD_URLS = [
+    'https://www.linkedin.com/jobs/view/4012345678',
+    'https://in.indeed.com/viewjob?jk=8c1f2a9b',
+    'https://www.glassdoor.co.in/job-listing/cloud-engineer-JV_IC2940587.htm?jl=1009',
+]
+
+def listing_job(url, posted, company='Acme Cloud Pvt Ltd', title='Cloud Engineer'):
+    """A posting as scraped from a listing page: no description"""
+    from models import Job
+
+    return Job(title=title, company=company, location='Bengaluru, Karnataka', url=url, posted_date=posted)
+
+def test_description_less_postings_merge_across_boards(app):
+    from models import Job, db
+
+    posted = datetime(2026, 10, 12, 9, 0)
+    with app.app_context():
+        deduplicator = JobDeduplicator()
+        results = [
+            deduplicator.add(listing_job(url, posted + timedelta(days=i)))
+            for i, url in enumerate(BOARD_URLS)
+        ]
+        db.session.commit()
+
+        assert [created for _, created in results] == [True, False, False]
+        [job] = Job.query.all()
+        assert job.url == BOARD_URLS[0]
+        assert job.source_urls == BOARD_URLS[1:]
+
+def test_description_less_postings_keep_distinct_openings_apart(app):
+    from models import Job, db
+
+    posted = datetime(2026, 10, 12, 9, 0)
+    with app.app_context():
+        deduplicator = JobDeduplicator()
+        deduplicator.add(listing_job(BOARD_URLS[0], posted))
+        # The same role reposted a month later, and another company's opening
+        deduplicator.add(listing_job(BOARD_URLS[1], posted + timedelta(days=30)))
+        deduplicator.add(listing_job(BOARD_URLS[2], posted, company='Other Systems'))
+        db.session.commit()
+
+        assert Job.query.count() == 3
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from services.job_dedup import BANDS, fingerprint, minhash
+from services.job_ingest import JobIngestService
+
+DESCRIPTION = 'Build and run Terraform modules for EC2, S3 and Lambda workloads across three regions'
+
+def test_update_without_posted_date_keeps_the_stored_date(app):
+    from models import Job
+
+    url = 'https://www.linkedin.com/jobs/view/4012345677'
+    service = JobIngestService()
+    with app.app_context():
+        service.ingest([{
+            'title': 'Cloud Engineer', 'company': 'Acme', 'url': url, 'posted_date': '2026-10-01T09:00:00',
+        }])
+        report = service.ingest([{'title': 'Senior Cloud Engineer', 'company': 'Acme', 'url': url}])
+
+        assert report['updated'] == 1
+        job = Job.query.filter_by(url=url).one()
+        assert job.title == 'Senior Cloud Engineer'
+        assert job.posted_date == datetime(2026, 10, 1, 9, 0)
+
+def test_partial_update_keeps_the_signature_of_the_merged_row(app):
+    from models import Job, JobDedupBucket
+
+    url = 'https://www.linkedin.com/jobs/view/4012345678'
+    service = JobIngestService()
+    with app.app_context():
+        service.ingest([{
+            'title': 'Cloud Engineer', 'company': 'Acme', 'location': 'Pune', 'url': url,
+            'description': DESCRIPTION,
+        }])
+        # A later feed only carries the listing fields
+        report = service.ingest([{'title': 'Cloud Engineer', 'company': 'Acme', 'url': url}])
+        assert report['updated'] == 1
+
+        job = Job.query.filter_by(url=url).one()
+        assert job.description == DESCRIPTION
+        assert job.location == 'Pune'
+        assert job.fingerprint == fingerprint('Cloud Engineer', 'Acme', 'Pune', DESCRIPTION)
+        assert job.description_minhash == minhash(DESCRIPTION)
+        assert JobDedupBucket.query.filter_by(job_id=job.id).count() == BANDS
+
+def test_update_with_a_new_description_resigns(app):
+    from models import Job
+
+    url = 'https://www.linkedin.com/jobs/view/4012345679'
+    service = JobIngestService()
+    with app.app_context():
+        service.ingest([{'title': 'Cloud Engineer', 'company': 'Acme', 'location': 'Pune', 'url': url}])
+        service.ingest([{
+            'title': 'Cloud Engineer', 'company': 'Acme', 'location': 'Pune', 'url': url,
+            'description': DESCRIPTION,
+        }])
+
+        job = Job.query.filter_by(url=url).one()
+        assert job.fingerprint == fingerprint('Cloud Engineer', 'Acme', 'Pune', DESCRIPTION)
+        assert job.description_minhash == minhash(DESCRIPTION)
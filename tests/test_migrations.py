@@ -0,0 +1,50 @@
+import os
+
+from sqlalchemy import text
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def test_upgrade_db_adopts_and_backfills_a_legacy_database(tmp_path, monkeypatch):
+    from flask_migrate import upgrade
+    from app import create_app, db, init_migrations
+
+    monkeypatch.chdir(ROOT)
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'legacy.db'}",
+        'TESTING': True,
+        'LOG_FILE': '',
+        'AUTO_CREATE_TABLES': False,
+    })
+    init_migrations(app)
+
+    with app.app_context():
+        # A database made by db.create_all() before migrations existed
+        upgrade(revision='0001_initial_schema')
+        with db.engine.begin() as connection:
+            connection.execute(text('DROP TABLE alembic_version'))
+            connection.execute(text(
+                "INSERT INTO user (id, username, email, password_hash) VALUES (1, 'a', 'a@example.com', 'x'), "
+                "(2, 'b', 'b@example.com', 'x')"
+            ))
+            connection.execute(text("INSERT INTO interview_question (id, question, field) VALUES (1, 'q', 'ec2'), (2, 'q', 's3')"))
+            connection.execute(text(
+                "INSERT INTO question_answer (question_id, user_id, answer, created_at, upvotes) VALUES "
+                "(1, 1, 'a', '2026-10-14 10:00:00', 3), (2, 1, 'b', '2026-10-06 10:00:00', 2), "
+                "(1, 2, 'c', '2026-10-15 10:00:00', 0)"
+            ))
+
+    result = app.test_cli_runner().invoke(args=['upgrade-db'])
+    assert result.exit_code == 0, result.output
+    assert 'Stamping' in result.output
+
+    with app.app_context():
+        from models import ContributorWeek, UserStats
+        from services.leaderboard import LeaderboardService
+
+        first = db.session.get(UserStats, 1)
+        assert (first.answers, first.total_upvotes, first.answered_fields) == (2, 5, ['ec2', 's3'])
+        assert db.session.get(UserStats, 2).answers == 1
+        assert ContributorWeek.query.count() == 3
+        assert [row['id'] for row in LeaderboardService().top()] == [1, 2]
+        db.session.remove()
+        db.engine.dispose()
@@ -0,0 +1,56 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from pagination import decode_cursor, encode_cursor, keyset_paginate
+
+def add_jobs(count):
+    from models import Job, db
+
+    for i in range(count):
+        db.session.add(Job(
+            title=f'Cloud Engineer {i}', company='Example', url=f'https://example.com/jobs/{i}',
+            posted_date=datetime(2026, 1, 1) + timedelta(days=i)
+        ))
+    db.session.commit()
+
+def raw_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+
+def test_pages_walk_every_row(app):
+    from models import Job
+
+    with app.app_context():
+        add_jobs(5)
+        ordering = [(Job.posted_date, True), (Job.id, True)]
+        seen, cursor = [], ''
+        while cursor is not None:
+            items, cursor = keyset_paginate(Job.query, ordering, cursor, 2)
+            seen += [job.id for job in items]
+        assert seen == [5, 4, 3, 2, 1]
+
+def test_per_page_is_clamped(app):
+    from models import Job
+
+    with app.app_context():
+        add_jobs(3)
+        items, next_cursor = keyset_paginate(Job.query, [(Job.posted_date, True), (Job.id, True)], '', 0)
+        assert len(items) == 1
+        assert next_cursor is not None
+
+@pytest.mark.parametrize('values', [[1, 2], ['2026-01-01T00:00:00', 'x'], [None, 1], ['2026-01-01T00:00:00', True]])
+def test_mistyped_cursor_is_rejected(app, values):
+    from models import Job
+
+    with app.app_context():
+        with pytest.raises(ValueError):
+            decode_cursor(raw_cursor(values), [Job.posted_date, Job.id])
+
+def test_cursor_round_trip(app):
+    from models import Job
+
+    with app.app_context():
+        posted = datetime(2026, 1, 2, 3, 4, 5)
+        assert decode_cursor(encode_cursor([posted, 7]), [Job.posted_date, Job.id]) == [posted, 7]
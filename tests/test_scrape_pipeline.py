@@ -0,0 +1,145 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from services.scrape_pipeline import ScrapePipeline
+
+def make_jobs(prefix, count):
+    posted = (datetime.utcnow() - timedelta(hours=1)).replace(microsecond=0).isoformat()
+    return [
+        {
+            'title': f'{prefix} Cloud Engineer {i}',
+            'company': f'{prefix} Company {i}',
+            'location': 'Remote',
+            'path': f'/jobs/{prefix}/{i}',
+            'posted': posted,
+        }
+        for i in range(count)
+    ]
+
+def add_sources(app, urls):
+    from models import User, JobSource, db
+
+    with app.app_context():
+        user = User(username='scraper', email='scraper@example.com')
+        user.set_password('password')
+        db.session.add(user)
+        db.session.flush()
+        sources = [JobSource(user_id=user.id, name=f'Source {i}', url=url) for i, url in enumerate(urls)]
+        db.session.add_all(sources)
+        db.session.commit()
+        return [source.id for source in sources]
+
+def test_per_host_throttling(app, fixture_server):
+    fixture_server.delay = 0.05
+    for i in range(4):
+        fixture_server.add_page(f'/listing/{i}', make_jobs(f'h{i}', 1))
+    urls = [fixture_server.url(f'/listing/{i}', host) for host in ('127.0.0.1', 'localhost') for i in range(4)]
+    add_sources(app, urls)
+
+    rate = 10.0
+    pipeline = ScrapePipeline(app, max_workers=8, host_concurrency=1, host_rate=rate)
+    stats = pipeline.run()
+
+    assert [s['status'] for s in stats.values()] == ['ok'] * 8
+    for host in ('127.0.0.1', 'localhost'):
+        requests = fixture_server.requests_to(host)
+        assert len(requests) == 4
+        assert fixture_server.peak_in_flight[f'{host}:{fixture_server.port}'] == 1
+        starts = sorted(request.started for request in requests)
+        gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+        # Allow for scheduling jitter around the 1 / rate interval
+        assert min(gaps) >= 0.8 / rate
+
+def test_etag_revalidation(app, fixture_server):
+    from models import Job, JobSource, db
+
+    fixture_server.add_page('/listing', make_jobs('etag', 3))
+    [source_id] = add_sources(app, [fixture_server.url('/listing')])
+
+    first = ScrapePipeline(app).run()
+    assert first[source_id]['status'] == 'ok'
+    assert first[source_id]['new'] == 3
+    with app.app_context():
+        etag = db.session.get(JobSource, source_id).etag
+    assert etag
+
+    second = ScrapePipeline(app).run()
+    assert second[source_id]['status'] == 'not_modified'
+    assert second[source_id]['new'] == 0
+    assert fixture_server.requests[-1].headers.get('If-None-Match') == etag
+    with app.app_context():
+        assert Job.query.count() == 3
+
+def test_batched_commits(app, fixture_server):
+    from models import Job, JobSourceSync, db
+
+    for i in range(5):
+        fixture_server.add_page(f'/listing/{i}', make_jobs(f'b{i}', 2))
+    source_ids = add_sources(app, [fixture_server.url(f'/listing/{i}') for i in range(5)])
+
+    commits = []
+
+    def count_commit(session):
+        commits.append(session)
+
+    with app.app_context():
+        event.listen(db.session, 'after_commit', count_commit)
+        try:
+            stats = ScrapePipeline(app, batch_size=4).run()
+        finally:
+            event.remove(db.session, 'after_commit', count_commit)
+
+        assert Job.query.count() == 10
+        assert JobSourceSync.query.count() == 5
+    assert sorted(stats) == source_ids
+    # Two sources (four jobs) fill a batch, so five sources commit in three batches
+    assert len(commits) >= 3
+
+def test_failed_batch_keeps_the_run_going(app, fixture_server, monkeypatch):
+    from models import Job, JobSource, db
+    from services.job_dedup import JobDeduplicator
+
+    fixture_server.add_page('/listing/good', make_jobs('good', 2))
+    fixture_server.add_page('/listing/bad', make_jobs('bad', 2))
+    good_id, bad_id = add_sources(app, [fixture_server.url('/listing/good'), fixture_server.url('/listing/bad')])
+
+    add = JobDeduplicator.add
+
+    def failing_add(self, job):
+        if job.title.startswith('bad'):
+            raise RuntimeError('storage failed')
+        return add(self, job)
+
+    monkeypatch.setattr(JobDeduplicator, 'add', failing_add)
+    stats = ScrapePipeline(app, batch_size=1, max_workers=1).run()
+
+    assert stats[good_id]['status'] == 'ok'
+    assert stats[bad_id]['status'] == 'error'
+    assert 'storage failed' in stats[bad_id]['error']
+    with app.app_context():
+        assert Job.query.count() == 2
+        assert db.session.get(JobSource, good_id).last_synced is not None
+        # The failed source's postings are fetched again next sync
+        assert db.session.get(JobSource, bad_id).last_synced is None
+
+def test_rescraped_url_is_merged(app, fixture_server):
+    from models import Job, JobSource, db
+
+    jobs = make_jobs('edit', 1)
+    fixture_server.add_page('/listing', jobs)
+    [source_id] = add_sources(app, [fixture_server.url('/listing')])
+    ScrapePipeline(app).run()
+
+    # The posting's details change, so it fingerprints differently under the same URL
+    jobs[0]['title'] = 'edit Senior Cloud Engineer'
+    fixture_server.add_page('/listing', jobs)
+    with app.app_context():
+        db.session.get(JobSource, source_id).last_synced = None
+        db.session.commit()
+    stats = ScrapePipeline(app).run()
+
+    assert stats[source_id]['status'] == 'ok'
+    assert stats[source_id]['merged'] == 1
+    with app.app_context():
+        assert Job.query.count() == 1
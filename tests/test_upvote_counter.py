@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from services.upvote_counter import UpvoteCounter
+
+def add_answer():
+    from models import InterviewQuestion, QuestionAnswer, User, db
+
+    users = []
+    for name in ('author', 'voter1', 'voter2'):
+        user = User(username=name, email=f'{name}@example.com')
+        user.set_password('password')
+        db.session.add(user)
+        users.append(user)
+    question = InterviewQuestion(question='What is S3?', field='s3')
+    db.session.add(question)
+    db.session.flush()
+    answer = QuestionAnswer(question_id=question.id, user_id=users[0].id, answer='Object storage', upvotes=0)
+    db.session.add(answer)
+    db.session.commit()
+    return answer.id, [user.id for user in users]
+
+def test_buffered_votes_survive_a_lost_worker(app, monkeypatch):
+    from models import QuestionAnswer, UserStats, db
+
+    app.config['UPVOTE_BUFFER_SECONDS'] = 60
+    # No flush thread: the worker is killed before it would have flushed
+    monkeypatch.setattr(UpvoteCounter, 'ensure_flusher', lambda self: None)
+
+    with app.app_context():
+        answer_id, (author_id, *voters) = add_answer()
+        counter = UpvoteCounter(app)
+        for voter_id in voters:
+            assert counter.record(db.session.get(QuestionAnswer, answer_id), voter_id) >= 1
+            db.session.commit()
+        assert counter.pending_count(answer_id) == 2
+        assert db.session.get(QuestionAnswer, answer_id).upvotes == 0
+
+        # The dedup rows still stop a second vote
+        with pytest.raises(IntegrityError):
+            counter.record(db.session.get(QuestionAnswer, answer_id), voters[0])
+        db.session.rollback()
+
+    # Another process flushes the votes the lost worker left behind
+    assert UpvoteCounter(app).flush() == 2
+    assert UpvoteCounter(app).flush() == 0
+
+    with app.app_context():
+        assert db.session.get(QuestionAnswer, answer_id).upvotes == 2
+        assert db.session.get(UserStats, author_id).total_upvotes == 2
+        assert UpvoteCounter(app).pending_count(answer_id) == 0
+
+def test_unbuffered_votes_are_counted_immediately(app):
+    from models import QuestionAnswer, db
+
+    with app.app_context():
+        answer_id, (_, voter_id, _) = add_answer()
+        counter = UpvoteCounter(app)
+        assert counter.record(db.session.get(QuestionAnswer, answer_id), voter_id) == 1
+        db.session.commit()
+        assert counter.pending_count(answer_id) == 0
+    assert UpvoteCounter(app).flush() == 0
@@ -0,0 +1,79 @@
+from services.user_stats import UserStatsService
+
+def add_user(username='counter'):
+    from models import User, db
+
+    user = User(username=username, email=f'{username}@example.com')
+    user.set_password('password')
+    db.session.add(user)
+    db.session.flush()
+    return user.id
+
+def save_job(user_id, title='Cloud Engineer'):
+    from models import Job, SavedJob, db
+
+    job = Job(title=title, company='Example', url=f'https://example.com/jobs/{title}')
+    db.session.add(job)
+    db.session.flush()
+    db.session.add(SavedJob(user_id=user_id, job_id=job.id))
+    db.session.flush()
+
+def test_first_increment_counts_from_source_tables(app):
+    from models import UserStats, db
+
+    with app.app_context():
+        user_id = add_user()
+        save_job(user_id)
+        UserStatsService().increment(user_id, saved_jobs=1)
+        db.session.commit()
+
+        assert db.session.get(UserStats, user_id).saved_jobs == 1
+
+def test_increment_after_losing_the_create_race(app, monkeypatch):
+    from models import UserStats, db
+
+    with app.app_context():
+        user_id = add_user()
+        save_job(user_id)
+
+        create = UserStatsService._create
+
+        def concurrent_create(self, stats_user_id):
+            # Another request creates the counters between our UPDATE and INSERT
+            db.session.add(UserStats(user_id=stats_user_id, saved_jobs=4))
+            db.session.flush()
+            return create(self, stats_user_id)
+
+        monkeypatch.setattr(UserStatsService, '_create', concurrent_create)
+        UserStatsService().increment(user_id, saved_jobs=1)
+        db.session.commit()
+
+        assert db.session.get(UserStats, user_id).saved_jobs == 5
+
+def test_record_answered_field(app):
+    from models import UserStats, db
+
+    with app.app_context():
+        user_id = add_user()
+        service = UserStatsService()
+        service.increment(user_id, answers=0)
+        for field in ('ec2', 's3', 'ec2'):
+            service.record_answered_field(user_id, field)
+        db.session.commit()
+
+        assert db.session.get(UserStats, user_id).answered_fields == ['ec2', 's3']
+
+def test_rebuild_keeps_existing_rows(app):
+    from models import UserStats, db
+
+    with app.app_context():
+        first = add_user('first')
+        second = add_user('second')
+        db.session.add(UserStats(user_id=first, saved_jobs=7))
+        save_job(second)
+        db.session.commit()
+
+        UserStatsService().rebuild()
+
+        assert db.session.get(UserStats, first).saved_jobs == 0
+        assert db.session.get(UserStats, second).saved_jobs == 1
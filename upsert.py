@@ -0,0 +1,53 @@
+"""
+Dialect-specific INSERT ... ON CONFLICT helpers
+
+SQLite and PostgreSQL both support ON CONFLICT upserts, but SQLAlchemy exposes them
+through each dialect's own insert() construct. These helpers pick the right one for
+the session's database.
+"""
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+DIALECT_INSERTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+}
+
+def dialect_insert(session, model):
+    """
+    Builds an INSERT statement supporting on_conflict_do_update/do_nothing
+
+    Args:
+        session: The SQLAlchemy session the statement will run on
+        model: The model class to insert into
+
+    Returns:
+        A dialect-specific Insert construct
+
+    Raises:
+        NotImplementedError: If the database has no ON CONFLICT support here
+    """
+    name = session.get_bind().dialect.name
+    if name not in DIALECT_INSERTS:
+        raise NotImplementedError(f"Upserts are not supported on {name}")
+    return DIALECT_INSERTS[name](model)
+
+def increment_upsert(session, model, key, increments):
+    """
+    Inserts a counter row or atomically adds to it if it already exists
+
+    Args:
+        session: The SQLAlchemy session to execute on
+        model: The model class holding the counters
+        key: A dict of primary key column names to values
+        increments: A dict of counter column names to the amounts to add
+    """
+    statement = dialect_insert(session, model).values(**key, **increments)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(key),
+        set_={
+            name: getattr(model, name) + statement.excluded[name]
+            for name in increments
+        }
+    )
+    session.execute(statement)